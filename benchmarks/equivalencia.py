@@ -0,0 +1,328 @@
+"""
+Verificação de equivalência dos resultados do processamento diário.
+
+As faltas e ocorrências alimentam registros disciplinares, então qualquer
+otimização de processar_dados_diarios precisa produzir exatamente o mesmo
+resultado. Este módulo roda um "motor" (uma forma de processar o dia) sobre
+todos os dias de pdf/, em alguns filtros de horário, e guarda um retrato
+canônico de cada dia: faltas_registradas e df_problemas ordenados, com
+valores em tipos simples. Outros motores são comparados com esse retrato,
+ou entre si no mesmo processo, e as diferenças saem linha a linha.
+
+Os retratos são gravados, por padrão, com o motor 'referencia': a lógica
+original congelada em benchmarks/referencia.py, para que as versões otimizadas
+sejam comparadas com o algoritmo anterior, e não consigo mesmas.
+
+Motores já registrados (ver MOTORES / registrar_motor):
+- referencia:   o processamento anterior às otimizações (iterrows e buscas no DataFrame);
+- sequencial:   processar_dados_diarios com extração em sequência, sem cache;
+- concorrente:  extração dos dois PDFs em processos separados, sem cache;
+- cache:        extração em sequência, usando o cache de extração;
+- incremental:  extração em sequência, guardando a apuração de cada dia: só o
+                primeiro filtro do dia apura tudo, os outros reaplicam o filtro;
+- base_unica:   o banco carregado uma só vez e reaproveitado em todos os dias (como no lote);
+- periodo:      processar_periodo, com o mesmo contexto base (e índice de alunos) em todos os dias.
+
+Uso: python -m benchmarks.equivalencia gravar [--motor M] [--nome N]
+     python -m benchmarks.equivalencia verificar [--motor M ...] [--nome N]
+     python -m benchmarks.equivalencia lado-a-lado MOTOR_A MOTOR_B
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections import Counter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+# (filtro_ativo, hora_inicio, hora_fim) usados em cada dia
+FILTROS_PADRAO = [(False, "00:00", "23:59"), (True, "00:00", "12:00"), (True, "08:30", "10:00")]
+
+MOTORES = {}
+
+
+def registrar_motor(nome, funcao):
+    """
+    Adiciona (ou substitui) um motor: funcao(ausentes_path, frequencia_path, logger,
+    filtro_ativo, hora_inicio, hora_fim) -> (report_date, faltas_registradas, df_problemas).
+    """
+    MOTORES[nome] = funcao
+
+
+@contextlib.contextmanager
+def _cache_extracao(ativo):
+    original = config.CACHE_EXTRACAO_ATIVO
+    config.CACHE_EXTRACAO_ATIVO = ativo
+    try:
+        yield
+    finally:
+        config.CACHE_EXTRACAO_ATIVO = original
+
+
+@contextlib.contextmanager
+def _cache_apuracao(ativo):
+    original = config.CACHE_APURACAO_DIAS
+    config.CACHE_APURACAO_DIAS = original if ativo else 0
+    try:
+        yield
+    finally:
+        config.CACHE_APURACAO_DIAS = original
+
+
+@contextlib.contextmanager
+def _banco_migrado():
+    """
+    Usa uma cópia migrada do banco: o motor incremental depende da versão do
+    cadastro (migração 3) e o banco do repositório não deve ser alterado.
+    """
+    from modulos.migracoes import aplicar_migracoes
+    original = config.DB_PATH
+    with tempfile.TemporaryDirectory(prefix='equivalencia_') as temporario:
+        config.DB_PATH = os.path.join(temporario, config.DB_NAME)
+        try:
+            shutil.copyfile(original, config.DB_PATH)
+            aplicar_migracoes(logger=lambda mensagem: None)
+            yield
+        finally:
+            config.DB_PATH = original
+
+
+def _motor_processador(concorrente, cache, incremental=False):
+    def motor(ausentes_path, frequencia_path, logger, filtro_ativo, hora_inicio, hora_fim):
+        from modulos.processador import processar_dados_diarios
+        with _cache_extracao(cache), _cache_apuracao(incremental):
+            return processar_dados_diarios(ausentes_path, frequencia_path, logger,
+                                           filtro_ativo, hora_inicio, hora_fim, concorrente=concorrente)
+    return motor
+
+
+_base_unica = {}
+
+
+def _motor_base_unica(ausentes_path, frequencia_path, logger, filtro_ativo, hora_inicio, hora_fim):
+    from modulos.processador import processar_dados_diarios, carregar_dados_base
+    if config.DB_PATH not in _base_unica:
+        _base_unica[config.DB_PATH] = carregar_dados_base(logger)
+    with _cache_extracao(False):
+        return processar_dados_diarios(ausentes_path, frequencia_path, logger,
+                                       filtro_ativo, hora_inicio, hora_fim,
+                                       dados_base=_base_unica[config.DB_PATH], concorrente=False)
+
+
+_contextos = {}
+
+
+def _motor_periodo(ausentes_path, frequencia_path, logger, filtro_ativo, hora_inicio, hora_fim):
+    from modulos.processador import processar_periodo, carregar_contexto_base
+    if config.DB_PATH not in _contextos:
+        _contextos[config.DB_PATH] = carregar_contexto_base(logger)
+    with _cache_extracao(False):
+        dados_da_sessao = processar_periodo([(ausentes_path, frequencia_path)], logger, filtro_ativo,
+                                            hora_inicio, hora_fim, contexto=_contextos[config.DB_PATH],
+                                            concorrente=False)
+    return next(iter(dados_da_sessao.values()), (None, None, None))
+
+
+def _motor_referencia(ausentes_path, frequencia_path, logger, filtro_ativo, hora_inicio, hora_fim):
+    from benchmarks.referencia import processar_dados_diarios
+    return processar_dados_diarios(ausentes_path, frequencia_path, logger, filtro_ativo, hora_inicio, hora_fim)
+
+
+registrar_motor('referencia', _motor_referencia)
+registrar_motor('sequencial', _motor_processador(concorrente=False, cache=False))
+registrar_motor('concorrente', _motor_processador(concorrente=True, cache=False))
+registrar_motor('cache', _motor_processador(concorrente=False, cache=True))
+registrar_motor('incremental', _motor_processador(concorrente=False, cache=False, incremental=True))
+registrar_motor('base_unica', _motor_base_unica)
+registrar_motor('periodo', _motor_periodo)
+
+
+def _valor_canonico(valor):
+    """
+    Converte um valor do DataFrame em um tipo simples e comparável (JSON).
+    """
+    import pandas as pd
+    if valor is None or (not isinstance(valor, str) and pd.isna(valor)):
+        return None
+    if hasattr(valor, 'item'):
+        valor = valor.item()
+    if isinstance(valor, (str, int, float, bool)):
+        return valor
+    return str(valor)
+
+
+def _chave_ordenacao(linha):
+    return json.dumps(linha, ensure_ascii=False, sort_keys=True)
+
+
+def retrato_canonico(report_date, faltas_registradas, df_problemas):
+    """
+    Retrato do resultado de um dia independente de ordem e de dtype: as faltas
+    como linhas [matrícula, nome, turma, disciplina, total] e as ocorrências
+    como dicionários coluna -> valor, ambas ordenadas.
+    """
+    if report_date is None:
+        return None
+    faltas = sorted(([str(matricula), nome, turma, disciplina, int(total)]
+                     for (matricula, nome, turma, disciplina), total in (faltas_registradas or {}).items()),
+                    key=_chave_ordenacao)
+    problemas = []
+    if df_problemas is not None:
+        colunas = [str(coluna) for coluna in df_problemas.columns]
+        problemas = sorted(({coluna: _valor_canonico(valor) for coluna, valor in zip(colunas, linha)}
+                            for linha in df_problemas.itertuples(index=False, name=None)),
+                           key=_chave_ordenacao)
+    return {'data': report_date.strftime('%Y-%m-%d'), 'faltas': faltas, 'problemas': problemas}
+
+
+def _chave_caso(sufixo, filtro):
+    filtro_ativo, hora_inicio, hora_fim = filtro
+    return f"{sufixo} {hora_inicio}-{hora_fim}" if filtro_ativo else f"{sufixo} sem filtro"
+
+
+def _casos(pasta, filtros):
+    from lote import encontrar_pares
+    for sufixo, ausentes_path, frequencia_path in encontrar_pares(pasta):
+        for filtro in filtros:
+            yield _chave_caso(sufixo, filtro), ausentes_path, frequencia_path, tuple(filtro)
+
+
+def executar_motor(nome_motor, pasta=None, filtros=None, logger=print):
+    """
+    Roda o motor em todos os dias da pasta (padrão: pdf/) e filtros.
+    Retorna {caso: retrato canônico}.
+    """
+    motor = MOTORES[nome_motor]
+    retratos = {}
+    for caso, ausentes_path, frequencia_path, filtro in _casos(pasta or config.PDF_DIR, filtros or FILTROS_PADRAO):
+        retratos[caso] = retrato_canonico(*motor(ausentes_path, frequencia_path, lambda mensagem: None, *filtro))
+    logger(f"Motor '{nome_motor}': {len(retratos)} caso(s) processado(s).")
+    return retratos
+
+
+def diferencas(esperado, obtido, limite=20):
+    """
+    Diferenças legíveis entre dois retratos do mesmo caso ('-' = só no
+    esperado, '+' = só no obtido). Lista vazia se forem iguais.
+    """
+    if esperado == obtido:
+        return []
+    if esperado is None or obtido is None:
+        return [f"resultado {'ausente' if obtido is None else 'inesperado'}: "
+                f"esperado {esperado and esperado['data']}, obtido {obtido and obtido['data']}"]
+    linhas = []
+    if esperado['data'] != obtido['data']:
+        linhas.append(f"data: {esperado['data']} -> {obtido['data']}")
+
+    totais_esperados = {tuple(falta[:4]): falta[4] for falta in esperado['faltas']}
+    totais_obtidos = {tuple(falta[:4]): falta[4] for falta in obtido['faltas']}
+    for chave in sorted(totais_esperados.keys() | totais_obtidos.keys()):
+        antes, depois = totais_esperados.get(chave), totais_obtidos.get(chave)
+        if antes == depois:
+            continue
+        descricao = ' | '.join(chave)
+        if depois is None:
+            linhas.append(f"- falta: {descricao} ({antes})")
+        elif antes is None:
+            linhas.append(f"+ falta: {descricao} ({depois})")
+        else:
+            linhas.append(f"~ falta: {descricao} ({antes} -> {depois})")
+
+    problemas_esperados = Counter(map(_chave_ordenacao, esperado['problemas']))
+    problemas_obtidos = Counter(map(_chave_ordenacao, obtido['problemas']))
+    linhas.extend(f"- ocorrência: {linha}" for linha in sorted((problemas_esperados - problemas_obtidos).elements()))
+    linhas.extend(f"+ ocorrência: {linha}" for linha in sorted((problemas_obtidos - problemas_esperados).elements()))
+
+    if len(linhas) > limite:
+        linhas = linhas[:limite] + [f"... e mais {len(linhas) - limite} diferença(s)"]
+    return linhas
+
+
+def comparar_retratos(esperados, obtidos, rotulo, logger=print):
+    """
+    Compara dois conjuntos de retratos caso a caso. Retorna True se forem idênticos.
+    """
+    iguais = True
+    for caso in sorted(esperados.keys() | obtidos.keys()):
+        if caso not in obtidos or caso not in esperados:
+            iguais = False
+            logger(f"[{caso}] caso {'não executado' if caso not in obtidos else 'sem retrato gravado'}")
+            continue
+        linhas = diferencas(esperados[caso], obtidos[caso])
+        if linhas:
+            iguais = False
+            logger(f"[{caso}] {len(linhas)} diferença(s):")
+            for linha in linhas:
+                logger(f"    {linha}")
+    logger(f"{rotulo}: {'IDÊNTICO' if iguais else 'DIFERENTE'}")
+    return iguais
+
+
+def caminho_retratos(nome):
+    return os.path.join(config.CACHE_DIR, 'equivalencia', f'{nome}.json')
+
+
+def gravar_retratos(retratos, nome, motor):
+    caminho = caminho_retratos(nome)
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump({'motor': motor, 'casos': retratos}, arquivo, ensure_ascii=False, indent=1)
+    return caminho
+
+
+def carregar_retratos(nome):
+    with open(caminho_retratos(nome), encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def lado_a_lado(motor_a, motor_b, pasta=None, filtros=None, logger=print):
+    """
+    Roda os dois motores no mesmo processo, dia a dia, e compara os resultados.
+    """
+    esperados, obtidos = {}, {}
+    silencio = lambda mensagem: None
+    for caso, ausentes_path, frequencia_path, filtro in _casos(pasta or config.PDF_DIR, filtros or FILTROS_PADRAO):
+        esperados[caso] = retrato_canonico(*MOTORES[motor_a](ausentes_path, frequencia_path, silencio, *filtro))
+        obtidos[caso] = retrato_canonico(*MOTORES[motor_b](ausentes_path, frequencia_path, silencio, *filtro))
+    return comparar_retratos(esperados, obtidos, f"'{motor_a}' x '{motor_b}'", logger)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Equivalência dos resultados diários entre motores.")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    gravar = comandos.add_parser('gravar', help="Grava os retratos de referência de um motor.")
+    gravar.add_argument('--motor', default='referencia', choices=sorted(MOTORES))
+    gravar.add_argument('--nome', default='referencia', help="Nome dos retratos (cache/equivalencia/NOME.json).")
+    verificar = comandos.add_parser('verificar', help="Compara motores com os retratos gravados.")
+    verificar.add_argument('--motor', nargs='+', default=sorted(MOTORES), choices=sorted(MOTORES))
+    verificar.add_argument('--nome', default='referencia')
+    lado = comandos.add_parser('lado-a-lado', help="Compara dois motores no mesmo processo.")
+    lado.add_argument('motor_a', choices=sorted(MOTORES))
+    lado.add_argument('motor_b', choices=sorted(MOTORES))
+    args = parser.parse_args()
+
+    with _banco_migrado():
+        if args.comando == 'gravar':
+            caminho = gravar_retratos(executar_motor(args.motor), args.nome, args.motor)
+            print(f"Retratos gravados em: {caminho}")
+            return
+        if args.comando == 'lado-a-lado':
+            iguais = lado_a_lado(args.motor_a, args.motor_b)
+        else:
+            referencia = carregar_retratos(args.nome)
+            iguais = True
+            for motor in args.motor:
+                obtidos = executar_motor(motor)
+                iguais &= comparar_retratos(referencia['casos'], obtidos,
+                                            f"'{motor}' x retratos '{args.nome}' ({referencia['motor']})")
+    if not iguais:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Suíte de benchmarks por etapa, sobre todos os dias de pdf/ ou sobre um corpus
+sintético com N vezes mais alunos (ver benchmarks/sintetico.py).
+
+Para cada dia, cada etapa é executada 'repetições' vezes, com o cache de
+extração desligado e sobre cópias temporárias do banco e da pasta de relatórios:
+- extrair_dados_ausentes / extrair_dados_frequencia: leitura dos PDFs;
+- carregar_dados_base: leitura das tabelas de alunos e horários;
+- buscar_aluno: índice de alunos + busca de todos os alunos dos dois PDFs;
+- apurar_dia: apuração do dia já extraído (inclui as buscas e o laço de presença);
+- reaplicar_filtro: só a troca do filtro de horário (00:00-12:00) sobre a apuração já feita;
+- gerar_relatorio_faltas: relatório detalhado (o arquivo cresce a cada dia, como na semana real);
+- gerar_relatorio_simples: relatório simples do dia.
+
+Mostra mediana e p95 de cada etapa (sobre todos os dias e repetições) e o pico
+de memória (RSS) do processo ao fim de cada etapa, e grava tudo em JSON.
+Com --comparar, compara com um JSON salvo antes e marca as regressões
+(saída com código 1 se houver alguma).
+
+Uso: python -m benchmarks.executar [--escala N] [--repeticoes R] [--dias D]
+                                   [--saida ARQUIVO.json] [--comparar BASE.json] [--tolerancia 0.2]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+ETAPAS = ['extrair_dados_ausentes', 'extrair_dados_frequencia', 'carregar_dados_base',
+          'buscar_aluno', 'apurar_dia', 'reaplicar_filtro', 'gerar_relatorio_faltas', 'gerar_relatorio_simples']
+
+
+def _silencio(mensagem):
+    pass
+
+
+def rss_pico_mb():
+    """
+    Pico de memória residente do processo até agora, em MB (None no Windows).
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS, em bytes
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def percentil(valores, fracao):
+    """
+    Percentil com interpolação linear entre as amostras ordenadas.
+    """
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * fracao
+    abaixo, acima = math.floor(posicao), math.ceil(posicao)
+    return ordenados[abaixo] + (ordenados[acima] - ordenados[abaixo]) * (posicao - abaixo)
+
+
+def _medir(funcao, repeticoes):
+    """
+    Executa a função 'repeticoes' vezes; retorna os tempos (s) e o último resultado.
+    """
+    tempos, resultado = [], None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos, resultado
+
+
+def _buscar_todos(df_alunos, df_ausentes, df_frequencia):
+    from modulos.indice_alunos import StudentIndex
+    indice = StudentIndex(df_alunos)
+    if df_ausentes is not None:
+        for matricula, nome in df_ausentes[['Matrícula', 'Nome']].itertuples(index=False, name=None):
+            indice.buscar(matricula, nome, _silencio)
+    if df_frequencia is not None:
+        pares = df_frequencia[['Crachá', 'Nome']].drop_duplicates()
+        for cracha, nome in pares.itertuples(index=False, name=None):
+            indice.buscar(cracha, nome, _silencio)
+
+
+def executar(escala=1, repeticoes=5, dias=None, logger=print):
+    """
+    Roda a suíte e devolve o resultado (o mesmo dicionário gravado em JSON).
+    """
+    from lote import encontrar_pares
+    from modulos import repositorio
+    from modulos.migracoes import aplicar_migracoes
+    from modulos.extrator_ausentes import extrair_dados_ausentes
+    from modulos.extrator_frequencias import extrair_dados_frequencia
+    from modulos.processador import carregar_dados_base, apurar_dia, preparar_apuracao, reaplicar_filtro
+    from modulos.gerador_relatorios import gerar_relatorio_faltas, gerar_relatorio_simples
+
+    if escala == 1:
+        pasta_pdfs, db_origem = config.PDF_DIR, config.DB_PATH
+    else:
+        from benchmarks.sintetico import gerar_corpus
+        pasta_pdfs = gerar_corpus(escala, dias=dias, logger=logger)
+        db_origem = os.path.join(pasta_pdfs, config.DB_NAME)
+    pares = encontrar_pares(pasta_pdfs)[:dias]
+
+    amostras = {etapa: [] for etapa in ETAPAS}
+    rss_por_etapa = {}
+    originais = (config.DB_PATH, config.REPORTS_DIR, config.CACHE_EXTRACAO_ATIVO)
+    with tempfile.TemporaryDirectory(prefix='benchmark_') as temporario:
+        config.DB_PATH = os.path.join(temporario, config.DB_NAME)
+        config.REPORTS_DIR = os.path.join(temporario, 'relatorios')
+        config.CACHE_EXTRACAO_ATIVO = False
+        try:
+            shutil.copyfile(db_origem, config.DB_PATH)
+            aplicar_migracoes(logger=_silencio)
+
+            def registrar(etapa, tempos):
+                amostras[etapa].extend(tempos)
+                rss_por_etapa[etapa] = rss_pico_mb()
+
+            for sufixo, ausentes_path, frequencia_path in pares:
+                logger(f"Dia {sufixo}...")
+                tempos, resultado_ausentes = _medir(lambda: extrair_dados_ausentes(ausentes_path), repeticoes)
+                registrar('extrair_dados_ausentes', tempos)
+                tempos, resultado_frequencia = _medir(lambda: extrair_dados_frequencia(frequencia_path), repeticoes)
+                registrar('extrair_dados_frequencia', tempos)
+                tempos, (df_alunos, df_horarios) = _medir(lambda: carregar_dados_base(_silencio), repeticoes)
+                registrar('carregar_dados_base', tempos)
+                if df_alunos is None or resultado_ausentes[1] is None or resultado_frequencia[1] is None:
+                    logger(f"  AVISO: Dia {sufixo} ignorado (falha na extração ou no banco).")
+                    continue
+
+                tempos, _ = _medir(lambda: _buscar_todos(df_alunos, resultado_ausentes[0], resultado_frequencia[0]),
+                                   repeticoes)
+                registrar('buscar_aluno', tempos)
+                tempos, dados_do_dia = _medir(
+                    lambda: apurar_dia(resultado_ausentes, resultado_frequencia, df_alunos, df_horarios, None, _silencio),
+                    repeticoes)
+                registrar('apurar_dia', tempos)
+                if dados_do_dia[0] is None:
+                    logger(f"  AVISO: Dia {sufixo} sem resultado na apuração.")
+                    continue
+                apuracao = preparar_apuracao(resultado_ausentes, resultado_frequencia, df_alunos, df_horarios)
+                tempos, _ = _medir(lambda: reaplicar_filtro(apuracao, (0, 12 * 60), _silencio), repeticoes)
+                registrar('reaplicar_filtro', tempos)
+
+                report_date, _, df_problemas = dados_do_dia
+                sessao = {report_date.strftime('%d-%m-%Y'): dados_do_dia}
+                tempos, _ = _medir(lambda: gerar_relatorio_faltas(sessao, _silencio), repeticoes)
+                registrar('gerar_relatorio_faltas', tempos)
+                tempos, _ = _medir(lambda: gerar_relatorio_simples(df_problemas, report_date, _silencio), repeticoes)
+                registrar('gerar_relatorio_simples', tempos)
+        finally:
+            repositorio.obter_pool().fechar()
+            config.DB_PATH, config.REPORTS_DIR, config.CACHE_EXTRACAO_ATIVO = originais
+
+    etapas = {}
+    for etapa in ETAPAS:
+        tempos = amostras[etapa]
+        if not tempos:
+            continue
+        etapas[etapa] = {
+            'mediana_ms': statistics.median(tempos) * 1000,
+            'p95_ms': percentil(tempos, 0.95) * 1000,
+            'amostras': len(tempos),
+            'rss_pico_mb': rss_por_etapa.get(etapa),
+        }
+    return {
+        'metadados': {
+            'data': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'escala': escala,
+            'repeticoes': repeticoes,
+            'dias': [sufixo for sufixo, _, _ in pares],
+        },
+        'etapas': etapas,
+        'rss_pico_mb': rss_pico_mb(),
+    }
+
+
+def _formatar_mb(valor):
+    return f"{valor:8.1f}" if valor is not None else "     n/d"
+
+
+def imprimir_tabela(resultado, logger=print):
+    meta = resultado['metadados']
+    logger(f"\nEscala {meta['escala']}x | {len(meta['dias'])} dia(s) | {meta['repeticoes']} repetição(ões)")
+    logger(f"{'etapa':<26} {'mediana ms':>11} {'p95 ms':>10} {'amostras':>9} {'RSS MB':>8}")
+    for etapa, dados in resultado['etapas'].items():
+        logger(f"{etapa:<26} {dados['mediana_ms']:11.2f} {dados['p95_ms']:10.2f} {dados['amostras']:9d}"
+               f" {_formatar_mb(dados['rss_pico_mb'])}")
+    logger(f"{'pico de RSS do processo':<58} {_formatar_mb(resultado['rss_pico_mb'])}")
+
+
+def comparar(resultado, base, tolerancia=0.2, logger=print):
+    """
+    Compara as medianas (e o pico de RSS) com um resultado salvo antes.
+    Retorna True se alguma etapa piorou mais que a tolerância.
+    """
+    if base['metadados'].get('escala') != resultado['metadados']['escala']:
+        logger("AVISO: A base foi medida em outra escala; a comparação pode não fazer sentido.")
+    logger(f"\nComparação com a base de {base['metadados'].get('data', '?')} (tolerância {tolerancia:.0%}):")
+    regressao = False
+    for etapa, dados in resultado['etapas'].items():
+        anterior = base['etapas'].get(etapa)
+        if not anterior:
+            logger(f"{etapa:<26} sem medição na base")
+            continue
+        razao = dados['mediana_ms'] / anterior['mediana_ms'] if anterior['mediana_ms'] else float('inf')
+        if razao > 1 + tolerancia:
+            situacao, regressao = "REGRESSÃO", True
+        elif razao < 1 - tolerancia:
+            situacao = "melhora"
+        else:
+            situacao = "ok"
+        logger(f"{etapa:<26} {anterior['mediana_ms']:10.2f} -> {dados['mediana_ms']:10.2f} ms ({razao:5.2f}x) {situacao}")
+    if resultado['rss_pico_mb'] and base.get('rss_pico_mb'):
+        razao = resultado['rss_pico_mb'] / base['rss_pico_mb']
+        situacao = "REGRESSÃO" if razao > 1 + tolerancia else "ok"
+        regressao = regressao or razao > 1 + tolerancia
+        logger(f"{'pico de RSS':<26} {base['rss_pico_mb']:10.1f} -> {resultado['rss_pico_mb']:10.1f} MB ({razao:5.2f}x) {situacao}")
+    return regressao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks por etapa do processamento diário.")
+    parser.add_argument('--escala', type=int, default=1, help="Multiplicador de alunos (1 = PDFs reais; ex.: 10, 100).")
+    parser.add_argument('--repeticoes', type=int, default=5, help="Execuções de cada etapa por dia.")
+    parser.add_argument('--dias', type=int, default=None, help="Usa só os N primeiros dias.")
+    parser.add_argument('--saida', default=None,
+                        help="Arquivo JSON do resultado (padrão: cache/benchmarks/resultado_escala_N.json).")
+    parser.add_argument('--comparar', metavar='BASE', default=None, help="JSON de uma execução anterior.")
+    parser.add_argument('--tolerancia', type=float, default=0.2, help="Piora tolerada na comparação (0.2 = 20%%).")
+    args = parser.parse_args()
+
+    resultado = executar(args.escala, args.repeticoes, args.dias)
+    imprimir_tabela(resultado)
+
+    saida = args.saida or os.path.join(config.CACHE_DIR, 'benchmarks', f'resultado_escala_{args.escala}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultado salvo em: {saida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        if comparar(resultado, base, args.tolerancia):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark de inicialização: tempo até a primeira janela do App.
+
+Cada medição roda em um processo novo (imports frios) e compara:
+- 'antes': importa pandas, openpyxl, PyMuPDF e os módulos de processamento
+  antes de criar a janela, como a interface fazia originalmente;
+- 'depois': o caminho atual do main.py, com os módulos pesados importados
+  sob demanda / em segundo plano depois que a janela aparece.
+
+Os dois modos executam o main.py de verdade (imports, migrações, contagens
+de alunos e horários e criação do App), com o mainloop do Tk trocado por um
+único desenho da janela. O banco usado é uma cópia já migrada de db/unico.db.
+Sem display disponível (ex.: servidor), mede apenas até o ponto em que a
+janela seria criada. Com --importtime, mostra os imports mais caros de cada modo.
+
+Uso: python -m benchmarks.inicializacao [repetições] [--importtime]
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ_PROJETO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_SCRIPT = r'''
+import sys
+sys.path.insert(0, {raiz!r})
+import config
+config.DB_PATH = {banco!r}
+if {antes!r}:
+    import fitz, pandas, openpyxl
+    import modulos.processador, modulos.gerador_relatorios
+import tkinter as tk
+
+def _mainloop(self, n=0):
+    # Desenha a janela uma vez, sem esperar o usuário
+    self.update()
+    print("JANELA")
+    self.destroy()
+
+tk.Tk.mainloop = _mainloop
+import main
+try:
+    main.main()
+except tk.TclError:
+    print("SEM_DISPLAY")
+'''
+
+
+def _preparar_banco(pasta):
+    """
+    Cópia migrada do banco, para que as medições não alterem db/unico.db e
+    meçam a inicialização de um banco já atualizado.
+    """
+    sys.path.insert(0, RAIZ_PROJETO)
+    import config
+    from modulos import repositorio
+    from modulos.migracoes import aplicar_migracoes
+
+    banco = os.path.join(pasta, config.DB_NAME)
+    shutil.copyfile(config.DB_PATH, banco)
+    original = config.DB_PATH
+    config.DB_PATH = banco
+    try:
+        aplicar_migracoes(logger=lambda mensagem: None)
+    finally:
+        repositorio.obter_pool().fechar()
+        config.DB_PATH = original
+    return banco
+
+
+def _medir_modo(antes, banco, importtime=False):
+    comando = [sys.executable]
+    if importtime:
+        comando += ['-X', 'importtime']
+    comando += ['-c', _SCRIPT.format(raiz=RAIZ_PROJETO, banco=banco, antes=antes)]
+    inicio = time.perf_counter()
+    resultado = subprocess.run(comando, capture_output=True, text=True, cwd=RAIZ_PROJETO)
+    decorrido = time.perf_counter() - inicio
+    return decorrido, 'JANELA' in resultado.stdout, resultado.stderr
+
+
+def _imports_mais_caros(stderr, quantidade=8):
+    """
+    Lê a saída de -X importtime e retorna os imports de primeiro nível mais caros.
+    """
+    linhas = []
+    for linha in stderr.splitlines():
+        partes = linha[len('import time:'):].split('|')
+        if not linha.startswith('import time:') or len(partes) != 3:
+            continue
+        try:
+            cumulativo = int(partes[1])
+        except ValueError:
+            continue  # linha de cabeçalho
+        modulo = partes[2]
+        if len(modulo) - len(modulo.lstrip()) == 1:
+            linhas.append((cumulativo, modulo.strip()))
+    return sorted(linhas, reverse=True)[:quantidade]
+
+
+def main():
+    argumentos = [argumento for argumento in sys.argv[1:] if not argumento.startswith('--')]
+    repeticoes = int(argumentos[0]) if argumentos else 5
+    mostrar_importtime = '--importtime' in sys.argv
+
+    with tempfile.TemporaryDirectory(prefix='inicializacao_') as pasta:
+        banco = _preparar_banco(pasta)
+        for nome, antes in (('antes', True), ('depois', False)):
+            tempos, janela = [], False
+            for _ in range(repeticoes):
+                decorrido, janela, _ = _medir_modo(antes, banco)
+                tempos.append(decorrido)
+            alvo = "primeira janela" if janela else "criação da janela (sem display)"
+            print(f"{nome:<7} | tempo até {alvo}: mediana {statistics.median(tempos) * 1000:7.1f} ms"
+                  f" | mín {min(tempos) * 1000:7.1f} ms ({repeticoes} execuções)")
+            if mostrar_importtime:
+                _, _, stderr = _medir_modo(antes, banco, importtime=True)
+                for cumulativo, modulo in _imports_mais_caros(stderr):
+                    print(f"          {cumulativo / 1000:8.1f} ms  {modulo}")
+
+
+if __name__ == "__main__":
+    main()
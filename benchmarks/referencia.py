@@ -0,0 +1,220 @@
+"""
+Motor de referência congelado para a verificação de equivalência.
+
+Reproduz o processamento diário como era antes das otimizações: busca dos
+alunos varrendo o DataFrame (iterrows na busca parcial), aulas filtradas por
+turma e dia a cada aluno e presença aula a aula com iterrows sobre os acessos.
+A extração usa as regexes originais guardadas em benchmarks/tokenizador.py.
+Não deve ser otimizado nem reaproveitar código de modulos/: é contra ele que
+os retratos de equivalência são gravados.
+
+A única adaptação é a coluna 'hora_acesso' (segundos desde a meia-noite),
+acrescentada ao df_problemas depois, a partir do texto de 'Acesso', para
+que o retrato tenha as mesmas colunas que o do processador atual.
+"""
+import os
+import re
+import sqlite3
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+DIAS_SEMANA = {0: 'SEGUNDA-FEIRA', 1: 'TERÇA-FEIRA', 2: 'QUARTA-FEIRA',
+               3: 'QUINTA-FEIRA', 4: 'SEXTA-FEIRA', 5: 'SÁBADO', 6: 'DOMINGO'}
+
+
+# --- Extração (regexes originais) ---
+
+def _texto_completo(caminho_pdf):
+    import fitz
+    with fitz.open(caminho_pdf) as doc:
+        return "".join(page.get_text("text") for page in doc)
+
+
+def _data_do_texto(full_text):
+    match_data = re.search(r"Período: de (\d{2}/\d{2}/\d{4})", full_text)
+    return datetime.strptime(match_data.group(1), '%d/%m/%Y') if match_data else None
+
+
+def extrair_ausentes(caminho_pdf):
+    import pandas as pd
+    from benchmarks.tokenizador import ausentes_referencia
+    full_text = _texto_completo(caminho_pdf)
+    _, alunos = ausentes_referencia(full_text)
+    if not alunos:
+        return None, _data_do_texto(full_text)
+    df_ausentes = pd.DataFrame(alunos, columns=['Matrícula', 'Nome'])
+    df_ausentes['Nome'] = df_ausentes['Nome'].str.strip()
+    return df_ausentes, _data_do_texto(full_text)
+
+
+def extrair_frequencia(caminho_pdf):
+    import pandas as pd
+    from benchmarks.tokenizador import frequencia_referencia
+    full_text = _texto_completo(caminho_pdf)
+    registros = frequencia_referencia(full_text)
+    if not registros:
+        return None, _data_do_texto(full_text)
+    return pd.DataFrame(registros, columns=['Crachá', 'Nome', 'Hora', 'Sentido']), _data_do_texto(full_text)
+
+
+# --- Busca dos alunos e apuração (lógica original) ---
+
+def buscar_aluno(df_alunos, matricula_pdf=None, nome_pdf=None, logger=print):
+    if matricula_pdf:
+        resultado = df_alunos[df_alunos['matricula'] == str(matricula_pdf)]
+        if not resultado.empty: return resultado.iloc[0]
+    if nome_pdf:
+        nome_pdf_normalizado = ' '.join(nome_pdf.strip().upper().split())
+        resultado = df_alunos[df_alunos['nome'].str.strip().str.upper() == nome_pdf_normalizado]
+        if not resultado.empty: return resultado.iloc[0]
+        palavras_pdf = nome_pdf_normalizado.split()
+        if len(palavras_pdf) < 2: return None
+        correspondencias_parciais = []
+        for index, row in df_alunos.iterrows():
+            nome_db_normalizado = ' '.join(row['nome'].strip().upper().split())
+            palavras_db = nome_db_normalizado.split()
+            if len(palavras_pdf) > len(palavras_db): continue
+            match = True
+            for i in range(len(palavras_pdf)):
+                palavra_pdf, palavra_db = palavras_pdf[i], palavras_db[i]
+                if i == len(palavras_pdf) - 1:
+                    if not palavra_db.startswith(palavra_pdf): match = False; break
+                else:
+                    if palavra_pdf != palavra_db: match = False; break
+            if match: correspondencias_parciais.append(row)
+        if len(correspondencias_parciais) == 1:
+            return correspondencias_parciais[0]
+        elif len(correspondencias_parciais) > 1:
+            logger(f"  AVISO: Múltiplos alunos para '{nome_pdf}'.")
+    return None
+
+
+def carregar_dados_base(logger):
+    import pandas as pd
+    conn = sqlite3.connect(config.DB_PATH)
+    try:
+        df_alunos = pd.read_sql_query("SELECT * FROM alunos", conn)
+        df_horarios = pd.read_sql_query("SELECT * FROM horarios", conn)
+    finally:
+        conn.close()
+    df_alunos['matricula'] = df_alunos['matricula'].astype(str)
+    df_horarios['hora_inicio'] = pd.to_datetime(df_horarios['hora_inicio'], format='%H:%M').dt.time
+    df_horarios['hora_fim'] = pd.to_datetime(df_horarios['hora_fim'], format='%H:%M').dt.time
+    return df_alunos, df_horarios
+
+
+def _aulas_do_dia(df_horarios, turma, dia_semana, filtro):
+    aulas_do_dia = df_horarios[(df_horarios['turma'] == turma) & (df_horarios['dia_semana'] == dia_semana)]
+    if filtro is not None:
+        hora_inicio_obj, hora_fim_obj = filtro
+        aulas_do_dia = aulas_do_dia[
+            (aulas_do_dia['hora_inicio'] >= hora_inicio_obj) &
+            (aulas_do_dia['hora_inicio'] < hora_fim_obj)
+        ]
+    return aulas_do_dia
+
+
+def _problema(matricula_db, nome_db, turma, problema, acesso):
+    return {'Matricula': matricula_db, 'Nome do Aluno': nome_db, 'Turma': turma,
+            'Problema': problema, 'Acesso': acesso}
+
+
+def processar_dados_diarios(ausentes_path, frequencia_path, logger,
+                            filtro_ativo=False, hora_inicio="00:00", hora_fim="23:59"):
+    import pandas as pd
+    try:
+        filtro = None
+        if filtro_ativo:
+            filtro = (datetime.strptime(hora_inicio, '%H:%M').time(),
+                      datetime.strptime(hora_fim, '%H:%M').time())
+    except ValueError:
+        return None, None, None
+
+    df_alunos, df_horarios = carregar_dados_base(logger)
+    faltas_registradas = {}
+    problemas_alunos = []
+
+    def contar_falta(matricula_db, nome_db, turma, disciplina):
+        chave_falta = (matricula_db, nome_db, turma, disciplina)
+        faltas_registradas[chave_falta] = faltas_registradas.get(chave_falta, 0) + 1
+
+    df_ausentes, report_date = extrair_ausentes(ausentes_path)
+    if report_date is None:
+        return None, None, None
+    dia_semana = DIAS_SEMANA.get(report_date.weekday())
+
+    if df_ausentes is not None and not df_ausentes.empty:
+        for _, row in df_ausentes.iterrows():
+            info_aluno = buscar_aluno(df_alunos, matricula_pdf=row['Matrícula'], nome_pdf=row['Nome'], logger=logger)
+            if info_aluno is None:
+                continue
+            turma, nome_db, matricula_db = info_aluno['turma'], info_aluno['nome'], info_aluno['matricula']
+            problemas_alunos.append(_problema(matricula_db, nome_db, turma, 'FALTOU', 'Sem registro'))
+            for _, aula in _aulas_do_dia(df_horarios, turma, dia_semana, filtro).iterrows():
+                contar_falta(matricula_db, nome_db, turma, aula['disciplina'])
+
+    df_frequencia, date_frequencia = extrair_frequencia(frequencia_path)
+    if date_frequencia is None or report_date.date() != date_frequencia.date():
+        return None, None, None
+
+    if df_frequencia is not None and not df_frequencia.empty:
+        df_frequencia['Hora'] = pd.to_datetime(df_frequencia['Hora'], format='%H:%M:%S').dt.time
+        for grupo_keys, acesso_aluno_df in df_frequencia.groupby(['Crachá', 'Nome']):
+            info_aluno = buscar_aluno(df_alunos, matricula_pdf=grupo_keys[0], nome_pdf=grupo_keys[1], logger=logger)
+            if info_aluno is None:
+                continue
+            turma, nome_db, matricula_db = info_aluno['turma'], info_aluno['nome'], info_aluno['matricula']
+            aulas_do_dia = _aulas_do_dia(df_horarios, turma, dia_semana, filtro)
+            if aulas_do_dia.empty:
+                continue
+
+            acesso_aluno_df = acesso_aluno_df.sort_values('Hora')
+            hora_inicio_aulas = aulas_do_dia.iloc[0]['hora_inicio']
+            hora_fim_aulas = aulas_do_dia.iloc[-1]['hora_fim']
+            entradas = acesso_aluno_df[acesso_aluno_df['Sentido'] == 'Entrada']
+            saidas = acesso_aluno_df[acesso_aluno_df['Sentido'] == 'Saída']
+
+            if not entradas.empty:
+                hora_entrada = entradas.iloc[0]['Hora']
+                if hora_entrada.hour * 60 + hora_entrada.minute > hora_inicio_aulas.hour * 60 + hora_inicio_aulas.minute + 15:
+                    problemas_alunos.append(_problema(matricula_db, nome_db, turma, 'CHEGOU ATRASADO',
+                                                      f"Entrada: {hora_entrada.strftime('%H:%M:%S')}"))
+            if not saidas.empty:
+                hora_saida = saidas.iloc[-1]['Hora']
+                if hora_saida.hour * 60 + hora_saida.minute < hora_fim_aulas.hour * 60 + hora_fim_aulas.minute - 15:
+                    problemas_alunos.append(_problema(matricula_db, nome_db, turma, 'SAIU CEDO',
+                                                      f"Saída: {hora_saida.strftime('%H:%M:%S')}"))
+
+            for _, aula in aulas_do_dia.iterrows():
+                hora_ini_aula, hora_fim_aula = aula['hora_inicio'], aula['hora_fim']
+                presenca_na_aula = False
+                for _, acesso in acesso_aluno_df.iterrows():
+                    hora_acesso = acesso['Hora']
+                    if acesso['Sentido'] == 'Entrada' and hora_acesso <= hora_fim_aula:
+                        saidas_posteriores = acesso_aluno_df[
+                            (acesso_aluno_df['Sentido'] == 'Saída') &
+                            (acesso_aluno_df['Hora'] > hora_acesso)
+                        ]
+                        if saidas_posteriores.empty or saidas_posteriores.iloc[0]['Hora'] >= hora_ini_aula:
+                            presenca_na_aula = True
+                            break
+                if not presenca_na_aula:
+                    contar_falta(matricula_db, nome_db, turma, aula['disciplina'])
+
+    return report_date, faltas_registradas, _com_hora_acesso(pd.DataFrame(problemas_alunos))
+
+
+def _com_hora_acesso(df_problemas):
+    """
+    Acrescenta 'hora_acesso' (segundos desde a meia-noite, nulo para FALTOU),
+    coluna que o processador atual grava ao lado do texto de 'Acesso'.
+    """
+    if df_problemas.empty:
+        return df_problemas
+    horas = df_problemas['Acesso'].str.extract(r'(\d{2}):(\d{2}):(\d{2})$').astype('Int64')
+    df_problemas['hora_acesso'] = horas[0] * 3600 + horas[1] * 60 + horas[2]
+    return df_problemas
@@ -0,0 +1,165 @@
+"""
+Gerador de corpus sintético para os benchmarks.
+
+Multiplica o número de alunos dos PDFs reais de pdf/ por um fator (ex.: 10 ou
+100): cada aluno ganha (fator - 1) cópias, com crachá/matrícula prefixados por
+'9NN' e o nome prefixado por 'SNN ' (NN = número da cópia). O texto dos PDFs
+reais é reaproveitado bloco a bloco, então o layout é o mesmo que os
+extratores leem em produção. O banco é uma cópia migrada de db/unico.db com
+as mesmas cópias na tabela de alunos (os horários são os das turmas reais).
+
+Com fator 1, o corpus gerado deve produzir exatamente os resultados dos PDFs reais.
+
+Uso: python -m benchmarks.sintetico FATOR [--dias N] [--destino PASTA]
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+import config
+
+LINHAS_POR_PAGINA = 70
+
+_PADRAO_ALUNO_AUSENTES = re.compile(r'(\d+)\n(.*?)([ \n])ALUNO\n')
+_PADRAO_CABECALHO_ANTIGO = re.compile(r'(Nome:\n)(\d+)\n(.*?)\n')
+_PADRAO_CABECALHO_NOVO = re.compile(r'(Crachá:\s*)(\d+)(\s+Nome:\s*)(.*?)\n')
+
+
+def pasta_corpus(fator):
+    return os.path.join(config.CACHE_DIR, 'benchmarks', f'escala_{fator}')
+
+
+def _prefixos(copia):
+    return f"9{copia:02d}", f"S{copia:02d} "
+
+
+def _texto_pdf(caminho_pdf):
+    with fitz.open(caminho_pdf) as doc:
+        return "".join(page.get_text("text") for page in doc)
+
+
+def _escrever_pdf(caminho_pdf, texto):
+    """
+    Grava o texto em um PDF novo, LINHAS_POR_PAGINA linhas por página.
+    """
+    linhas = texto.rstrip('\n').split('\n')
+    doc = fitz.open()
+    for inicio in range(0, len(linhas), LINHAS_POR_PAGINA):
+        pagina = doc.new_page()
+        pagina.insert_text((36, 48), '\n'.join(linhas[inicio:inicio + LINHAS_POR_PAGINA]), fontsize=8)
+    doc.save(caminho_pdf, garbage=3, deflate=True)
+    doc.close()
+
+
+def _copiar_cabecalho_frequencia(bloco, copia):
+    prefixo_numero, prefixo_nome = _prefixos(copia)
+    bloco, trocas = _PADRAO_CABECALHO_ANTIGO.subn(
+        lambda m: f"{m[1]}{prefixo_numero}{m[2]}\n{prefixo_nome}{m[3]}\n", bloco, count=1)
+    if not trocas:
+        bloco = _PADRAO_CABECALHO_NOVO.sub(
+            lambda m: f"{m[1]}{prefixo_numero}{m[2]}{m[3]}{prefixo_nome}{m[4]}\n", bloco, count=1)
+    return bloco
+
+
+def texto_frequencia_escalado(texto, fator):
+    """
+    Repete cada bloco de aluno (fator - 1) vezes, com crachá e nome das cópias.
+    """
+    from modulos.extrator_frequencias import SEPARADOR_BLOCOS
+    partes = texto.split(SEPARADOR_BLOCOS)
+    blocos, final = partes[:-1], partes[-1]
+    saida = list(blocos)
+    for copia in range(1, fator):
+        saida.extend(_copiar_cabecalho_frequencia(bloco, copia) for bloco in blocos)
+    return SEPARADOR_BLOCOS.join(saida + [final])
+
+
+def texto_ausentes_escalado(texto, fator):
+    """
+    Repete a lista de alunos ausentes (fator - 1) vezes, com matrícula e nome das cópias.
+    """
+    registros = list(_PADRAO_ALUNO_AUSENTES.finditer(texto))
+    if not registros:
+        return texto
+    inicio, fim = registros[0].start(), registros[-1].end()
+    linhas = [texto[inicio:fim]]
+    for copia in range(1, fator):
+        prefixo_numero, prefixo_nome = _prefixos(copia)
+        linhas.extend(f"{prefixo_numero}{m[1]}\n{prefixo_nome}{m[2]}{m[3]}ALUNO\n" for m in registros)
+    return texto[:inicio] + ''.join(linhas) + texto[fim:]
+
+
+def _criar_banco(destino, fator):
+    """
+    Copia db/unico.db para o destino, aplica as migrações e insere as cópias dos alunos.
+    """
+    from modulos import repositorio
+    from modulos.migracoes import aplicar_migracoes
+    from modulos.consulta_alunos import inserir_alunos
+
+    caminho_db = os.path.join(destino, config.DB_NAME)
+    shutil.copyfile(os.path.join(config.DB_DIR, config.DB_NAME), caminho_db)
+    db_original = config.DB_PATH
+    config.DB_PATH = caminho_db
+    try:
+        aplicar_migracoes(logger=lambda mensagem: None)
+        if fator > 1:
+            alunos = repositorio.consultar("SELECT matricula, nome, turma FROM alunos ORDER BY rowid")
+            copias = []
+            for copia in range(1, fator):
+                prefixo_numero, prefixo_nome = _prefixos(copia)
+                copias.extend((f"{prefixo_numero}{matricula}", f"{prefixo_nome}{nome}", turma)
+                              for matricula, nome, turma in alunos if nome and turma)
+            inserir_alunos(copias)
+    finally:
+        repositorio.obter_pool().fechar()
+        config.DB_PATH = db_original
+    return caminho_db
+
+
+def gerar_corpus(fator, destino=None, dias=None, logger=print):
+    """
+    Gera (ou reaproveita, se já existir) o corpus com os alunos multiplicados
+    por 'fator'. Retorna a pasta com os PDFs e o banco unico.db.
+    """
+    from lote import encontrar_pares
+
+    destino = destino or pasta_corpus(fator)
+    pares = encontrar_pares(config.PDF_DIR)[:dias]
+    marcador = os.path.join(destino, '.completo')
+    if os.path.exists(marcador):
+        with open(marcador, encoding='utf-8') as arquivo:
+            if arquivo.read() == ','.join(sufixo for sufixo, _, _ in pares):
+                return destino
+    shutil.rmtree(destino, ignore_errors=True)
+    os.makedirs(destino)
+
+    _criar_banco(destino, fator)
+    for sufixo, ausentes_path, frequencia_path in pares:
+        logger(f"Gerando dia {sufixo} com {fator}x alunos...")
+        _escrever_pdf(os.path.join(destino, os.path.basename(ausentes_path)),
+                      texto_ausentes_escalado(_texto_pdf(ausentes_path), fator))
+        _escrever_pdf(os.path.join(destino, os.path.basename(frequencia_path)),
+                      texto_frequencia_escalado(_texto_pdf(frequencia_path), fator))
+    with open(marcador, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(','.join(sufixo for sufixo, _, _ in pares))
+    return destino
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera PDFs sintéticos com N vezes mais alunos.")
+    parser.add_argument('fator', type=int, help="Multiplicador do número de alunos (ex.: 10, 100).")
+    parser.add_argument('--dias', type=int, default=None, help="Usa só os N primeiros dias de pdf/.")
+    parser.add_argument('--destino', default=None, help="Pasta de saída (padrão: cache/benchmarks/escala_N).")
+    args = parser.parse_args()
+    pasta = gerar_corpus(args.fator, args.destino, args.dias)
+    print(f"Corpus sintético em: {pasta}")
+
+
+if __name__ == "__main__":
+    main()
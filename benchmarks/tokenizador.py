@@ -0,0 +1,99 @@
+"""
+Micro-benchmark do tokenizador de passagem única dos extratores.
+
+Compara, sobre os PDFs em pdf/, a extração por regex antiga (split em blocos e
+até três buscas por bloco) com o tokenizador atual, verificando que a saída é
+idêntica. Para os ausentes, compara a versão antiga com os padrões
+pré-compilados. O texto é extraído uma única vez antes da medição, para
+isolar o custo das regexes.
+
+Uso: python -m benchmarks.tokenizador [repetições]
+"""
+import glob
+import os
+import re
+import sys
+import timeit
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fitz
+import config
+from modulos.extrator_ausentes import PADRAO_DATA, PADRAO_ALUNO
+from modulos.extrator_frequencias import tokenizar_blocos
+
+
+# --- Implementações de referência (lógica anterior ao tokenizador) ---
+
+def frequencia_referencia(full_text):
+    registros = []
+    padrao_novo = re.compile(r"Crachá:\s*(\d+)\s+Nome:\s*(.*?)\n", re.DOTALL)
+    padrao_antigo = re.compile(r'Nome:\n(\d+)\n(.*?)\n', re.DOTALL)
+    for bloco in full_text.split('Total de Acessos do Pedestre:')[0:-1]:
+        cracha, nome = None, None
+        match = padrao_novo.search(bloco)
+        if match:
+            cracha, nome = match.groups()
+        else:
+            match = padrao_antigo.search(bloco)
+            if match:
+                cracha, nome = match.groups()
+        if not cracha or not nome:
+            continue
+        padrao_acesso = re.compile(r'\d{2}/\d{2}/\d{4}\s+(\d{2}:\d{2}:\d{2})\s+(Entrada|Saída)')
+        for hora, sentido in padrao_acesso.findall(bloco):
+            registros.append((cracha.strip(), nome.strip(), hora, sentido))
+    return registros
+
+
+def ausentes_referencia(full_text):
+    match_data = re.search(r"Período: de (\d{2}/\d{2}/\d{4})", full_text)
+    alunos = re.compile(r'(\d+)\s+(.*?)\s+ALUNO').findall(full_text)
+    return (match_data.group(1) if match_data else None), alunos
+
+
+# --- Implementações atuais ---
+
+def frequencia_tokenizador(full_text):
+    return list(tokenizar_blocos(full_text))
+
+
+def ausentes_tokenizador(full_text):
+    match_data = PADRAO_DATA.search(full_text)
+    return (match_data.group(1) if match_data else None), PADRAO_ALUNO.findall(full_text)
+
+
+def _texto_completo(caminho_pdf):
+    with fitz.open(caminho_pdf) as doc:
+        return "".join(page.get_text("text") for page in doc)
+
+
+def _medir(funcao, textos, repeticoes):
+    return min(timeit.repeat(lambda: [funcao(texto) for texto in textos], number=1, repeat=repeticoes))
+
+
+def main():
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    casos = [
+        ('frequencia', frequencia_referencia, frequencia_tokenizador),
+        ('ausentes', ausentes_referencia, ausentes_tokenizador),
+    ]
+    for tipo, referencia, atual in casos:
+        arquivos = sorted(glob.glob(os.path.join(config.PDF_DIR, f'{tipo}_*.pdf')))
+        if not arquivos:
+            print(f"Nenhum PDF de {tipo} encontrado em '{config.PDF_DIR}'.")
+            continue
+        textos = [_texto_completo(arquivo) for arquivo in arquivos]
+
+        divergentes = [os.path.basename(arquivo) for arquivo, texto in zip(arquivos, textos)
+                       if referencia(texto) != atual(texto)]
+        tempo_referencia = _medir(referencia, textos, repeticoes)
+        tempo_atual = _medir(atual, textos, repeticoes)
+
+        print(f"{tipo:<11} {len(arquivos):>3} PDFs | referência: {tempo_referencia * 1000:8.2f} ms"
+              f" | tokenizador: {tempo_atual * 1000:8.2f} ms | ganho: {tempo_referencia / tempo_atual:5.2f}x"
+              f" | saída idêntica: {'SIM' if not divergentes else 'NÃO ' + ', '.join(divergentes)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -19,4 +19,58 @@ SIMPLE_REPORT_PREFIX = 'relatorio_frequencia_'
 
 # --- PALAVRAS-CHAVE PARA VALIDAÇÃO E EXTRAÇÃO ---
 KEYWORD_AUSENTES = "Matrícula"
-KEYWORD_FREQUENCIA = "Crachá:"
\ No newline at end of file
+KEYWORD_FREQUENCIA = "Crachá:"
+
+# --- CACHE DE EXTRAÇÃO DOS PDFs ---
+# Resultados já extraídos ficam em cache/, indexados pelo SHA-256 do arquivo.
+CACHE_DIR = os.path.join(PROJECT_ROOT, 'cache')
+CACHE_EXTRACAO_ATIVO = True
+CACHE_TAMANHO_MAXIMO_MB = 200
+
+# --- EXTRAÇÃO PARALELA DE TEXTO (PDFs DE FREQUÊNCIA GRANDES) ---
+# PDFs com pelo menos este número de páginas têm o texto extraído em vários processos.
+EXTRACAO_PARALELA_ATIVA = True
+EXTRACAO_PARALELA_MIN_PAGINAS = 200
+EXTRACAO_PARALELA_PROCESSOS = None  # None = número de CPUs
+
+# --- EXPORTAÇÃO DOS RESULTADOS ---
+# Formatos gerados ao final do processamento: 'xlsx' (relatório detalhado via
+# openpyxl) e/ou 'csv', 'parquet', 'ndjson' (um arquivo de faltas e um de
+# ocorrências por dia, em EXPORTACAO_DIR). 'parquet' requer pyarrow.
+EXPORTACAO_FORMATOS = ['xlsx']
+EXPORTACAO_DIR = os.path.join(REPORTS_DIR, 'exportacao')
+
+# --- PROCESSAMENTO CONCORRENTE DE CADA DIA ---
+# Extrai os PDFs de ausentes e de frequência em processos separados enquanto
+# o banco de dados é carregado.
+PROCESSAMENTO_CONCORRENTE_ATIVO = True
+
+# --- MEDIÇÃO DE DESEMPENHO POR ETAPA ---
+# Mostra no console o tempo, o tempo de CPU, as linhas e o pico de memória de
+# cada etapa (extração, busca de alunos, apuração, relatórios) e grava as
+# medições em JSON na pasta dos relatórios. O pico de memória (tracemalloc)
+# deixa o processamento mais lento; desligue-o para comparar tempos.
+PERFIL_ATIVO = False
+PERFIL_MEMORIA = True
+
+# --- CONSOLE DA INTERFACE ---
+# As mensagens são escritas em lotes a cada CONSOLE_INTERVALO_MS; acima de
+# CONSOLE_MAX_LINHAS, as linhas mais antigas são descartadas. Sem o modo
+# detalhado, as linhas por aluno ("chegou atrasado", "saiu cedo") são omitidas.
+CONSOLE_DETALHADO = True
+CONSOLE_MAX_LINHAS = 5000
+CONSOLE_INTERVALO_MS = 100
+
+# --- REAVALIAÇÃO INCREMENTAL DO FILTRO DE HORÁRIO ---
+# Número de dias cuja apuração (alunos encontrados, intervalos de acesso e
+# matriz de presença) fica em memória: reprocessar um desses dias mudando só
+# o filtro de horário apenas reaplica o filtro. 0 desativa.
+CACHE_APURACAO_DIAS = 31
+
+# --- BUSCA DE ALUNOS POR SEMELHANÇA DO NOME ---
+# Quando nem a matrícula nem o nome (exato ou parcial) encontram o aluno, o
+# nome do PDF é comparado, sem acentos, com os nomes do banco por trigramas
+# (semelhança de 0 a 1). O mais parecido é aceito se atingir o limiar e ficar
+# pelo menos a margem acima do segundo colocado. Limiar acima de 1 desativa.
+LIMIAR_SEMELHANCA_NOME = 0.75
+MARGEM_SEMELHANCA_NOME = 0.05
@@ -1,18 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, scrolledtext, messagebox
 import os
+import queue
 import threading
-import fitz  # PyMuPDF, usado para a validação rápida
 
-# Importa as funções de lógica
+# As funções de lógica (pandas, openpyxl e PyMuPDF) são importadas sob demanda,
+# para que a janela apareça antes; ver App._aquecer_modulos.
 try:
-    from modulos.processador import processar_dados_diarios
-    from modulos.gerador_relatorios import gerar_relatorio_faltas, gerar_relatorio_simples
     import config
 except ImportError as e:
     print(f"ERRO DE IMPORTAÇÃO: {e}. Certifique-se de que a estrutura de pastas e os arquivos estão corretos.")
     exit()
 
+# Linhas de detalhe por aluno (ex.: "  - Fulano chegou atrasado às ..."),
+# omitidas do console quando o modo detalhado está desligado
+PREFIXO_DETALHE = "  - "
+
 class App:
     def __init__(self, root, db_alunos_status, db_alunos_count, db_horarios_status, db_horarios_count):
         self.root = root
@@ -22,6 +25,9 @@ class App:
         self.ausentes_pdf_path = ""
         self.frequencia_pdf_path = ""
         self.dados_processados_da_sessao = {}
+        # Par de PDFs do último processamento bem-sucedido: mudar o filtro de
+        # horário reprocessa esse par, reaplicando só o filtro (ver _reaplicar_filtro)
+        self._par_processado = None
 
         self.pdf_dir = config.PDF_DIR
         if not os.path.exists(self.pdf_dir):
@@ -30,10 +36,32 @@ class App:
         self.filtro_ativo = tk.BooleanVar(value=True)
         self.hora_inicio_filtro = tk.StringVar(value="00:00")
         self.hora_fim_filtro = tk.StringVar(value="12:00")
+        self.perfil_ativo = tk.BooleanVar(value=config.PERFIL_ATIVO)
+        self.console_detalhado = tk.BooleanVar(value=config.CONSOLE_DETALHADO)
+
+        # Mensagens do console: qualquer thread enfileira, o loop do Tk escreve
+        # em lotes (ver _drenar_console). O modo detalhado fica também em um
+        # atributo comum, pois a thread de processamento não pode ler variáveis do Tk.
+        self._fila_console = queue.SimpleQueue()
+        self._console_detalhado = config.CONSOLE_DETALHADO
 
         self._create_widgets()
         self._update_status_bar(db_alunos_status, db_alunos_count, db_horarios_status, db_horarios_count)
         self._toggle_filtro_horario()
+        self.root.after(config.CONSOLE_INTERVALO_MS, self._drenar_console)
+
+        # Importa os módulos pesados em segundo plano, depois que a janela aparece
+        self.root.after(100, self._aquecer_modulos)
+
+    def _aquecer_modulos(self):
+        def importar():
+            try:
+                import fitz
+                import modulos.processador
+                import modulos.gerador_relatorios
+            except ImportError as e:
+                self._write_to_console(f"ERRO DE IMPORTAÇÃO: {e}")
+        threading.Thread(target=importar, daemon=True).start()
 
     def _create_widgets(self):
         attach_frame = tk.Frame(self.root, padx=10, pady=10)
@@ -49,7 +77,7 @@ class App:
 
         filtro_frame = tk.Frame(self.root, padx=10)
         filtro_frame.pack(fill=tk.X, side=tk.TOP, pady=5)
-        self.chk_filtro = tk.Checkbutton(filtro_frame, text="Ativar filtro de horário (ignorar aulas fora do intervalo):", variable=self.filtro_ativo, command=self._toggle_filtro_horario)
+        self.chk_filtro = tk.Checkbutton(filtro_frame, text="Ativar filtro de horário (ignorar aulas fora do intervalo):", variable=self.filtro_ativo, command=self._alternar_filtro_horario)
         self.chk_filtro.pack(side=tk.LEFT)
         self.lbl_inicio = tk.Label(filtro_frame, text="Início:")
         self.lbl_inicio.pack(side=tk.LEFT, padx=(10, 0))
@@ -59,6 +87,12 @@ class App:
         self.lbl_fim.pack(side=tk.LEFT, padx=(10, 0))
         self.entry_fim = tk.Entry(filtro_frame, textvariable=self.hora_fim_filtro, width=7)
         self.entry_fim.pack(side=tk.LEFT)
+        self.entry_inicio.bind('<Return>', self._reaplicar_filtro)
+        self.entry_fim.bind('<Return>', self._reaplicar_filtro)
+        self.chk_perfil = tk.Checkbutton(filtro_frame, text="Medir desempenho das etapas", variable=self.perfil_ativo, command=self._toggle_perfil)
+        self.chk_perfil.pack(side=tk.RIGHT)
+        self.chk_detalhado = tk.Checkbutton(filtro_frame, text="Console detalhado", variable=self.console_detalhado, command=self._toggle_console_detalhado)
+        self.chk_detalhado.pack(side=tk.RIGHT)
         
         action_frame = tk.Frame(self.root)
         action_frame.pack(pady=10)
@@ -88,8 +122,31 @@ class App:
         self.entry_inicio.config(state=state)
         self.entry_fim.config(state=state)
 
+    def _alternar_filtro_horario(self):
+        self._toggle_filtro_horario()
+        self._reaplicar_filtro()
+
+    def _reaplicar_filtro(self, event=None):
+        """
+        Reprocessa o dia já processado com o filtro atual (Enter nos campos de
+        hora ou troca da caixa do filtro). A apuração do dia fica guardada, então
+        só o filtro é reaplicado e o resultado sai quase na hora.
+        """
+        par_atual = (self.ausentes_pdf_path, self.frequencia_pdf_path)
+        if self._par_processado != par_atual or str(self.btn_processar['state']) == "disabled":
+            return
+        self._iniciar_processamento()
+
+    def _toggle_perfil(self):
+        config.PERFIL_ATIVO = self.perfil_ativo.get()
+
+    def _toggle_console_detalhado(self):
+        self._console_detalhado = self.console_detalhado.get()
+
     def _get_pdf_text_for_validation(self, filepath):
+        # Validação rápida: só o texto da primeira página é lido
         try:
+            import fitz  # PyMuPDF
             with fitz.open(filepath) as doc:
                 if len(doc) > 0:
                     return doc[0].get_text()
@@ -135,52 +192,97 @@ class App:
             self.lbl_db_horarios_status.config(text="BD Horários: Erro de Conexão", fg="red")
             
     def _write_to_console(self, message):
-        self.console.config(state='normal')
-        self.console.insert(tk.END, message + "\n")
-        self.console.see(tk.END)
-        self.console.config(state='disabled')
-        self.root.update_idletasks()
+        # Pode ser chamado de qualquer thread: só enfileira, sem tocar no Tk
+        if not self._console_detalhado and message.startswith(PREFIXO_DETALHE):
+            return
+        self._fila_console.put(message)
+
+    def _drenar_console(self):
+        # Executado pelo loop do Tk a cada config.CONSOLE_INTERVALO_MS: escreve
+        # de uma vez todas as mensagens enfileiradas e descarta as linhas mais
+        # antigas acima de config.CONSOLE_MAX_LINHAS (um lote nunca passa
+        # desse limite, o restante fica para a próxima rodada).
+        mensagens = []
+        try:
+            while len(mensagens) < config.CONSOLE_MAX_LINHAS:
+                mensagens.append(self._fila_console.get_nowait())
+        except queue.Empty:
+            pass
+        if mensagens:
+            self.console.config(state='normal')
+            self.console.insert(tk.END, "\n".join(mensagens) + "\n")
+            excesso = int(self.console.index('end-1c').split('.')[0]) - 1 - config.CONSOLE_MAX_LINHAS
+            if excesso > 0:
+                self.console.delete('1.0', f'{excesso + 1}.0')
+            self.console.see(tk.END)
+            self.console.config(state='disabled')
+        self.root.after(config.CONSOLE_INTERVALO_MS, self._drenar_console)
         
     def _iniciar_processamento(self):
         self.console.config(state='normal')
         self.console.delete('1.0', tk.END)
         self.console.config(state='disabled')
+        # Mensagens ainda na fila são da execução anterior: descarta junto com o console
+        try:
+            while True:
+                self._fila_console.get_nowait()
+        except queue.Empty:
+            pass
         self.btn_processar.config(state="disabled", text="Processando...")
         self.btn_gerar_detalhado.config(state="disabled")
         self.btn_gerar_simples.config(state="disabled")
-        thread = threading.Thread(target=self._executar_processamento_em_thread)
+        # As variáveis do Tk só podem ser lidas aqui, na thread da interface
+        filtro = (self.filtro_ativo.get(), self.hora_inicio_filtro.get(), self.hora_fim_filtro.get())
+        thread = threading.Thread(target=self._executar_processamento_em_thread, args=filtro)
         thread.start()
 
-    def _executar_processamento_em_thread(self):
+    def _executar_processamento_em_thread(self, filtro_ativo, hora_inicio, hora_fim):
         if not self.ausentes_pdf_path or not self.frequencia_pdf_path:
             self._write_to_console("ERRO: Anexe os dois arquivos PDF antes de processar.")
             self.root.after(0, self._finalizar_processamento, False)
             return
+        from modulos import perfil
+        perfil.iniciar_sessao()
         try:
             self._write_to_console("--- INICIANDO PROCESSAMENTO DOS DADOS (em background) ---")
+            from modulos.processador import processar_dados_diarios
             dados_do_dia = processar_dados_diarios(
                 ausentes_path=self.ausentes_pdf_path,
                 frequencia_path=self.frequencia_pdf_path,
                 logger=self._write_to_console,
-                filtro_ativo=self.filtro_ativo.get(),
-                hora_inicio=self.hora_inicio_filtro.get(),
-                hora_fim=self.hora_fim_filtro.get()
+                filtro_ativo=filtro_ativo,
+                hora_inicio=hora_inicio,
+                hora_fim=hora_fim
             )
             sucesso = dados_do_dia and dados_do_dia[0] is not None
             if sucesso:
                 report_date, _, _ = dados_do_dia
                 sheet_name = report_date.strftime('%d-%m-%Y')
                 self.dados_processados_da_sessao[sheet_name] = dados_do_dia
+                self._par_processado = (self.ausentes_pdf_path, self.frequencia_pdf_path)
+                self._salvar_resultados_no_banco(dados_do_dia)
                 self._write_to_console(f"\n--- PROCESSAMENTO DO DIA {sheet_name} CONCLUÍDO ---")
                 self._write_to_console("Dados processados com sucesso. Agora você pode gerar os relatórios.")
+                self._write_to_console("Para testar outro filtro de horário, altere-o e tecle Enter.")
             else:
                 self._write_to_console("\n--- FALHA NO PROCESSAMENTO ---")
                 self._write_to_console("Verifique as mensagens de erro acima.")
+            perfil.relatar(self._write_to_console)
             self.root.after(0, self._finalizar_processamento, sucesso)
         except Exception as e:
             self._write_to_console(f"\nOcorreu um erro crítico durante o processamento:\n{e}")
+            perfil.relatar(self._write_to_console)
             self.root.after(0, self._finalizar_processamento, False)
             
+    def _salvar_resultados_no_banco(self, dados_do_dia):
+        import sqlite3
+        from modulos.consulta_resultados import salvar_resultados_do_dia
+        try:
+            salvar_resultados_do_dia(*dados_do_dia)
+            self._write_to_console("Resultados do dia salvos no banco de dados.")
+        except sqlite3.Error as e:
+            self._write_to_console(f"AVISO: Não foi possível salvar os resultados no banco de dados: {e}")
+
     def _finalizar_processamento(self, sucesso):
         self.btn_processar.config(state="normal", text="1. Processar Dados do Dia")
         if sucesso:
@@ -191,7 +293,13 @@ class App:
         if not self.dados_processados_da_sessao:
             self._write_to_console("ERRO: Nenhum dado foi processado ainda (Botão 1).")
             return
+        from modulos import perfil
+        from modulos.gerador_relatorios import gerar_relatorio_faltas
+        from modulos.exportadores import exportar_resultados
+        perfil.iniciar_sessao()
         gerar_relatorio_faltas(self.dados_processados_da_sessao, self._write_to_console)
+        exportar_resultados(self.dados_processados_da_sessao, self._write_to_console)
+        perfil.relatar(self._write_to_console)
 
     def _gerar_relatorio_simples(self):
         if not self.dados_processados_da_sessao:
@@ -199,4 +307,8 @@ class App:
             return
         ultimo_dia_processado = list(self.dados_processados_da_sessao.values())[-1]
         report_date, _, df_problemas = ultimo_dia_processado
-        gerar_relatorio_simples(df_problemas, report_date, self._write_to_console)
\ No newline at end of file
+        from modulos import perfil
+        from modulos.gerador_relatorios import gerar_relatorio_simples
+        perfil.iniciar_sessao()
+        gerar_relatorio_simples(df_problemas, report_date, self._write_to_console)
+        perfil.relatar(self._write_to_console)
\ No newline at end of file
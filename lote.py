@@ -0,0 +1,123 @@
+import argparse
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+# Adiciona o diretório raiz do projeto ao path (mesma correção do main.py).
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from modulos.processador import processar_dados_diarios, carregar_dados_base
+from modulos.migracoes import aplicar_migracoes
+from modulos.exportadores import EXPORTADORES, exportar_resultados
+from modulos.consulta_resultados import salvar_resultados_do_dia
+
+# Tabelas base carregadas uma única vez por processo do pool.
+_dados_base_worker = None
+
+
+def encontrar_pares(pasta):
+    """
+    Encontra os pares ausentes_DDMMYY.pdf / frequencia_DDMMYY.pdf de uma pasta.
+    Retorna uma lista de (sufixo, caminho_ausentes, caminho_frequencia) ordenada por data.
+    """
+    padrao = re.compile(r'^(ausentes|frequencia)_(\d{6})\.pdf$', re.IGNORECASE)
+    arquivos = {}
+    for nome in os.listdir(pasta):
+        match = padrao.match(nome)
+        if match:
+            tipo, sufixo = match.group(1).lower(), match.group(2)
+            arquivos.setdefault(sufixo, {})[tipo] = os.path.join(pasta, nome)
+
+    pares = []
+    for sufixo, tipos in arquivos.items():
+        if 'ausentes' in tipos and 'frequencia' in tipos:
+            pares.append((sufixo, tipos['ausentes'], tipos['frequencia']))
+        else:
+            print(f"AVISO: Par incompleto para o sufixo '{sufixo}', ignorado.")
+    # DDMMYY -> YYMMDD para ordenar cronologicamente
+    pares.sort(key=lambda par: par[0][4:6] + par[0][2:4] + par[0][0:2])
+    return pares
+
+
+def _inicializar_worker():
+    global _dados_base_worker
+    _dados_base_worker = carregar_dados_base(lambda mensagem: None)
+
+
+def _processar_dia(par, filtro_ativo, hora_inicio, hora_fim):
+    """
+    Executado em um processo do pool. Retorna o resultado do dia e as mensagens
+    do logger, que são exibidas pelo processo principal na ordem dos dias.
+    """
+    _, ausentes_path, frequencia_path = par
+    mensagens = []
+    dados_do_dia = processar_dados_diarios(ausentes_path, frequencia_path, mensagens.append,
+                                           filtro_ativo=filtro_ativo, hora_inicio=hora_inicio,
+                                           hora_fim=hora_fim, dados_base=_dados_base_worker,
+                                           concorrente=False)  # os dias já rodam em paralelo
+    return dados_do_dia, mensagens
+
+
+def processar_lote(pares, logger=print, filtro_ativo=False, hora_inicio="00:00", hora_fim="23:59",
+                   max_processos=None):
+    """
+    Processa todos os pares em paralelo e devolve o dicionário da sessão
+    (nome da aba -> (report_date, faltas_registradas, df_problemas)).
+    """
+    dados_da_sessao = {}
+    if not pares:
+        return dados_da_sessao
+    with ProcessPoolExecutor(max_workers=max_processos, initializer=_inicializar_worker) as executor:
+        futuros = [executor.submit(_processar_dia, par, filtro_ativo, hora_inicio, hora_fim) for par in pares]
+        for (sufixo, _, _), futuro in zip(pares, futuros):
+            logger(f"\n=== Dia {sufixo} ===")
+            try:
+                dados_do_dia, mensagens = futuro.result()
+            except Exception as e:
+                logger(f"ERRO crítico ao processar o dia {sufixo}: {e}")
+                continue
+            for mensagem in mensagens:
+                logger(mensagem)
+            if dados_do_dia and dados_do_dia[0] is not None:
+                sheet_name = dados_do_dia[0].strftime('%d-%m-%Y')
+                dados_da_sessao[sheet_name] = dados_do_dia
+            else:
+                logger(f"--- FALHA NO PROCESSAMENTO DO DIA {sufixo} ---")
+    return dados_da_sessao
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Processa em lote todos os pares de PDFs de uma pasta.")
+    parser.add_argument('pasta', nargs='?', default=config.PDF_DIR, help="Pasta com os PDFs (padrão: pdf/).")
+    parser.add_argument('--filtro', nargs=2, metavar=('INICIO', 'FIM'),
+                        help="Ativa o filtro de horário, ex.: --filtro 00:00 12:00.")
+    parser.add_argument('--processos', type=int, default=None, help="Número máximo de processos.")
+    parser.add_argument('--formatos', nargs='+', choices=['xlsx', *EXPORTADORES], default=config.EXPORTACAO_FORMATOS,
+                        help="Formatos de saída (padrão: config.EXPORTACAO_FORMATOS), ex.: --formatos csv parquet.")
+    args = parser.parse_args()
+    aplicar_migracoes()
+
+    pares = encontrar_pares(args.pasta)
+    if not pares:
+        print(f"Nenhum par de PDFs encontrado em '{args.pasta}'.")
+        return
+    print(f"{len(pares)} dia(s) encontrado(s) em '{args.pasta}'.")
+
+    filtro_ativo = args.filtro is not None
+    hora_inicio, hora_fim = args.filtro if filtro_ativo else ("00:00", "23:59")
+    dados_da_sessao = processar_lote(pares, filtro_ativo=filtro_ativo, hora_inicio=hora_inicio,
+                                     hora_fim=hora_fim, max_processos=args.processos)
+    if 'xlsx' in args.formatos:
+        # O relatório detalhado também grava os resultados no banco
+        from modulos.gerador_relatorios import gerar_relatorio_faltas
+        gerar_relatorio_faltas(dados_da_sessao, print)
+    else:
+        for report_date, faltas_registradas, df_problemas in dados_da_sessao.values():
+            salvar_resultados_do_dia(report_date, faltas_registradas, df_problemas)
+    exportar_resultados(dados_da_sessao, print, formatos=args.formatos)
+
+
+if __name__ == "__main__":
+    main()
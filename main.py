@@ -11,10 +11,15 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from interface import App 
 from modulos.consulta_alunos import obter_contagem_alunos
 from modulos.consulta_horarios import obter_contagem_horarios
+from modulos.migracoes import aplicar_migracoes
 
 def main():
     print("Verificando conexão com os bancos de dados...")
+    if aplicar_migracoes() is None:
+        print("ERRO: Não foi possível atualizar o banco de dados; o programa não pode continuar.")
+        sys.exit(1)
     
+    # As duas contagens usam a mesma conexão de leitura do pool (modulos/repositorio.py)
     alunos_count = obter_contagem_alunos()
     alunos_status = "success" if alunos_count is not None else "error"
     print(f"BD Alunos: {alunos_status} ({alunos_count} registros)")
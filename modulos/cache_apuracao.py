@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+# Adiciona o diretório raiz ao path para encontrar o 'config'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+from . import repositorio
+
+# Apurações já feitas neste processo (ver processador.preparar_apuracao), para
+# que uma mudança só no filtro de horário não repita extração, banco e busca
+# dos alunos. A chave identifica os dois PDFs (caminho, data de modificação e
+# tamanho) e o cadastro usado na apuração: o banco e a versão de 'alunos' e
+# 'horarios' (tabela versao_cadastro, incrementada por gatilhos, migração 3).
+# Gravar os resultados do dia (tabelas 'faltas' e 'ocorrencias') não muda a
+# chave; alterar o cadastro, mesmo por outro processo, muda. As funções deste
+# processo que alteram o cadastro ainda descartam tudo com 'invalidar_apuracoes'
+# para liberar a memória. Módulo leve de propósito: é importado pelos módulos
+# de consulta, que não devem carregar pandas/numpy.
+
+_apuracoes = OrderedDict()
+_lock = threading.Lock()
+
+
+def chave_do_dia(ausentes_path, frequencia_path):
+    """
+    Chave da apuração de um par de PDFs, ou None se algum arquivo não existir
+    ou se não for possível ler a versão do cadastro no banco.
+    """
+    partes = []
+    for caminho in (ausentes_path, frequencia_path):
+        try:
+            estado = os.stat(caminho)
+        except OSError:
+            return None
+        partes.extend((os.path.abspath(caminho), estado.st_mtime_ns, estado.st_size))
+    # Banco sem a migração 3 (ou inacessível): sem cache
+    try:
+        versao = repositorio.consultar_um("SELECT versao FROM versao_cadastro WHERE id = 1")
+    except sqlite3.Error:
+        return None
+    if versao is None:
+        return None
+    partes.extend((os.path.abspath(config.DB_PATH), versao[0]))
+    return tuple(partes)
+
+
+def obter_apuracao(chave):
+    """
+    Retorna a apuração guardada para a chave (marcando-a como usada), ou None.
+    """
+    if chave is None or config.CACHE_APURACAO_DIAS <= 0:
+        return None
+    with _lock:
+        apuracao = _apuracoes.get(chave)
+        if apuracao is not None:
+            _apuracoes.move_to_end(chave)
+        return apuracao
+
+
+def guardar_apuracao(chave, apuracao):
+    """
+    Guarda a apuração, descartando as menos usadas além de config.CACHE_APURACAO_DIAS.
+    """
+    if chave is None or config.CACHE_APURACAO_DIAS <= 0:
+        return
+    with _lock:
+        _apuracoes[chave] = apuracao
+        _apuracoes.move_to_end(chave)
+        while len(_apuracoes) > config.CACHE_APURACAO_DIAS:
+            _apuracoes.popitem(last=False)
+
+
+def invalidar_apuracoes():
+    """
+    Descarta todas as apurações guardadas; o próximo processamento refaz tudo.
+    """
+    with _lock:
+        _apuracoes.clear()
@@ -0,0 +1,88 @@
+import functools
+import hashlib
+import os
+import pickle
+import sys
+
+# Adiciona o diretório raiz ao path para encontrar o 'config'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+
+def calcular_sha256(caminho_arquivo):
+    """
+    Calcula o SHA-256 do conteúdo do arquivo, lendo-o em blocos.
+    """
+    sha = hashlib.sha256()
+    with open(caminho_arquivo, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1024 * 1024), b''):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _caminho_cache(nome_extrator, versao, sha):
+    return os.path.join(config.CACHE_DIR, f"{nome_extrator}_v{versao}_{sha}.pkl")
+
+
+def _aplicar_limite_de_tamanho():
+    """
+    Remove as entradas menos usadas recentemente (pela data de modificação)
+    até o cache caber em config.CACHE_TAMANHO_MAXIMO_MB.
+    """
+    limite = config.CACHE_TAMANHO_MAXIMO_MB * 1024 * 1024
+    entradas = []
+    for nome in os.listdir(config.CACHE_DIR):
+        if nome.endswith('.pkl'):
+            caminho = os.path.join(config.CACHE_DIR, nome)
+            estado = os.stat(caminho)
+            entradas.append((estado.st_mtime, estado.st_size, caminho))
+    total = sum(tamanho for _, tamanho, _ in entradas)
+    for _, tamanho, caminho in sorted(entradas):
+        if total <= limite:
+            break
+        try:
+            os.remove(caminho)
+            total -= tamanho
+        except OSError:
+            pass
+
+
+def com_cache(nome_extrator, versao):
+    """
+    Decorador para extratores 'extrair(caminho_pdf) -> (DataFrame, report_date)'.
+
+    O resultado é gravado em config.CACHE_DIR com chave (extrator, versão, SHA-256
+    do PDF); reprocessar o mesmo arquivo dispensa abrir o PDF. Incremente a versão
+    do extrator sempre que a lógica de extração mudar.
+    """
+    def decorador(extrair):
+        @functools.wraps(extrair)
+        def extrair_com_cache(caminho_pdf):
+            if not config.CACHE_EXTRACAO_ATIVO or not os.path.exists(caminho_pdf):
+                return extrair(caminho_pdf)
+            try:
+                caminho = _caminho_cache(nome_extrator, versao, calcular_sha256(caminho_pdf))
+                if os.path.exists(caminho):
+                    with open(caminho, 'rb') as arquivo:
+                        resultado = pickle.load(arquivo)
+                    os.utime(caminho)  # Marca como usado recentemente (LRU)
+                    return resultado
+            except Exception as e:
+                print(f"Aviso: cache de extração indisponível ({e}).")
+                return extrair(caminho_pdf)
+
+            resultado = extrair(caminho_pdf)
+            # Não guarda falhas de leitura, para que uma nova tentativa reabra o PDF.
+            if resultado[0] is not None or resultado[1] is not None:
+                try:
+                    os.makedirs(config.CACHE_DIR, exist_ok=True)
+                    caminho_temporario = f"{caminho}.{os.getpid()}.tmp"
+                    with open(caminho_temporario, 'wb') as arquivo:
+                        pickle.dump(resultado, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+                    os.replace(caminho_temporario, caminho)
+                    _aplicar_limite_de_tamanho()
+                except Exception as e:
+                    print(f"Aviso: não foi possível gravar o cache de extração ({e}).")
+            return resultado
+        return extrair_com_cache
+    return decorador
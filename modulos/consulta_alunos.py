@@ -4,38 +4,30 @@ import os
 script_dir = os.path.dirname(__file__)
 project_root = os.path.dirname(script_dir)
 import config
+from . import repositorio
+from .indice_alunos import normalizar_nome
+from .cache_apuracao import invalidar_apuracoes
 nome_banco_de_dados = config.DB_PATH
 
 def obter_contagem_alunos():
     """
-    Conecta ao banco de dados e retorna o número total de alunos.
+    Retorna o número total de alunos (conexão de leitura do pool compartilhado).
     """
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
         query = "SELECT COUNT(*) FROM alunos"
-        cursor.execute(query)
-        contagem = cursor.fetchone()[0]
+        contagem = repositorio.consultar_um(query)[0]
         return contagem
     except sqlite3.Error as e:
         print(f"Erro ao acessar o banco de dados de alunos: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 def acessar_dados_alunos():
     """
     Função para conectar ao banco de dados, ler e exibir todos os dados da tabela 'alunos'.
     """
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
         query = "SELECT matricula, nome, turma FROM alunos"
-        cursor.execute(query)
-        alunos = cursor.fetchall()
+        alunos = repositorio.consultar(query)
         
         if not alunos:
             print("\nNenhum aluno encontrado na tabela.")
@@ -51,9 +43,6 @@ def acessar_dados_alunos():
         print("-" * 70)
     except sqlite3.Error as e:
         print(f"Ocorreu um erro ao acessar o banco de dados: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 # ... (O resto das funções inserir_aluno, atualizar_aluno, excluir_aluno e o bloco __main__ permanecem os mesmos) ...
 
@@ -61,62 +50,69 @@ def inserir_aluno(matricula, nome, turma):
     if not all([matricula, nome, turma]):
         print("Erro: Todos os campos são obrigatórios.")
         return
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
-        query = "INSERT INTO alunos (matricula, nome, turma) VALUES (?, ?, ?)"
-        cursor.execute(query, (matricula, nome, turma))
-        conn.commit()
+        query = "INSERT INTO alunos (matricula, nome, turma, nome_normalizado) VALUES (?, ?, ?, ?)"
+        repositorio.executar(query, (matricula, nome, turma, normalizar_nome(nome)))
+        invalidar_apuracoes()
         print(f"Aluno '{nome}' inserido com sucesso!")
     except sqlite3.IntegrityError:
         print(f"Erro: A matrícula '{matricula}' já existe.")
     except sqlite3.Error as e:
         print(f"Ocorreu um erro: {e}")
-    finally:
-        if conn:
-            conn.close()
+
+def inserir_alunos(lista_alunos):
+    """
+    Insere vários alunos [(matricula, nome, turma), ...] em uma única transação.
+    Se algum registro falhar (ex.: matrícula repetida), nenhum é inserido.
+    """
+    lista_alunos = list(lista_alunos)
+    if not lista_alunos:
+        print("Erro: Nenhum aluno informado.")
+        return
+    if not all(all(campo for campo in aluno) for aluno in lista_alunos):
+        print("Erro: Todos os campos são obrigatórios.")
+        return
+    try:
+        query = "INSERT INTO alunos (matricula, nome, turma, nome_normalizado) VALUES (?, ?, ?, ?)"
+        inseridos = repositorio.executar_muitos(
+            query, [(matricula, nome, turma, normalizar_nome(nome)) for matricula, nome, turma in lista_alunos])
+        invalidar_apuracoes()
+        print(f"{inseridos} alunos inseridos com sucesso!")
+    except sqlite3.IntegrityError as e:
+        print(f"Erro: Matrícula duplicada; nenhum aluno foi inserido ({e}).")
+    except sqlite3.Error as e:
+        print(f"Ocorreu um erro: {e}")
 
 def atualizar_aluno(matricula, novo_nome, nova_turma):
     if not all([matricula, novo_nome, nova_turma]):
         print("Erro: Todos os campos são obrigatórios.")
         return
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
-        query = "UPDATE alunos SET nome = ?, turma = ? WHERE matricula = ?"
-        cursor.execute(query, (novo_nome, nova_turma, matricula))
-        conn.commit()
-        if cursor.rowcount == 0:
+        query = "UPDATE alunos SET nome = ?, turma = ?, nome_normalizado = ? WHERE matricula = ?"
+        rowcount = repositorio.executar(query, (novo_nome, nova_turma, normalizar_nome(novo_nome), matricula))
+        invalidar_apuracoes()
+        if rowcount == 0:
             print(f"Nenhum aluno com matrícula '{matricula}' encontrado.")
         else:
             print(f"Dados do aluno com matrícula '{matricula}' atualizados.")
     except sqlite3.Error as e:
         print(f"Ocorreu um erro: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def excluir_aluno(matricula):
     if not matricula:
         print("Erro: Matrícula é obrigatória.")
         return
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
-        cursor.execute("SELECT nome FROM alunos WHERE matricula = ?", (matricula,))
-        aluno_existente = cursor.fetchone()
+        aluno_existente = repositorio.consultar_um("SELECT nome FROM alunos WHERE matricula = ?", (matricula,))
         if not aluno_existente:
             print(f"Aluno com matrícula '{matricula}' não encontrado.")
             return
         nome_aluno = aluno_existente[0]
         confirmacao = input(f"Tem certeza que deseja excluir '{nome_aluno}' (matrícula: {matricula})? [s/n]: ").lower()
         if confirmacao == 's':
-            cursor.execute("DELETE FROM alunos WHERE matricula = ?", (matricula,))
-            conn.commit()
-            if cursor.rowcount > 0:
+            rowcount = repositorio.executar("DELETE FROM alunos WHERE matricula = ?", (matricula,))
+            invalidar_apuracoes()
+            if rowcount > 0:
                 print(f"Aluno '{nome_aluno}' excluído com sucesso.")
             else:
                 print("Exclusão falhou.")
@@ -124,9 +120,6 @@ def excluir_aluno(matricula):
             print("Exclusão cancelada.")
     except sqlite3.Error as e:
         print(f"Ocorreu um erro: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 if __name__ == "__main__":
     print("--- Testando Módulo de Consulta de Alunos ---")
@@ -4,36 +4,27 @@ import os
 script_dir = os.path.dirname(__file__)
 project_root = os.path.dirname(script_dir)
 import config
+from . import repositorio
+from .cache_apuracao import invalidar_apuracoes
 nome_banco_de_dados = config.DB_PATH
 
 def obter_contagem_horarios():
     """
-    Conecta ao banco de dados e retorna o número total de horários.
+    Retorna o número total de horários (conexão de leitura do pool compartilhado).
     """
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
         query = "SELECT COUNT(*) FROM horarios"
-        cursor.execute(query)
-        contagem = cursor.fetchone()[0]
+        contagem = repositorio.consultar_um(query)[0]
         return contagem
     except sqlite3.Error:
         return None
-    finally:
-        if conn:
-            conn.close()
 
 # ... (O resto das funções acessar_dados_horarios, inserir_horario, etc. permanecem as mesmas) ...
 
 def acessar_dados_horarios():
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
         query = "SELECT id, turma, dia_semana, hora_inicio, hora_fim, disciplina FROM horarios"
-        cursor.execute(query)
-        horarios = cursor.fetchall()
+        horarios = repositorio.consultar(query)
         if not horarios:
             print("\nNenhum horário encontrado.")
             return
@@ -45,68 +36,69 @@ def acessar_dados_horarios():
         print("-" * 90)
     except sqlite3.Error as e:
         print(f"Ocorreu um erro: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def inserir_horario(turma, dia_semana, hora_inicio, hora_fim, disciplina):
     if not all([turma, dia_semana, hora_inicio, hora_fim, disciplina]):
         print("Erro: Todos os campos são obrigatórios.")
         return
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
         query = "INSERT INTO horarios (turma, dia_semana, hora_inicio, hora_fim, disciplina) VALUES (?, ?, ?, ?, ?)"
-        cursor.execute(query, (turma, dia_semana, hora_inicio, hora_fim, disciplina))
-        conn.commit()
+        repositorio.executar(query, (turma, dia_semana, hora_inicio, hora_fim, disciplina))
+        invalidar_apuracoes()
         print(f"Horário para a turma '{turma}' inserido.")
     except sqlite3.Error as e:
         print(f"Ocorreu um erro: {e}")
-    finally:
-        if conn:
-            conn.close()
+
+def inserir_horarios(lista_horarios):
+    """
+    Insere vários horários [(turma, dia_semana, hora_inicio, hora_fim, disciplina), ...]
+    em uma única transação. Se algum registro falhar, nenhum é inserido.
+    """
+    lista_horarios = list(lista_horarios)
+    if not lista_horarios:
+        print("Erro: Nenhum horário informado.")
+        return
+    if not all(all(campo for campo in horario) for horario in lista_horarios):
+        print("Erro: Todos os campos são obrigatórios.")
+        return
+    try:
+        query = "INSERT INTO horarios (turma, dia_semana, hora_inicio, hora_fim, disciplina) VALUES (?, ?, ?, ?, ?)"
+        inseridos = repositorio.executar_muitos(query, lista_horarios)
+        invalidar_apuracoes()
+        print(f"{inseridos} horários inseridos.")
+    except sqlite3.Error as e:
+        print(f"Ocorreu um erro: {e}")
 
 def atualizar_horario(id_horario, nova_turma, novo_dia, nova_hora_inicio, nova_hora_fim, nova_disciplina):
     if not all([id_horario, nova_turma, novo_dia, nova_hora_inicio, nova_hora_fim, nova_disciplina]):
         print("Erro: Todos os campos são obrigatórios.")
         return
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
         query = "UPDATE horarios SET turma = ?, dia_semana = ?, hora_inicio = ?, hora_fim = ?, disciplina = ? WHERE id = ?"
-        cursor.execute(query, (nova_turma, novo_dia, nova_hora_inicio, nova_hora_fim, nova_disciplina, id_horario))
-        conn.commit()
-        if cursor.rowcount == 0:
+        rowcount = repositorio.executar(query, (nova_turma, novo_dia, nova_hora_inicio, nova_hora_fim, nova_disciplina, id_horario))
+        invalidar_apuracoes()
+        if rowcount == 0:
             print(f"Nenhum horário com ID '{id_horario}' encontrado.")
         else:
             print(f"Horário com ID '{id_horario}' atualizado.")
     except sqlite3.Error as e:
         print(f"Ocorreu um erro: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 def excluir_horario(id_horario):
     if not id_horario:
         print("Erro: ID é obrigatório.")
         return
-    conn = None
     try:
-        conn = sqlite3.connect(nome_banco_de_dados)
-        cursor = conn.cursor()
-        cursor.execute("SELECT turma, disciplina FROM horarios WHERE id = ?", (id_horario,))
-        horario_existente = cursor.fetchone()
+        horario_existente = repositorio.consultar_um("SELECT turma, disciplina FROM horarios WHERE id = ?", (id_horario,))
         if not horario_existente:
             print(f"Horário com ID '{id_horario}' não encontrado.")
             return
         turma, disciplina = horario_existente
         confirmacao = input(f"Tem certeza que deseja excluir o horário de '{disciplina}' da turma '{turma}' (ID: {id_horario})? [s/n]: ").lower()
         if confirmacao == 's':
-            cursor.execute("DELETE FROM horarios WHERE id = ?", (id_horario,))
-            conn.commit()
-            if cursor.rowcount > 0:
+            rowcount = repositorio.executar("DELETE FROM horarios WHERE id = ?", (id_horario,))
+            invalidar_apuracoes()
+            if rowcount > 0:
                 print(f"Horário com ID '{id_horario}' excluído.")
             else:
                 print("Exclusão falhou.")
@@ -114,9 +106,6 @@ def excluir_horario(id_horario):
             print("Exclusão cancelada.")
     except sqlite3.Error as e:
         print(f"Ocorreu um erro: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 if __name__ == "__main__":
     print("--- Testando Módulo de Consulta de Horários ---")
@@ -0,0 +1,87 @@
+from . import repositorio
+
+# Resultados diários (tabelas 'faltas' e 'ocorrencias', criadas pela migração 2,
+# e 'dias_processados', migração 4). As datas são gravadas no formato ISO (AAAA-MM-DD).
+
+COLUNAS_FALTAS = ['Matricula', 'Nome', 'Turma', 'Disciplina', 'Total de Faltas']
+COLUNAS_RESUMO = ['Matricula', 'Nome', 'Turma', 'Disciplina', 'Total na Semana']
+COLUNAS_OCORRENCIAS = ['Matricula', 'Nome do Aluno', 'Turma', 'Problema', 'Acesso']
+
+
+def _data_iso(data):
+    return data.strftime('%Y-%m-%d')
+
+
+def salvar_resultados_do_dia(report_date, faltas_registradas, df_problemas):
+    """
+    Grava (ou substitui) os resultados de um dia em uma única transação:
+    reprocessar o mesmo dia sobrescreve o que havia sido salvo antes. O dia
+    fica registrado como processado mesmo sem nenhuma falta.
+    """
+    data = _data_iso(report_date)
+    linhas_faltas = [(data, str(matricula), nome, turma, disciplina, int(total))
+                     for (matricula, nome, turma, disciplina), total in (faltas_registradas or {}).items()]
+    linhas_ocorrencias = []
+    if df_problemas is not None and not df_problemas.empty:
+        linhas_ocorrencias = [(data, str(matricula), nome, turma, problema, acesso)
+                              for matricula, nome, turma, problema, acesso
+                              in df_problemas[COLUNAS_OCORRENCIAS].itertuples(index=False, name=None)]
+    with repositorio.obter_pool().escrita() as conn:
+        conn.execute("DELETE FROM faltas WHERE data = ?", (data,))
+        conn.execute("DELETE FROM ocorrencias WHERE data = ?", (data,))
+        conn.execute("INSERT OR IGNORE INTO dias_processados (data) VALUES (?)", (data,))
+        conn.executemany(
+            """INSERT INTO faltas (data, matricula, nome, turma, disciplina, total_faltas)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT (data, matricula, nome, turma, disciplina)
+               DO UPDATE SET total_faltas = total_faltas + excluded.total_faltas""",
+            linhas_faltas)
+        conn.executemany(
+            "INSERT INTO ocorrencias (data, matricula, nome, turma, problema, acesso) VALUES (?, ?, ?, ?, ?, ?)",
+            linhas_ocorrencias)
+
+
+def dias_salvos(datas):
+    """
+    Retorna o conjunto das datas (entre as informadas) já processadas e salvas no banco.
+    """
+    datas_iso = {_data_iso(data): data for data in datas}
+    if not datas_iso:
+        return set()
+    marcadores = ', '.join('?' * len(datas_iso))
+    linhas = repositorio.consultar(
+        f"SELECT data FROM dias_processados WHERE data IN ({marcadores})", tuple(datas_iso))
+    return {datas_iso[data] for (data,) in linhas}
+
+
+def carregar_faltas_do_dia(report_date):
+    """
+    Retorna as faltas do dia no formato das abas diárias do relatório detalhado.
+    """
+    return repositorio.ler_dataframe(
+        """SELECT matricula AS "Matricula", nome AS "Nome", turma AS "Turma",
+                  disciplina AS "Disciplina", total_faltas AS "Total de Faltas"
+           FROM faltas WHERE data = ?""", (_data_iso(report_date),))
+
+
+def carregar_ocorrencias_do_dia(report_date):
+    """
+    Retorna as ocorrências do dia no formato do df_problemas de processar_dados_diarios.
+    """
+    return repositorio.ler_dataframe(
+        """SELECT matricula AS "Matricula", nome AS "Nome do Aluno", turma AS "Turma",
+                  problema AS "Problema", acesso AS "Acesso"
+           FROM ocorrencias WHERE data = ? ORDER BY id""", (_data_iso(report_date),))
+
+
+def resumo_faltas(datas):
+    """
+    Soma as faltas por aluno e disciplina nas datas informadas, com um único GROUP BY.
+    """
+    datas_iso = sorted({_data_iso(data) for data in datas})
+    marcadores = ', '.join('?' * len(datas_iso)) or "NULL"
+    return repositorio.ler_dataframe(
+        f"""SELECT matricula AS "Matricula", nome AS "Nome", turma AS "Turma",
+                   disciplina AS "Disciplina", SUM(total_faltas) AS "Total na Semana"
+            FROM faltas WHERE data IN ({marcadores})
+            GROUP BY matricula, nome, turma, disciplina""", tuple(datas_iso))
@@ -0,0 +1,82 @@
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.utils import get_column_letter
+
+# Estilos dos relatórios, registrados uma única vez por workbook como estilos
+# nomeados: cada célula guarda só o nome do estilo, em vez de receber novos
+# objetos Font/PatternFill/Border. Funciona tanto em workbooks normais quanto
+# em workbooks 'write_only' (gravação em fluxo, linha a linha).
+
+
+def _borda_fina():
+    lado = Side(style='thin')
+    return Border(left=lado, right=lado, top=lado, bottom=lado)
+
+
+def _preenchimento(cor):
+    return PatternFill(start_color=cor, end_color=cor, fill_type='solid')
+
+
+# nome -> função que cria o NamedStyle (um NamedStyle fica vinculado ao
+# workbook em que é registrado, por isso cada workbook recebe uma instância nova)
+ESTILOS = {
+    'borda': lambda: NamedStyle('borda', font=DEFAULT_FONT, border=_borda_fina()),
+    'cabecalho': lambda: NamedStyle('cabecalho', font=Font(bold=True), border=_borda_fina()),
+    'titulo_relatorio': lambda: NamedStyle(
+        'titulo_relatorio', font=Font(name='Calibri', size=14, bold=True, color="FFFFFF"),
+        fill=_preenchimento("008000"), alignment=Alignment(horizontal='center'), border=_borda_fina()),
+    'titulo_turma': lambda: NamedStyle(
+        'titulo_turma', font=Font(name='Calibri', size=12, bold=True),
+        fill=_preenchimento("E7E6E6"), border=_borda_fina()),
+    'cabecalho_turma': lambda: NamedStyle(
+        'cabecalho_turma', font=Font(name='Calibri', size=11, bold=True), border=_borda_fina()),
+    'faltou': lambda: NamedStyle('faltou', font=DEFAULT_FONT, fill=_preenchimento("FFC7CE"), border=_borda_fina()),
+    'atrasado': lambda: NamedStyle('atrasado', font=DEFAULT_FONT, fill=_preenchimento("FFEB9C"), border=_borda_fina()),
+    'saiu_cedo': lambda: NamedStyle('saiu_cedo', font=DEFAULT_FONT, fill=_preenchimento("C6EFCE"), border=_borda_fina()),
+}
+
+
+def registrar_estilos(workbook, nomes):
+    """
+    Registra no workbook os estilos nomeados informados que ainda não existirem nele.
+    """
+    existentes = set(workbook.named_styles)
+    for nome in nomes:
+        if nome not in existentes:
+            workbook.add_named_style(ESTILOS[nome]())
+
+
+def larguras_colunas(df, margem=2):
+    """
+    Largura de cada coluna: o maior texto entre o cabeçalho e os valores da
+    coluna, mais a margem. Calculada por coluna, de forma vetorizada.
+    """
+    larguras = []
+    for coluna in df.columns:
+        valores = df[coluna].dropna()
+        maior_valor = valores.astype(str).str.len().max() if not valores.empty else 0
+        larguras.append(max(len(str(coluna)), int(maior_valor)) + margem)
+    return larguras
+
+
+def definir_larguras(worksheet, larguras):
+    """
+    Aplica as larguras às colunas (A, B, ...). Em workbooks 'write_only',
+    deve ser chamada antes da primeira linha.
+    """
+    for indice, largura in enumerate(larguras, 1):
+        worksheet.column_dimensions[get_column_letter(indice)].width = largura
+
+
+def linha(worksheet, valores, estilo=None):
+    """
+    Monta as células de uma linha com um estilo nomeado, prontas para worksheet.append.
+    """
+    celulas = []
+    for valor in valores:
+        celula = WriteOnlyCell(worksheet, value=valor)
+        if estilo:
+            celula.style = estilo
+        celulas.append(celula)
+    return celulas
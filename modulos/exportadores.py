@@ -0,0 +1,108 @@
+import os
+import sys
+
+import pandas as pd
+
+# Adiciona o diretório raiz ao path para encontrar o 'config'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+# Exportação dos resultados de cada dia em formatos para outros sistemas
+# (painel da secretaria, pipeline de dados), sem passar pelo openpyxl.
+# Cada exportador recebe um DataFrame e o caminho do arquivo (já com a extensão).
+
+COLUNAS_FALTAS = ['Data', 'Matricula', 'Nome', 'Turma', 'Disciplina', 'Total de Faltas']
+
+
+def _exportar_csv(df, caminho):
+    df.to_csv(caminho, index=False, encoding='utf-8')
+
+
+def _exportar_parquet(df, caminho):
+    # Requer pyarrow (ou fastparquet); sem eles o pandas levanta ImportError
+    df.to_parquet(caminho, index=False)
+
+
+def _exportar_ndjson(df, caminho):
+    df.to_json(caminho, orient='records', lines=True, force_ascii=False)
+
+
+# formato -> (extensão do arquivo, função de exportação)
+EXPORTADORES = {
+    'csv': ('.csv', _exportar_csv),
+    'parquet': ('.parquet', _exportar_parquet),
+    'ndjson': ('.ndjson', _exportar_ndjson),
+}
+
+
+def registrar_exportador(formato, extensao, funcao):
+    """
+    Adiciona (ou substitui) um formato de exportação: funcao(df, caminho).
+    """
+    EXPORTADORES[formato] = (extensao, funcao)
+
+
+def tabela_faltas(report_date, faltas_registradas):
+    """
+    Converte o dicionário de faltas do dia em um DataFrame, uma linha por
+    aluno e disciplina.
+    """
+    chaves = list(faltas_registradas or {})
+    df = pd.DataFrame(chaves, columns=COLUNAS_FALTAS[1:5])
+    df['Matricula'] = df['Matricula'].astype(str)
+    df['Total de Faltas'] = pd.array(list((faltas_registradas or {}).values()), dtype='int64')
+    df.insert(0, 'Data', report_date.strftime('%Y-%m-%d'))
+    return df
+
+
+def tabela_ocorrencias(report_date, df_problemas):
+    """
+    Ocorrências do dia (df_problemas) com a coluna 'Data' no início.
+    """
+    if df_problemas is None:
+        df_problemas = pd.DataFrame()
+    df = df_problemas.copy()
+    df.insert(0, 'Data', report_date.strftime('%Y-%m-%d'))
+    return df
+
+
+def exportar_resultados(dados_da_sessao, logger, formatos=None, pasta=None):
+    """
+    Exporta as faltas e as ocorrências de cada dia da sessão nos formatos
+    informados (padrão: config.EXPORTACAO_FORMATOS, sem o 'xlsx').
+    Gera faltas_DDMMYY.<ext> e ocorrencias_DDMMYY.<ext>; reexportar um dia
+    substitui os arquivos dele. Retorna a lista de arquivos gravados.
+    """
+    if formatos is None:
+        formatos = config.EXPORTACAO_FORMATOS
+    formatos = [formato for formato in formatos if formato != 'xlsx']
+    if not formatos or not dados_da_sessao:
+        return []
+    pasta = pasta or config.EXPORTACAO_DIR
+    os.makedirs(pasta, exist_ok=True)
+
+    tabelas = []
+    for report_date, faltas_registradas, df_problemas in dados_da_sessao.values():
+        sufixo = report_date.strftime('%d%m%y')
+        tabelas.append((f"faltas_{sufixo}", tabela_faltas(report_date, faltas_registradas)))
+        tabelas.append((f"ocorrencias_{sufixo}", tabela_ocorrencias(report_date, df_problemas)))
+
+    arquivos = []
+    for formato in formatos:
+        if formato not in EXPORTADORES:
+            logger(f"AVISO: Formato de exportação desconhecido: '{formato}'.")
+            continue
+        extensao, exportar = EXPORTADORES[formato]
+        try:
+            for nome, df in tabelas:
+                caminho = os.path.join(pasta, nome + extensao)
+                exportar(df, caminho)
+                arquivos.append(caminho)
+        except ImportError as e:
+            logger(f"AVISO: Exportação '{formato}' indisponível, dependência não instalada: {str(e).splitlines()[0]}")
+            continue
+        except Exception as e:
+            logger(f"ERRO ao exportar no formato '{formato}': {e}")
+            continue
+        logger(f"Resultados exportados em {formato.upper()} para: {pasta}")
+    return arquivos
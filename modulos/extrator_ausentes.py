@@ -3,8 +3,21 @@ import pandas as pd
 import os
 import re
 
+from .cache_extracao import com_cache
+from . import perfil
+
+# Incremente sempre que a lógica de extração mudar (invalida o cache em disco).
+VERSAO_EXTRATOR = 1
+
+# Padrões pré-compilados. A data está no cabeçalho da primeira página, então a
+# busca para logo no início; os alunos saem de um único findall sobre o texto.
+PADRAO_DATA = re.compile(r"Período: de (\d{2}/\d{2}/\d{4})")
+PADRAO_ALUNO = re.compile(r'(\d+)\s+(.*?)\s+ALUNO')
+
 # Em modulos/extrator_ausentes.py, substitua esta função:
 
+@perfil.medir('extrair_dados_ausentes', linhas=perfil.linhas_do_dataframe)
+@com_cache('ausentes', VERSAO_EXTRATOR)
 def extrair_dados_ausentes(caminho_pdf):
     """
     Extrai os dados de Matrícula e Nome de um PDF de ausentes e também a data do relatório,
@@ -23,13 +36,15 @@ def extrair_dados_ausentes(caminho_pdf):
         return None, None
 
     try:
-        doc = fitz.open(caminho_pdf)
-        full_text = "".join(page.get_text() for page in doc)
-        doc.close()
+        with perfil.etapa('extrair_dados_ausentes/texto_pdf') as etapa:
+            doc = fitz.open(caminho_pdf)
+            etapa.linhas = len(doc)
+            full_text = "".join(page.get_text() for page in doc)
+            doc.close()
 
         # Extrai a data do relatório
         report_date = None
-        match_data = re.search(r"Período: de (\d{2}/\d{2}/\d{4})", full_text)
+        match_data = PADRAO_DATA.search(full_text)
         
         # --- MELHORIA DE ROBUSTEZ AQUI ---
         if not match_data:
@@ -40,8 +55,9 @@ def extrair_dados_ausentes(caminho_pdf):
             report_date = datetime.strptime(match_data.group(1), '%d/%m/%Y')
 
         # Extrai os dados dos alunos
-        pattern = re.compile(r'(\d+)\s+(.*?)\s+ALUNO')
-        matches = pattern.findall(full_text)
+        with perfil.etapa('extrair_dados_ausentes/regex') as etapa:
+            matches = PADRAO_ALUNO.findall(full_text)
+            etapa.linhas = len(matches)
         
         # --- MELHORIA DE ROBUSTEZ AQUI ---
         if not matches:
@@ -1,13 +1,181 @@
 import fitz  # PyMuPDF
+import numpy as np
 import pandas as pd
 import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+# Adiciona o diretório raiz ao path para encontrar o 'config'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+from .cache_extracao import com_cache
+from . import perfil
+
+# Incremente sempre que a lógica de extração mudar (invalida o cache em disco).
+VERSAO_EXTRATOR = 3
+
+SEPARADOR_BLOCOS = 'Total de Acessos do Pedestre:'
+PADRAO_DATA = re.compile(r"Período: de (\d{2}/\d{2}/\d{4})")
+
+# Tokenizador de passagem única: um único padrão, percorrido com finditer,
+# emite em ordem os separadores de bloco, a data do relatório, os cabeçalhos
+# de aluno nos dois layouts conhecidos (novo e antigo) e os acessos.
+# O padrão começa por uma classe de caracteres ([TPCN0-9]) e cada alternativa
+# confirma o seu primeiro caractere com um lookbehind: assim o 're' usa a busca
+# rápida pelo primeiro caractere em vez de testar as cinco alternativas em
+# cada posição do texto.
+PADRAO_TOKENS = re.compile(
+    r"[TPCN0-9](?:"
+    r"(?<=T)(?P<separador>otal de Acessos do Pedestre:)"
+    r"|(?<=P)eríodo: de (?P<data>\d{2}/\d{2}/\d{4})"
+    r"|(?<=C)rachá:\s*(?P<cracha_novo>\d+)\s+Nome:\s*(?P<nome_novo>.*?)\n"
+    r"|(?<=N)ome:\n(?P<cracha_antigo>\d+)\n(?P<nome_antigo>.*?)\n"
+    r"|(?<=\d)\d/\d{2}/\d{4}\s+(?P<hora>\d{2}:\d{2}:\d{2})\s+(?P<sentido>Entrada|Saída))",
+    re.DOTALL)
+
+
+def _extrair_texto_intervalo(caminho_pdf, inicio, fim):
+    """
+    Executado em um processo do pool: abre seu próprio documento e extrai o
+    texto das páginas [inicio, fim).
+    """
+    with fitz.open(caminho_pdf) as doc:
+        return [doc[numero].get_text("text") for numero in range(inicio, fim)]
+
+
+def textos_das_paginas(caminho_pdf, paralelo=None):
+    """
+    Gera o texto de cada página, em ordem. Documentos com pelo menos
+    config.EXTRACAO_PARALELA_MIN_PAGINAS páginas são divididos em intervalos
+    extraídos em paralelo; os menores seguem no processo atual.
+    """
+    if paralelo is None:
+        paralelo = config.EXTRACAO_PARALELA_ATIVA
+    with fitz.open(caminho_pdf) as doc:
+        total_paginas = len(doc)
+        if not paralelo or total_paginas < config.EXTRACAO_PARALELA_MIN_PAGINAS:
+            for page in doc:
+                yield page.get_text("text")
+            return
+
+    processos = config.EXTRACAO_PARALELA_PROCESSOS or os.cpu_count() or 1
+    tamanho = -(-total_paginas // processos)
+    inicios = list(range(0, total_paginas, tamanho))
+    fins = [min(inicio + tamanho, total_paginas) for inicio in inicios]
+    with ProcessPoolExecutor(max_workers=len(inicios)) as executor:
+        # 'map' devolve os intervalos na ordem original, mesmo que terminem fora de ordem.
+        for textos in executor.map(_extrair_texto_intervalo, [caminho_pdf] * len(inicios), inicios, fins):
+            yield from textos
+
+
+def tokenizar_blocos(texto, leitor=None):
+    """
+    Percorre 'texto' uma única vez e gera os registros (Crachá, Nome, Hora, Sentido)
+    de cada bloco de aluno fechado por um separador. Num bloco, vale o primeiro
+    cabeçalho no layout novo; na falta dele, o primeiro no layout antigo.
+    Se 'leitor' for informado, atualiza seus atributos report_date e total_blocos.
+    """
+    cabecalho_novo, cabecalho_antigo, acessos = None, None, []
+    # findall devolve uma tupla por token com todos os grupos ('' nos que não
+    # participaram), o que evita uma chamada de método por grupo.
+    for separador, data, cracha_novo, nome_novo, cracha_antigo, nome_antigo, hora, sentido in PADRAO_TOKENS.findall(texto):
+        if hora:
+            acessos.append((hora, sentido))
+        elif separador:
+            cabecalho = cabecalho_novo or cabecalho_antigo
+            # Sem cabeçalho reconhecido, o bloco é ignorado
+            if cabecalho and cabecalho[0] and cabecalho[1]:
+                cracha, nome = cabecalho[0].strip(), cabecalho[1].strip()
+                for hora_acesso, sentido_acesso in acessos:
+                    yield cracha, nome, hora_acesso, sentido_acesso
+            if leitor is not None:
+                leitor.total_blocos += 1
+            cabecalho_novo, cabecalho_antigo, acessos = None, None, []
+        elif cracha_novo:
+            if cabecalho_novo is None:
+                cabecalho_novo = (cracha_novo, nome_novo)
+        elif cracha_antigo:
+            if cabecalho_antigo is None:
+                cabecalho_antigo = (cracha_antigo, nome_antigo)
+        elif data:
+            if leitor is not None and leitor.report_date is None:
+                leitor.report_date = datetime.strptime(data, '%d/%m/%Y')
+
+
+class LeitorFrequencia:
+    """
+    Lê um PDF de frequência página por página, gerando os registros de acesso
+    (Crachá, Nome, Hora, Sentido) à medida que cada bloco de aluno se completa.
+
+    Só a página atual e o bloco parcial que atravessa a quebra de página ficam
+    em memória, independentemente do tamanho do documento. Como as páginas são
+    costuradas em ordem antes da divisão em blocos, o mesmo vale para blocos que
+    atravessam intervalos extraídos em paralelo. 'report_date' e
+    'total_blocos' ficam disponíveis assim que são encontrados.
+    """
+
+    def __init__(self, caminho_pdf, paralelo=None):
+        self.caminho_pdf = caminho_pdf
+        self.paralelo = paralelo
+        self.report_date = None
+        self.total_blocos = 0
+
+    def __iter__(self):
+        pendente = ''
+        paginas = textos_das_paginas(self.caminho_pdf, self.paralelo)
+        while True:
+            with perfil.etapa('extrair_dados_frequencia/texto_pdf'):
+                texto_pagina = next(paginas, None)
+            if texto_pagina is None:
+                break
+            pendente += texto_pagina
+            # Tokeniza só até o último separador (blocos completos); o restante
+            # segue para a próxima página.
+            fim_blocos = pendente.rfind(SEPARADOR_BLOCOS)
+            if fim_blocos == -1:
+                continue
+            fim_blocos += len(SEPARADOR_BLOCOS)
+            with perfil.etapa('extrair_dados_frequencia/tokenizacao'):
+                yield from tokenizar_blocos(pendente[:fim_blocos], self)
+            pendente = pendente[fim_blocos:]
+        # O que sobrar após o último separador não forma bloco; só pode conter a data.
+        if self.report_date is None:
+            match_data = PADRAO_DATA.search(pendente)
+            if match_data:
+                self.report_date = datetime.strptime(match_data.group(1), '%d/%m/%Y')
+
+
+def tabela_acessos(crachas, nomes, horas, entradas):
+    """
+    Monta o DataFrame colunar e tipado dos acessos:
+    - 'Crachá' e 'Nome': categóricos (cada valor distinto é guardado uma vez;
+      o crachá continua texto, pois pode ter zeros à esquerda e passar do int32);
+    - 'Segundos': int32, segundos desde a meia-noite;
+    - 'Entrada': bool, True para Entrada e False para Saída.
+    """
+    # 'HH:MM:SS' -> dígitos em uint8, convertidos em segundos sem objetos Python por linha
+    digitos = np.array(horas, dtype='S8').view(np.uint8).reshape(-1, 8).astype(np.int32) - ord('0')
+    segundos = ((digitos[:, 0] * 10 + digitos[:, 1]) * 3600
+                + (digitos[:, 3] * 10 + digitos[:, 4]) * 60
+                + digitos[:, 6] * 10 + digitos[:, 7])
+    return pd.DataFrame({
+        'Crachá': pd.Categorical(crachas),
+        'Nome': pd.Categorical(nomes),
+        'Segundos': segundos.astype(np.int32),
+        'Entrada': np.array(entradas, dtype=bool),
+    })
+
+
+@perfil.medir('extrair_dados_frequencia', linhas=perfil.linhas_do_dataframe)
+@com_cache('frequencia', VERSAO_EXTRATOR)
 def extrair_dados_frequencia(caminho_pdf):
     """
     Extrai registros de frequência de um PDF, com lógica aprimorada para lidar
-    com múltiplos formatos de layout de texto.
+    com múltiplos formatos de layout de texto. Retorna (df, data), com o df
+    no formato de 'tabela_acessos'.
     """
     nome_arquivo = os.path.basename(caminho_pdf)
 
@@ -16,63 +184,31 @@ def extrair_dados_frequencia(caminho_pdf):
         return None, None
 
     try:
-        doc = fitz.open(caminho_pdf)
-        full_text = "".join(page.get_text("text") for page in doc)
-        doc.close()
+        leitor = LeitorFrequencia(caminho_pdf)
+        crachas, nomes, horas, entradas = [], [], [], []
+        for cracha, nome, hora, sentido in leitor:
+            crachas.append(cracha)
+            nomes.append(nome)
+            horas.append(hora)
+            entradas.append(sentido == 'Entrada')
+        report_date = leitor.report_date
 
-        report_date = None
-        match_data = re.search(r"Período: de (\d{2}/\d{2}/\d{4})", full_text)
-        if not match_data:
+        if report_date is None:
             print(f"AVISO: Não foi possível encontrar o padrão de DATA no arquivo '{nome_arquivo}'.")
-        else:
-            report_date = datetime.strptime(match_data.group(1), '%d/%m/%Y')
 
-        blocos_alunos = full_text.split('Total de Acessos do Pedestre:')[0:-1]
-        if not blocos_alunos:
+        if leitor.total_blocos == 0:
             print(f"AVISO: Nenhum BLOCO DE ALUNO encontrado em '{nome_arquivo}'. O formato pode ter mudado.")
             return None, report_date
 
-        todos_acessos = []
-
-        # --- INÍCIO DA CORREÇÃO DE LÓGICA ---
-        # Define os dois padrões de regex que conhecemos
-        padrao_novo = re.compile(r"Crachá:\s*(\d+)\s+Nome:\s*(.*?)\n", re.DOTALL)
-        padrao_antigo = re.compile(r'Nome:\n(\d+)\n(.*?)\n', re.DOTALL)
-
-        for bloco in blocos_alunos:
-            cracha, nome = None, None
-            
-            # Tenta encontrar o padrão novo primeiro
-            match = padrao_novo.search(bloco)
-            if match:
-                cracha, nome = match.groups()
-            else:
-                # Se falhar, tenta encontrar o padrão antigo
-                match = padrao_antigo.search(bloco)
-                if match:
-                    cracha, nome = match.groups()
-
-            # Se nenhum dos padrões encontrou uma correspondência, pula este bloco
-            if not cracha or not nome:
-                continue
-
-            cracha = cracha.strip()
-            nome = nome.strip()
-
-            padrao_acesso = re.compile(r'\d{2}/\d{2}/\d{4}\s+(\d{2}:\d{2}:\d{2})\s+(Entrada|Saída)')
-            acessos = padrao_acesso.findall(bloco)
-            
-            for hora, sentido in acessos:
-                todos_acessos.append({'Crachá': cracha, 'Nome': nome, 'Hora': hora, 'Sentido': sentido})
-        # --- FIM DA CORREÇÃO DE LÓGICA ---
-        
-        if not todos_acessos:
+        if not horas:
             print(f"AVISO: Foram encontrados blocos de alunos em '{nome_arquivo}', mas nenhum registro de acesso individual foi extraído.")
             return None, report_date
 
-        df_frequencia = pd.DataFrame(todos_acessos)
+        with perfil.etapa('extrair_dados_frequencia/tabela_acessos') as etapa:
+            df_frequencia = tabela_acessos(crachas, nomes, horas, entradas)
+            etapa.linhas = len(df_frequencia)
         return df_frequencia, report_date
 
     except Exception as e:
         print(f"Ocorreu um erro inesperado durante a extração de frequência: {e}")
-        return None, None
\ No newline at end of file
+        return None, None
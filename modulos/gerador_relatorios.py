@@ -1,48 +1,146 @@
 import pandas as pd
 import os
 from openpyxl import load_workbook, Workbook
+import sqlite3
 import sys
-from datetime import time
+from datetime import datetime
 
 # Adiciona o diretório raiz ao path para encontrar o 'config'
 project_root_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(project_root_path)
 
 import config
+from .consulta_resultados import (COLUNAS_FALTAS, salvar_resultados_do_dia, dias_salvos,
+                                  carregar_faltas_do_dia, resumo_faltas)
 
-# --- FUNÇÃO DE FORMATAÇÃO DO RELATÓRIO DETALHADO ---
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+# --- FUNÇÃO DE ESCRITA DAS ABAS DO RELATÓRIO DETALHADO ---
+from openpyxl.styles import PatternFill
 from openpyxl.formatting.rule import FormulaRule
 from openpyxl.worksheet.datavalidation import DataValidation
 from openpyxl.utils import get_column_letter
+from .escritor_planilhas import registrar_estilos, larguras_colunas, definir_larguras, linha
+from . import perfil
 
-def formatar_relatorio_detalhado(worksheet, has_status_col=False):
-    header_font = Font(bold=True)
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-    for row in worksheet.iter_rows(min_row=1, max_row=worksheet.max_row, min_col=1, max_col=worksheet.max_column):
-        for cell in row:
-            cell.border = thin_border
-            if cell.row == 1:
-                cell.font = header_font
-    for col_idx, col in enumerate(worksheet.columns, 1):
-        try:
-            max_length = max(len(str(cell.value)) for cell in col if cell.value)
-            worksheet.column_dimensions[get_column_letter(col_idx)].width = max_length + 2
-        except (ValueError, TypeError):
-            pass
-    worksheet.auto_filter.ref = worksheet.dimensions
+def escrever_aba_detalhada(workbook, titulo, df, indice=None, has_status_col=False):
+    """
+    Cria a aba com o DataFrame já formatado: cabeçalho em negrito, bordas,
+    larguras calculadas a partir do DataFrame e autofiltro. Na aba de resumo,
+    adiciona a lista PENDENTE/LANÇADA e as cores da coluna STATUS.
+    """
+    registrar_estilos(workbook, ['cabecalho', 'borda'])
+    worksheet = workbook.create_sheet(titulo, indice)
+    definir_larguras(worksheet, larguras_colunas(df))
+    worksheet.append(linha(worksheet, df.columns, 'cabecalho'))
+    for valores in df.itertuples(index=False, name=None):
+        worksheet.append(linha(worksheet, valores, 'borda'))
+    ultima_linha = len(df) + 1
+    ultima_coluna = get_column_letter(len(df.columns))
+    worksheet.auto_filter.ref = f'A1:{ultima_coluna}{ultima_linha}'
     if has_status_col:
-        status_col_letter = get_column_letter(worksheet.max_column)
         dv = DataValidation(type="list", formula1='"PENDENTE,LANÇADA"', allow_blank=True)
         worksheet.add_data_validation(dv)
-        validation_range = f'{status_col_letter}2:{status_col_letter}{worksheet.max_row}'
+        validation_range = f'{ultima_coluna}2:{ultima_coluna}{ultima_linha}'
         dv.add(validation_range)
         red_fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
         green_fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-        worksheet.conditional_formatting.add(validation_range, FormulaRule(formula=[f'LEFT({status_col_letter}2, 8)="PENDENTE"'], fill=red_fill))
-        worksheet.conditional_formatting.add(validation_range, FormulaRule(formula=[f'LEFT({status_col_letter}2, 7)="LANÇADA"'], fill=green_fill))
+        worksheet.conditional_formatting.add(validation_range, FormulaRule(formula=[f'LEFT({ultima_coluna}2, 8)="PENDENTE"'], fill=red_fill))
+        worksheet.conditional_formatting.add(validation_range, FormulaRule(formula=[f'LEFT({ultima_coluna}2, 7)="LANÇADA"'], fill=green_fill))
+    return worksheet
 
 # --- FUNÇÃO DE GERAÇÃO DO RELATÓRIO DETALHADO ---
+def _importar_abas_legadas(output_path, abas, logger):
+    """
+    Importa para o banco as abas diárias de um relatório gerado antes da
+    persistência em SQLite (só acontece uma vez por aba).
+    """
+    try:
+        arquivo = pd.ExcelFile(output_path)
+    except Exception as e:
+        logger(f"Aviso: Não foi possível ler abas antigas do arquivo existente. Erro: {e}")
+        return
+    # Uma aba por vez: uma aba ausente ou ilegível não impede a importação das outras
+    with arquivo:
+        for aba, data in abas:
+            if aba not in arquivo.sheet_names:
+                continue
+            try:
+                df = arquivo.parse(aba)
+            except Exception as e:
+                logger(f"Aviso: Não foi possível ler a aba antiga '{aba}'. Erro: {e}")
+                continue
+            if 'Total de Faltas' not in df.columns:
+                continue
+            _importar_aba_legada(aba, data, df, logger)
+
+
+def _importar_aba_legada(aba, data, df, logger):
+    """
+    Grava no banco as faltas de uma aba diária antiga.
+    """
+    # Totais em branco ou não numéricos (editados à mão na planilha) são ignorados
+    df = df[COLUNAS_FALTAS].assign(**{'Total de Faltas': pd.to_numeric(df['Total de Faltas'], errors='coerce')})
+    validas = df['Total de Faltas'].notna()
+    if not validas.all():
+        logger(f"Aviso: {(~validas).sum()} linha(s) da aba '{aba}' sem total de faltas válido foram ignoradas.")
+    faltas = {}
+    for matricula, nome, turma, disciplina, total in df[validas].itertuples(index=False, name=None):
+        chave = (str(matricula), nome, turma, disciplina)
+        faltas[chave] = faltas.get(chave, 0) + int(total)
+    salvar_resultados_do_dia(data, faltas, None)
+    logger(f"Aba '{aba}' do relatório existente importada para o banco de dados.")
+
+
+COLUNAS_CHAVE_RESUMO = ['Matricula', 'Nome', 'Turma', 'Disciplina']
+
+
+def _status_existentes(worksheet):
+    """
+    Lê os STATUS já preenchidos na aba de resumo (ex.: 'LANÇADA'), indexados
+    por (matrícula, nome, turma, disciplina), junto com o 'Total na Semana'
+    da linha: {chave: (total, status)}.
+    """
+    linhas = worksheet.iter_rows(values_only=True)
+    cabecalho = list(next(linhas, ()))
+    colunas = COLUNAS_CHAVE_RESUMO + ['Total na Semana', 'STATUS']
+    if not all(coluna in cabecalho for coluna in colunas):
+        return {}
+    indices_chave = [cabecalho.index(coluna) for coluna in COLUNAS_CHAVE_RESUMO]
+    indice_total = cabecalho.index('Total na Semana')
+    indice_status = cabecalho.index('STATUS')
+    status = {}
+    for valores in linhas:
+        if len(valores) <= indice_status or valores[indice_status] is None:
+            continue
+        chave = tuple('' if valores[i] is None else str(valores[i]) for i in indices_chave)
+        status[chave] = (valores[indice_total], valores[indice_status])
+    return status
+
+
+def _status_da_linha(anterior, total):
+    """
+    STATUS de uma linha do resumo: o já preenchido só vale se o total não
+    mudou (faltas novas precisam ser lançadas de novo); senão, 'PENDENTE'.
+    """
+    if anterior is None:
+        return 'PENDENTE'
+    total_anterior, status = anterior
+    try:
+        mesmo_total = total_anterior is not None and float(total_anterior) == float(total)
+    except (TypeError, ValueError):
+        mesmo_total = False
+    return status if mesmo_total else 'PENDENTE'
+
+
+def _posicao_aba_dia(workbook, sheet_name, sheet_name_resumo):
+    """
+    Posição da aba do dia entre as demais abas diárias (em ordem de nome,
+    como no relatório completo), sempre antes da aba de resumo.
+    """
+    abas_dias = [aba for aba in workbook.sheetnames if aba != sheet_name_resumo]
+    return sum(1 for aba in abas_dias if aba < sheet_name)
+
+
+@perfil.medir('gerar_relatorio_faltas')
 def gerar_relatorio_faltas(dados_da_sessao, logger):
     logger("\n--- Gerando Relatório Detalhado de Faltas com Resumo Semanal ---")
     if not dados_da_sessao:
@@ -51,71 +149,121 @@ def gerar_relatorio_faltas(dados_da_sessao, logger):
     sheet_name_resumo = 'Quantitativo Total da Semana'
     output_path = os.path.join(config.REPORTS_DIR, config.DETAILED_REPORT_FILENAME)
     os.makedirs(config.REPORTS_DIR, exist_ok=True)
-    dados_existentes = {}
+
+    # O arquivo é atualizado de forma incremental: só as abas dos dias da
+    # sessão e a aba de resumo são reescritas; as demais ficam como estão.
+    workbook = None
     if os.path.exists(output_path):
         try:
-            dados_existentes = pd.read_excel(output_path, sheet_name=None)
-            if sheet_name_resumo in dados_existentes:
-                del dados_existentes[sheet_name_resumo]
+            with perfil.etapa('gerar_relatorio_faltas/abrir_xlsx'):
+                workbook = load_workbook(output_path)
         except Exception as e:
             logger(f"Aviso: Não foi possível ler arquivo existente. Erro: {e}")
-    for sheet_name, (report_date, faltas_dict, _) in dados_da_sessao.items():
-        if faltas_dict:
-            lista_faltas = [list(chave) + [valor] for chave, valor in faltas_dict.items()]
-            dados_existentes[sheet_name] = pd.DataFrame(lista_faltas, columns=['Matricula', 'Nome', 'Turma', 'Disciplina', 'Total de Faltas'])
-    if dados_existentes:
-        dfs_para_resumo = [df for df in dados_existentes.values() if 'Total de Faltas' in df.columns and not df.empty]
-        if dfs_para_resumo:
-            combined_df = pd.concat(dfs_para_resumo, ignore_index=True)
-            df_resumo = combined_df.groupby(['Matricula', 'Nome', 'Turma', 'Disciplina'])['Total de Faltas'].sum().reset_index()
-            df_resumo.rename(columns={'Total de Faltas': 'Total na Semana'}, inplace=True)
-            df_resumo['STATUS'] = 'PENDENTE'
+    if workbook is None:
+        workbook = Workbook()
+        workbook.remove(workbook.active)
+
+    # Dias do relatório: as abas que já estão no arquivo mais os dias da sessão.
+    # Os dados vêm do banco (tabela 'faltas'), não do Excel.
+    datas_por_aba = {}
+    for aba in workbook.sheetnames:
+        try:
+            datas_por_aba[aba] = datetime.strptime(aba, '%d-%m-%Y')
+        except ValueError:
+            pass  # Aba de resumo ou aba que não é um dia
     try:
-        with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-            for sheet_name in sorted(dados_existentes.keys()):
-                df = dados_existentes[sheet_name]
+        with perfil.etapa('gerar_relatorio_faltas/banco') as etapa:
+            for sheet_name, (report_date, faltas_dict, df_problemas) in dados_da_sessao.items():
+                salvar_resultados_do_dia(report_date, faltas_dict, df_problemas)
+                datas_por_aba[sheet_name] = report_date
+            salvos = dias_salvos(datas_por_aba.values())
+            # Os dias da sessão acabaram de ser salvos: nunca são substituídos pelas abas antigas
+            abas_legadas = [(aba, data) for aba, data in datas_por_aba.items()
+                            if aba not in dados_da_sessao and data not in salvos]
+            if abas_legadas:
+                _importar_abas_legadas(output_path, abas_legadas, logger)
+
+            abas_novas = {}
+            for sheet_name in dados_da_sessao:
+                abas_novas[sheet_name] = carregar_faltas_do_dia(datas_por_aba[sheet_name])
+            df_resumo = resumo_faltas(datas_por_aba.values())
+            etapa.linhas = len(df_resumo)
+    except sqlite3.Error as e:
+        logger(f"ERRO ao acessar os resultados no banco de dados: {e}")
+        return
+
+    # Preserva os STATUS já lançados pela equipe enquanto o total não muda;
+    # linhas novas ou com total alterado entram como PENDENTE.
+    status_anteriores = {}
+    if sheet_name_resumo in workbook.sheetnames:
+        status_anteriores = _status_existentes(workbook[sheet_name_resumo])
+        workbook.remove(workbook[sheet_name_resumo])
+    chaves = zip(*(df_resumo[coluna].astype(str) for coluna in COLUNAS_CHAVE_RESUMO))
+    status_linhas = []
+    reabertas = 0
+    for chave, total in zip(chaves, df_resumo['Total na Semana']):
+        anterior = status_anteriores.get(chave)
+        status = _status_da_linha(anterior, total)
+        if anterior is not None and anterior[1] != 'PENDENTE' and status == 'PENDENTE':
+            reabertas += 1
+        status_linhas.append(status)
+    df_resumo['STATUS'] = status_linhas
+    lancadas = sum(1 for status in status_linhas if status != 'PENDENTE')
+    if lancadas:
+        logger(f"{lancadas} linha(s) do resumo mantiveram o STATUS já preenchido.")
+    if reabertas:
+        logger(f"{reabertas} linha(s) do resumo voltaram a PENDENTE porque o total de faltas mudou.")
+
+    try:
+        with perfil.etapa('gerar_relatorio_faltas/escrever_abas') as etapa:
+            etapa.linhas = len(df_resumo) + sum(len(df) for df in abas_novas.values())
+            for sheet_name in sorted(abas_novas.keys()):
+                if sheet_name in workbook.sheetnames:
+                    workbook.remove(workbook[sheet_name])
+                df = abas_novas[sheet_name]
+                if df.empty:
+                    continue
                 df.sort_values(by=['Turma', 'Nome', 'Disciplina'], inplace=True)
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-            if 'df_resumo' in locals() and not df_resumo.empty:
+                escrever_aba_detalhada(workbook, sheet_name, df,
+                                       _posicao_aba_dia(workbook, sheet_name, sheet_name_resumo))
+            if not df_resumo.empty:
                 df_resumo.sort_values(by=['Turma', 'Nome', 'Disciplina'], inplace=True)
-                df_resumo.to_excel(writer, sheet_name=sheet_name_resumo, index=False)
-        workbook = load_workbook(output_path)
-        for sheet_name in workbook.sheetnames:
-            formatar_relatorio_detalhado(workbook[sheet_name], has_status_col=(sheet_name == sheet_name_resumo))
-        workbook.save(output_path)
+                escrever_aba_detalhada(workbook, sheet_name_resumo, df_resumo, has_status_col=True)
+        if not workbook.sheetnames:
+            logger("Nenhuma falta registrada para gerar o relatório detalhado.")
+            return
+        with perfil.etapa('gerar_relatorio_faltas/salvar_xlsx'):
+            workbook.save(output_path)
         logger(f"Relatório detalhado salvo/atualizado com sucesso!")
     except Exception as e:
         logger(f"ERRO ao salvar relatório detalhado: {e}")
 
+def _segundos_do_acesso(df_problemas):
+    """
+    Horário de cada acesso em segundos desde a meia-noite (nulo quando não há).
+    Usa a coluna 'hora_acesso' de processar_dados_diarios; para ocorrências sem
+    ela (ex.: lidas do banco), extrai o horário do texto "Entrada: HH:MM:SS".
+    """
+    if 'hora_acesso' in df_problemas.columns:
+        return df_problemas['hora_acesso']
+    horarios = df_problemas['Acesso'].astype(str).str.extract(r': (\d{1,2}:\d{2}:\d{2})$', expand=False)
+    return pd.to_timedelta(horarios, errors='coerce').dt.total_seconds().astype('Int64')
+
+
+@perfil.medir('gerar_relatorio_simples')
 def gerar_relatorio_simples(df_problemas, report_date, logger):
     logger("\n--- Gerando Relatório Simples de Frequência ---")
     
     # *** FILTRO ADICIONADO AQUI: Só mostra acessos após 7:50 ***
-    horario_corte = time(7, 50)
-    
-    def filtrar_por_horario(row):
-        # Se for FALTOU, mantém (não tem horário específico)
-        if row['Problema'] == 'FALTOU':
-            return True
-        
-        # Para CHEGOU ATRASADO e SAIU CEDO, verifica o horário
-        acesso_str = row['Acesso']
-        if acesso_str and acesso_str != 'Sem registro':
-            try:
-                # Extrai o horário do formato "Entrada: HH:MM:SS" ou "Saída: HH:MM:SS"
-                horario_str = acesso_str.split(': ')[1]  # Pega "HH:MM:SS"
-                hora, minuto, segundo = map(int, horario_str.split(':'))
-                horario_acesso = time(hora, minuto, segundo)
-                
-                # Só mostra se o acesso foi após 7:50
-                return horario_acesso >= horario_corte
-            except:
-                # Se houver erro ao processar, mantém o registro
-                return True
-        return True
-    
-    # Aplica o filtro
-    df_problemas_filtrado = df_problemas[df_problemas.apply(filtrar_por_horario, axis=1)].copy()
+    # FALTOU (sem horário) e acessos sem horário reconhecível são mantidos.
+    horario_corte = 7 * 3600 + 50 * 60
+    with perfil.etapa('gerar_relatorio_simples/filtro') as etapa:
+        df_problemas_filtrado = df_problemas
+        if not df_problemas.empty:
+            hora_acesso = _segundos_do_acesso(df_problemas)
+            manter = (df_problemas['Problema'] == 'FALTOU') | hora_acesso.isna() | (hora_acesso >= horario_corte)
+            df_problemas_filtrado = df_problemas[manter.to_numpy(dtype=bool)]
+        etapa.linhas = len(df_problemas_filtrado)
     
     if df_problemas_filtrado.empty:
         logger("Nenhum problema de frequência após 7:50 detectado. Relatório vazio.")
@@ -130,34 +278,23 @@ def gerar_relatorio_simples(df_problemas, report_date, logger):
                       3: 'Quinta-feira', 4: 'Sexta-feira', 5: 'Sábado', 6: 'Domingo'}
     dia_da_semana_pt = dias_semana_pt.get(report_date.weekday(), '')
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = report_date.strftime('%d-%m-%Y')
-    
-    # Estilos
-    title_font = Font(name='Calibri', size=14, bold=True, color="FFFFFF")
-    title_fill = PatternFill(start_color="008000", end_color="008000", fill_type="solid")
-    turma_font = Font(name='Calibri', size=12, bold=True)
-    turma_fill = PatternFill(start_color="E7E6E6", end_color="E7E6E6", fill_type="solid")
-    header_font = Font(name='Calibri', size=11, bold=True)
-    fill_faltou = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-    fill_atrasado = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-    fill_saiu_cedo = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), 
-                        top=Side(style='thin'), bottom=Side(style='thin'))
-    
+    # Gravação em fluxo (write_only): as linhas vão direto para o arquivo, com
+    # estilos nomeados registrados uma única vez.
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(report_date.strftime('%d-%m-%Y'))
+    registrar_estilos(wb, ['titulo_relatorio', 'titulo_turma', 'cabecalho_turma', 'borda',
+                           'faltou', 'atrasado', 'saiu_cedo'])
+    estilo_por_problema = {'FALTOU': 'faltou', 'CHEGOU ATRASADO': 'atrasado', 'SAIU CEDO': 'saiu_cedo'}
+
+    if not df_problemas_filtrado.empty:
+        # Largura das colunas (definida antes da primeira linha no modo write_only)
+        definir_larguras(ws, [15, 45, 18, 15])  # Matrícula, Nome do Aluno, Problema, Acesso
+
     # Título Principal
-    titulo_cell = ws.cell(row=1, column=1, value=f"Relatório de Frequência - {dia_da_semana_pt}, {report_date.strftime('%d/%m/%Y')}")
-    titulo_cell.font = title_font
-    titulo_cell.fill = title_fill
-    titulo_cell.alignment = Alignment(horizontal='center')
-    ws.merge_cells('A1:D1')
-    for col in range(1, 5):
-        ws.cell(row=1, column=col).border = thin_border
-        ws.cell(row=1, column=col).font = title_font
-        ws.cell(row=1, column=col).fill = title_fill
-        ws.cell(row=1, column=col).alignment = Alignment(horizontal='center')
-    
+    titulo = f"Relatório de Frequência - {dia_da_semana_pt}, {report_date.strftime('%d/%m/%Y')}"
+    ws.append(linha(ws, [titulo, None, None, None], 'titulo_relatorio'))
+    ws.merged_cells.add('A1:D1')
+    ws.append([])
     current_row = 3
     
     # *** EXTRAI TURMAS DINAMICAMENTE DOS DADOS FILTRADOS ***
@@ -167,69 +304,33 @@ def gerar_relatorio_simples(df_problemas, report_date, logger):
         logger(f"Relatório simples salvo com sucesso em: {output_path}")
         return
     
-    # Obtém lista única de turmas presentes nos dados filtrados, ordenadas
-    turmas_com_problemas = sorted(df_problemas_filtrado['Turma'].unique())
-    logger(f"Turmas com problemas detectados (após 7:50): {', '.join(turmas_com_problemas)}")
+    # Uma única ordenação (turma, nome) e um único agrupamento por turma
+    df_problemas_filtrado = df_problemas_filtrado.sort_values(by=['Turma', 'Nome do Aluno'], kind='stable')
+    grupos_por_turma = df_problemas_filtrado.groupby('Turma', sort=False)
+    logger(f"Turmas com problemas detectados (após 7:50): {', '.join(df_problemas_filtrado['Turma'].unique())}")
     
-    for turma in turmas_com_problemas:
-        # Filtra dados da turma
-        data = df_problemas_filtrado[df_problemas_filtrado['Turma'] == turma].copy()
-        
+    headers = ['Matrícula', 'Nome do Aluno', 'Problema', 'Acesso']
+    for turma, data in grupos_por_turma:
         # Header da Turma
-        turma_cell = ws.cell(row=current_row, column=1, value=f"TURMA: {turma}")
-        turma_cell.font = turma_font
-        turma_cell.fill = turma_fill
-        ws.merge_cells(start_row=current_row, start_column=1, end_row=current_row, end_column=4)
-        for col in range(1, 5):
-            ws.cell(row=current_row, column=col).border = thin_border
-            ws.cell(row=current_row, column=col).font = turma_font
-            ws.cell(row=current_row, column=col).fill = turma_fill
-        current_row += 1
+        ws.append(linha(ws, [f"TURMA: {turma}", None, None, None], 'titulo_turma'))
+        ws.merged_cells.add(f'A{current_row}:D{current_row}')
         
         # Adiciona cabeçalho das colunas
-        headers = ['Matrícula', 'Nome do Aluno', 'Problema', 'Acesso']
-        for col_idx, header in enumerate(headers, 1):
-            cell = ws.cell(row=current_row, column=col_idx, value=header)
-            cell.font = header_font
-            cell.border = thin_border
-        current_row += 1
+        ws.append(linha(ws, headers, 'cabecalho_turma'))
+        current_row += 2
         
-        # Ordena e adiciona dados dos alunos
-        data = data.sort_values(by=['Nome do Aluno'])
-        for _, aluno in data.iterrows():
-            problema = aluno['Problema']
-            
-            # Determina a cor de fundo
-            fill_color = None
-            if problema == 'FALTOU':
-                fill_color = fill_faltou
-            elif problema == 'CHEGOU ATRASADO':
-                fill_color = fill_atrasado
-            elif problema == 'SAIU CEDO':
-                fill_color = fill_saiu_cedo
-            
-            # Adiciona a linha
-            row_data = [aluno['Matricula'], aluno['Nome do Aluno'], 
-                       aluno['Problema'], aluno['Acesso']]
-            for col_idx, value in enumerate(row_data, 1):
-                cell = ws.cell(row=current_row, column=col_idx, value=value)
-                cell.border = thin_border
-                if fill_color:
-                    cell.fill = fill_color
-            
+        # Adiciona dados dos alunos (já ordenados por nome), com a cor de fundo do problema
+        for row_data in data[['Matricula', 'Nome do Aluno', 'Problema', 'Acesso']].itertuples(index=False, name=None):
+            ws.append(linha(ws, row_data, estilo_por_problema.get(row_data[2], 'borda')))
             current_row += 1
         
         # Linha em branco entre turmas
+        ws.append([])
         current_row += 1
-
-    # Ajusta largura das colunas
-    ws.column_dimensions['A'].width = 15  # Matrícula
-    ws.column_dimensions['B'].width = 45  # Nome do Aluno
-    ws.column_dimensions['C'].width = 18  # Problema
-    ws.column_dimensions['D'].width = 15  # Acesso
         
     try:
-        wb.save(output_path)
+        with perfil.etapa('gerar_relatorio_simples/salvar_xlsx'):
+            wb.save(output_path)
         logger(f"Relatório simples salvo com sucesso em: {output_path}")
     except Exception as e:
-        logger(f"ERRO ao salvar relatório simples: {e}")
\ No newline at end of file
+        logger(f"ERRO ao salvar relatório simples: {e}")
@@ -0,0 +1,71 @@
+from collections import namedtuple
+
+# Aulas de uma turma em um dia, já filtradas e ordenadas pelo horário de início.
+# 'aulas' é uma tupla de (inicio_min, fim_min, disciplina); 'inicio_min' e 'fim_min'
+# do próprio registro são o início da primeira aula e o fim da última.
+AulasDoDia = namedtuple('AulasDoDia', ['aulas', 'inicio_min', 'fim_min', 'inicios_seg', 'fins_seg', 'disciplinas'])
+
+# Grades já compiladas neste processo: filtro de horário -> (df_horarios, grade).
+# Só vale para o mesmo DataFrame (mesmo objeto); cada carregar_dados_base lê a
+# tabela de novo e recompila, inclusive após alterações feitas por outros processos.
+_cache_grades = {}
+
+
+def minutos_do_dia(hora):
+    """
+    Converte um objeto time em minutos desde a meia-noite.
+    """
+    return hora.hour * 60 + hora.minute
+
+
+class GradeHorarios:
+    """
+    Tabela 'horarios' compilada em um dicionário (turma, dia_semana) -> AulasDoDia,
+    para que cada consulta seja O(1) em vez de um filtro sobre o DataFrame.
+
+    Se um filtro (inicio_min, fim_min) for informado, só entram as aulas que
+    começam dentro do intervalo [inicio_min, fim_min).
+    """
+
+    def __init__(self, df_horarios, filtro=None):
+        import numpy as np
+        agrupadas = {}
+        colunas = zip(df_horarios['turma'], df_horarios['dia_semana'], df_horarios['hora_inicio'],
+                      df_horarios['hora_fim'], df_horarios['disciplina'])
+        for turma, dia_semana, hora_inicio, hora_fim, disciplina in colunas:
+            inicio_min, fim_min = minutos_do_dia(hora_inicio), minutos_do_dia(hora_fim)
+            if filtro is not None and not (filtro[0] <= inicio_min < filtro[1]):
+                continue
+            agrupadas.setdefault((turma, dia_semana), []).append((inicio_min, fim_min, disciplina))
+
+        self._aulas = {}
+        for chave, aulas in agrupadas.items():
+            # Ordenação estável: aulas com o mesmo início mantêm a ordem do banco.
+            aulas = tuple(sorted(aulas, key=lambda aula: aula[0]))
+            self._aulas[chave] = AulasDoDia(
+                aulas=aulas,
+                inicio_min=aulas[0][0],
+                fim_min=aulas[-1][1],
+                inicios_seg=np.array([aula[0] * 60 for aula in aulas], dtype=np.float64),
+                fins_seg=np.array([aula[1] * 60 for aula in aulas], dtype=np.float64),
+                disciplinas=[aula[2] for aula in aulas],
+            )
+
+    def aulas(self, turma, dia_semana):
+        """
+        Retorna o AulasDoDia da turma no dia, ou None se não houver aulas.
+        """
+        return self._aulas.get((turma, dia_semana))
+
+
+def obter_grade(df_horarios, filtro=None):
+    """
+    Retorna a grade compilada para o filtro, reaproveitando-a enquanto o
+    DataFrame de horários for o mesmo objeto.
+    """
+    em_cache = _cache_grades.get(filtro)
+    if em_cache is not None and em_cache[0] is df_horarios:
+        return em_cache[1]
+    grade = GradeHorarios(df_horarios, filtro)
+    _cache_grades[filtro] = (df_horarios, grade)
+    return grade
@@ -0,0 +1,209 @@
+import functools
+import math
+import os
+import re
+import sys
+import unicodedata
+
+# Adiciona o diretório raiz ao path para encontrar o 'config'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+_NAO_ALFANUMERICO = re.compile(r'[^0-9A-Z]+')
+
+
+def normalizar_nome(nome):
+    """
+    Normaliza um nome para comparação: maiúsculas e espaços internos colapsados.
+    """
+    return ' '.join(nome.strip().upper().split())
+
+
+def dobrar_nome(nome):
+    """
+    Forma do nome usada na busca por semelhança: maiúsculas, sem acentos
+    ('JOÃO' -> 'JOAO') e com pontuação trocada por espaço ('D.OLIVEIRA' -> 'D OLIVEIRA').
+    """
+    decomposto = unicodedata.normalize('NFKD', nome.upper())
+    sem_acentos = ''.join(caractere for caractere in decomposto if not unicodedata.combining(caractere))
+    return _NAO_ALFANUMERICO.sub(' ', sem_acentos).strip()
+
+
+@functools.lru_cache(maxsize=65536)
+def _trigramas_da_palavra(palavra):
+    # Os nomes repetem muito as mesmas palavras (SILVA, SOUZA, MARIA...)
+    resultado = []
+    for parte in dobrar_nome(palavra).split():
+        parte = f"  {parte} "
+        resultado.extend(parte[inicio:inicio + 3] for inicio in range(len(parte) - 2))
+    return tuple(resultado)
+
+
+def trigramas(nome):
+    """
+    Conjunto de trigramas do nome já dobrado (ver dobrar_nome), palavra a
+    palavra, com dois espaços antes e um depois de cada palavra
+    ('ANA' -> '  A', ' AN', 'ANA', 'NA ').
+    """
+    conjunto = set()
+    for palavra in nome.split():
+        conjunto.update(_trigramas_da_palavra(palavra))
+    return frozenset(conjunto)
+
+
+# Último índice de trigramas montado neste processo, com os nomes dos alunos de
+# que ele veio: os StudentIndex de cada dia, sobre a mesma tabela, o reaproveitam.
+_indice_semelhanca_em_cache = None
+
+
+def _montar_indice_semelhanca(nomes):
+    """
+    Índice invertido dos trigramas: as posições dos alunos que contêm cada
+    trigrama ficam contíguas em um único array, na faixa (início, fim) guardada
+    para o trigrama. Retorna (faixas, posições, trigramas por aluno), este
+    último com o número de trigramas de cada aluno (0 sem nome).
+    """
+    import numpy as np
+    ids_trigramas = {}
+    ids, donos, quantidades = [], [], []
+    for posicao, nome in enumerate(nomes):
+        conjunto = trigramas(nome) if nome is not None else ()
+        quantidades.append(len(conjunto))
+        ids.extend(ids_trigramas.setdefault(trigrama, len(ids_trigramas)) for trigrama in conjunto)
+        donos.extend([posicao] * len(conjunto))
+    ids = np.array(ids, dtype=np.int32)
+    posicoes = np.array(donos, dtype=np.int32)[np.argsort(ids, kind='stable')]
+    limites = np.r_[0, np.cumsum(np.bincount(ids, minlength=len(ids_trigramas)))].tolist()
+    faixas = {trigrama: (limites[id_trigrama], limites[id_trigrama + 1])
+              for trigrama, id_trigrama in ids_trigramas.items()}
+    return faixas, posicoes, np.array(quantidades, dtype=np.int32)
+
+
+def _obter_indice_semelhanca(nomes):
+    global _indice_semelhanca_em_cache
+    em_cache = _indice_semelhanca_em_cache
+    if em_cache is not None and em_cache[0] == nomes:
+        return em_cache[1]
+    indice = _montar_indice_semelhanca(nomes)
+    _indice_semelhanca_em_cache = (nomes, indice)
+    return indice
+
+
+class StudentIndex:
+    """
+    Índice em memória da tabela 'alunos', construído uma única vez por processamento.
+
+    Substitui as varreduras do DataFrame feitas a cada chamada de 'buscar_aluno':
+    - dicionário por matrícula;
+    - dicionário por nome exato (strip + upper, como a busca original);
+    - trie de prefixos sobre o nome normalizado, para a regra de nome parcial
+      (todas as palavras iguais, exceto a última, que pode ser um prefixo);
+    - índice invertido de trigramas do nome sem acentos, para a busca por
+      semelhança (diferenças de acento e erros de digitação/OCR), usada só
+      quando as regras acima não encontram ninguém; montado no primeiro uso e
+      reaproveitado pelos índices seguintes enquanto os nomes não mudarem.
+    """
+
+    def __init__(self, df_alunos):
+        self.df_alunos = df_alunos
+        self._por_matricula = {}
+        self._por_nome = {}
+        # Cada nó da trie é um dicionário {caractere: nó}; a chave None guarda
+        # [quantidade de alunos na subárvore, posição do primeiro aluno].
+        self._trie = {}
+        # Índice de trigramas (ver _montar_indice_semelhanca)
+        self._indice_semelhanca = None
+
+        matriculas = df_alunos['matricula'].astype(str).tolist()
+        nomes = df_alunos['nome'].tolist()
+        for posicao, (matricula, nome) in enumerate(zip(matriculas, nomes)):
+            self._por_matricula.setdefault(matricula, posicao)
+            if not isinstance(nome, str):
+                continue
+            self._por_nome.setdefault(nome.strip().upper(), posicao)
+            self._inserir_na_trie(normalizar_nome(nome), posicao)
+
+    def _inserir_na_trie(self, nome_normalizado, posicao):
+        no = self._trie
+        for caractere in nome_normalizado:
+            no = no.setdefault(caractere, {})
+            contador = no.setdefault(None, [0, posicao])
+            contador[0] += 1
+
+    def _linha(self, posicao):
+        return self.df_alunos.iloc[posicao]
+
+    def semelhantes(self, nome_pdf, limiar=None, limite=5):
+        """
+        Alunos com nome parecido, como [(semelhança, posição), ...] do mais ao
+        menos parecido, até 'limite' candidatos. A semelhança é a de Jaccard
+        entre os conjuntos de trigramas (1.0 = mesmos trigramas); só entram
+        candidatos com semelhança >= limiar (padrão: config.LIMIAR_SEMELHANCA_NOME).
+        """
+        import numpy as np
+        limiar = config.LIMIAR_SEMELHANCA_NOME if limiar is None else limiar
+        consulta = trigramas(nome_pdf)
+        if not consulta or limiar > 1:
+            return []
+        if self._indice_semelhanca is None:
+            nomes = tuple(nome if isinstance(nome, str) else None for nome in self.df_alunos['nome'].tolist())
+            self._indice_semelhanca = _obter_indice_semelhanca(nomes)
+        faixa_do_trigrama, posicoes, trigramas_por_aluno = self._indice_semelhanca
+        faixas = [faixa_do_trigrama[trigrama] for trigrama in consulta if trigrama in faixa_do_trigrama]
+        if not faixas:
+            return []
+
+        # Trigramas em comum com a consulta, para todos os alunos de uma vez
+        em_comum = np.bincount(np.concatenate([posicoes[inicio:fim] for inicio, fim in faixas]),
+                               minlength=len(trigramas_por_aluno))
+        # Com semelhança >= limiar, o aluno tem pelo menos limiar * len(consulta)
+        # trigramas em comum: os demais nem entram no cálculo.
+        minimo = max(1, math.ceil(limiar * len(consulta) - 1e-9))
+        candidatos = np.flatnonzero(em_comum >= minimo)
+        em_comum = em_comum[candidatos]
+        semelhancas = em_comum / (len(consulta) + trigramas_por_aluno[candidatos] - em_comum)
+        aceitos = semelhancas >= limiar
+        candidatos, semelhancas = candidatos[aceitos], semelhancas[aceitos]
+        ordem = np.lexsort((candidatos, -semelhancas))[:limite]
+        return [(float(semelhancas[indice]), int(candidatos[indice])) for indice in ordem]
+
+    def _buscar_semelhante(self, nome_pdf, logger):
+        """
+        Aceita o candidato mais parecido só se ele se destacar do segundo por
+        pelo menos config.MARGEM_SEMELHANCA_NOME; senão, avisa e retorna None.
+        """
+        ranking = self.semelhantes(nome_pdf, limite=2)
+        if not ranking:
+            return None
+        semelhanca, posicao = ranking[0]
+        if len(ranking) > 1 and semelhanca - ranking[1][0] < config.MARGEM_SEMELHANCA_NOME:
+            logger(f"  AVISO: Múltiplos alunos parecidos com '{nome_pdf}'.")
+            return None
+        linha = self._linha(posicao)
+        logger(f"  AVISO: '{nome_pdf}' associado a '{linha['nome']}' por semelhança ({semelhanca:.0%}).")
+        return linha
+
+    def buscar(self, matricula_pdf=None, nome_pdf=None, logger=print):
+        """
+        Retorna a linha do aluno (mesma semântica de 'buscar_aluno') ou None.
+        """
+        if matricula_pdf:
+            posicao = self._por_matricula.get(str(matricula_pdf))
+            if posicao is not None: return self._linha(posicao)
+        if nome_pdf:
+            nome_pdf_normalizado = normalizar_nome(nome_pdf)
+            posicao = self._por_nome.get(nome_pdf_normalizado)
+            if posicao is not None: return self._linha(posicao)
+            if len(nome_pdf_normalizado.split()) < 2: return None
+            no = self._trie
+            for caractere in nome_pdf_normalizado:
+                no = no.get(caractere)
+                if no is None: break
+            else:
+                quantidade, posicao = no[None]
+                if quantidade == 1:
+                    return self._linha(posicao)
+                logger(f"  AVISO: Múltiplos alunos para '{nome_pdf}'.")
+                return None
+            return self._buscar_semelhante(nome_pdf, logger)
+        return None
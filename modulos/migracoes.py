@@ -0,0 +1,174 @@
+import sqlite3
+
+from . import repositorio
+from .indice_alunos import normalizar_nome
+
+# Cada migração leva o banco da versão (n - 1) para a versão n; a versão atual
+# fica registrada em PRAGMA user_version. Novas migrações entram no fim da lista.
+
+
+def _migracao_001_chaves_e_indices(conn, logger):
+    """
+    Recria 'alunos' e 'horarios' com tipos e chave primária e cria os índices de consulta.
+    """
+    # --- alunos: matrícula como chave primária e nome normalizado indexado ---
+    # A matrícula passa a ser TEXT: 123 (inteiro) e '123' (texto) são o mesmo
+    # aluno, então a comparação é feita já convertida, como na busca por matrícula
+    duplicados = conn.execute(
+        "SELECT COUNT(*) - COUNT(DISTINCT CAST(matricula AS TEXT)) FROM alunos WHERE matricula IS NOT NULL").fetchone()[0]
+    if duplicados:
+        logger(f"AVISO: {duplicados} aluno(s) com matrícula repetida descartado(s); mantida a primeira ocorrência.")
+    sem_matricula = conn.execute("SELECT COUNT(*) FROM alunos WHERE matricula IS NULL").fetchone()[0]
+    if sem_matricula:
+        logger(f"AVISO: {sem_matricula} aluno(s) sem matrícula descartado(s).")
+    conn.execute("""
+        CREATE TABLE alunos_nova (
+            matricula TEXT NOT NULL PRIMARY KEY,
+            nome TEXT,
+            turma TEXT,
+            nome_normalizado TEXT
+        )""")
+    alunos = conn.execute("""
+        SELECT CAST(matricula AS TEXT), nome, turma FROM alunos
+        WHERE matricula IS NOT NULL
+          AND rowid IN (SELECT MIN(rowid) FROM alunos GROUP BY CAST(matricula AS TEXT))
+        ORDER BY rowid""").fetchall()
+    conn.executemany(
+        "INSERT INTO alunos_nova (matricula, nome, turma, nome_normalizado) VALUES (?, ?, ?, ?)",
+        [(matricula, nome, turma, normalizar_nome(nome) if isinstance(nome, str) else None)
+         for matricula, nome, turma in alunos])
+    conn.execute("DROP TABLE alunos")
+    conn.execute("ALTER TABLE alunos_nova RENAME TO alunos")
+    conn.execute("CREATE INDEX idx_alunos_nome_normalizado ON alunos (nome_normalizado)")
+    conn.execute("CREATE INDEX idx_alunos_turma ON alunos (turma)")
+
+    # --- horarios: id inteiro autoincrementado e índice por turma/dia/início ---
+    conn.execute("""
+        CREATE TABLE horarios_nova (
+            id INTEGER PRIMARY KEY,
+            turma TEXT,
+            dia_semana TEXT,
+            hora_inicio TEXT,
+            hora_fim TEXT,
+            disciplina TEXT
+        )""")
+    # Primeiro as linhas que mantêm o ID (a primeira ocorrência de cada ID não
+    # nulo); depois as de ID nulo ou repetido, com IDs novos a partir do maior
+    # ID mantido, para não colidir com nenhum deles.
+    conn.execute("""
+        INSERT INTO horarios_nova (id, turma, dia_semana, hora_inicio, hora_fim, disciplina)
+        SELECT id, turma, dia_semana, hora_inicio, hora_fim, disciplina
+        FROM horarios
+        WHERE rowid IN (SELECT MIN(rowid) FROM horarios WHERE id IS NOT NULL GROUP BY id)
+        ORDER BY rowid""")
+    reatribuidos = conn.execute("""
+        SELECT turma, dia_semana, hora_inicio, hora_fim, disciplina
+        FROM horarios
+        WHERE rowid NOT IN (SELECT MIN(rowid) FROM horarios WHERE id IS NOT NULL GROUP BY id)
+        ORDER BY rowid""").fetchall()
+    if reatribuidos:
+        proximo_id = conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM horarios_nova").fetchone()[0]
+        conn.executemany(
+            "INSERT INTO horarios_nova (id, turma, dia_semana, hora_inicio, hora_fim, disciplina) VALUES (?, ?, ?, ?, ?, ?)",
+            [(proximo_id + deslocamento, *horario) for deslocamento, horario in enumerate(reatribuidos)])
+        logger(f"AVISO: {len(reatribuidos)} horário(s) com ID nulo ou repetido receberam um novo ID.")
+    conn.execute("DROP TABLE horarios")
+    conn.execute("ALTER TABLE horarios_nova RENAME TO horarios")
+    conn.execute("CREATE INDEX idx_horarios_turma_dia_inicio ON horarios (turma, dia_semana, hora_inicio)")
+
+
+def _migracao_002_resultados_diarios(conn, logger):
+    """
+    Cria as tabelas com os resultados de cada dia processado (faltas por disciplina e ocorrências).
+    """
+    conn.execute("""
+        CREATE TABLE faltas (
+            data TEXT NOT NULL,
+            matricula TEXT NOT NULL,
+            nome TEXT NOT NULL,
+            turma TEXT NOT NULL,
+            disciplina TEXT NOT NULL,
+            total_faltas INTEGER NOT NULL,
+            PRIMARY KEY (data, matricula, nome, turma, disciplina)
+        )""")
+    conn.execute("""
+        CREATE TABLE ocorrencias (
+            id INTEGER PRIMARY KEY,
+            data TEXT NOT NULL,
+            matricula TEXT NOT NULL,
+            nome TEXT,
+            turma TEXT,
+            problema TEXT NOT NULL,
+            acesso TEXT
+        )""")
+    conn.execute("CREATE INDEX idx_ocorrencias_data ON ocorrencias (data)")
+
+
+def _migracao_003_versao_cadastro(conn, logger):
+    """
+    Cria o contador de versão do cadastro, incrementado por gatilhos a cada
+    alteração em 'alunos' ou 'horarios' (inclusive por outros processos).
+    """
+    conn.execute("""
+        CREATE TABLE versao_cadastro (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            versao INTEGER NOT NULL
+        )""")
+    conn.execute("INSERT INTO versao_cadastro (id, versao) VALUES (1, 0)")
+    for tabela in ('alunos', 'horarios'):
+        for operacao in ('INSERT', 'UPDATE', 'DELETE'):
+            conn.execute(f"""
+                CREATE TRIGGER trg_{tabela}_{operacao.lower()}_versao AFTER {operacao} ON {tabela}
+                BEGIN
+                    UPDATE versao_cadastro SET versao = versao + 1 WHERE id = 1;
+                END""")
+
+
+def _migracao_004_dias_processados(conn, logger):
+    """
+    Cria o registro dos dias já processados, inclusive os sem nenhuma falta.
+    """
+    conn.execute("CREATE TABLE dias_processados (data TEXT NOT NULL PRIMARY KEY)")
+    conn.execute("""
+        INSERT INTO dias_processados (data)
+        SELECT data FROM faltas UNION SELECT data FROM ocorrencias""")
+
+
+MIGRACOES = [
+    _migracao_001_chaves_e_indices,
+    _migracao_002_resultados_diarios,
+    _migracao_003_versao_cadastro,
+    _migracao_004_dias_processados,
+]
+
+
+def obter_versao_schema():
+    """
+    Retorna a versão atual do schema (PRAGMA user_version).
+    """
+    return repositorio.consultar_um("PRAGMA user_version")[0]
+
+
+def aplicar_migracoes(logger=print):
+    """
+    Aplica, em ordem, as migrações ainda não aplicadas ao banco, cada uma em
+    sua própria transação. Retorna a versão final do schema, ou None em caso de erro.
+    """
+    try:
+        versao_inicial = obter_versao_schema()
+        versao = versao_inicial
+        for numero, migracao in enumerate(MIGRACOES, start=1):
+            if numero <= versao:
+                continue
+            logger(f"Aplicando migração {numero} do banco de dados...")
+            with repositorio.obter_pool().escrita() as conn:
+                conn.execute("BEGIN")
+                migracao(conn, logger)
+                conn.execute(f"PRAGMA user_version = {numero}")
+            versao = numero
+        if versao != versao_inicial:
+            logger(f"Banco de dados atualizado para a versão {versao}.")
+        return versao
+    except sqlite3.Error as e:
+        logger(f"ERRO ao migrar o banco de dados: {e}")
+        return None
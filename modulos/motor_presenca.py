@@ -0,0 +1,67 @@
+import numpy as np
+from datetime import time
+
+
+def segundos_do_dia(hora):
+    """
+    Converte um objeto time (ou datetime) em segundos desde a meia-noite.
+    """
+    return hora.hour * 3600 + hora.minute * 60 + hora.second
+
+
+def hora_do_dia(segundos):
+    """
+    Converte segundos desde a meia-noite de volta em um objeto time.
+    """
+    segundos = int(segundos)
+    return time(segundos // 3600, segundos // 60 % 60, segundos % 60)
+
+
+def parear_intervalos(segundos, eh_entrada):
+    """
+    Pareia cada Entrada com a primeira Saída estritamente posterior.
+
+    Retorna dois arrays (inícios, fins) em segundos desde a meia-noite; quando
+    não há saída posterior, o fim do intervalo é infinito (aluno ainda na escola).
+    """
+    segundos = np.asarray(segundos, dtype=np.float64)
+    eh_entrada = np.asarray(eh_entrada, dtype=bool)
+    inicios = segundos[eh_entrada]
+    saidas = np.sort(segundos[~eh_entrada])
+    proxima = np.searchsorted(saidas, inicios, side='right')
+    fins = np.full(len(inicios), np.inf)
+    tem_saida = proxima < len(saidas)
+    fins[tem_saida] = saidas[proxima[tem_saida]]
+    return inicios, fins
+
+
+def calcular_presenca_turma(inicios_aulas, fins_aulas, intervalos_por_aluno):
+    """
+    Calcula a matriz de presença (aulas x alunos) de uma turma inteira.
+
+    Um aluno está presente numa aula se algum intervalo seu começa até o fim
+    da aula e termina a partir do início dela (mesma regra do laço original).
+    'intervalos_por_aluno' é uma lista de pares (inícios, fins), um por aluno.
+    """
+    inicios_aulas = np.asarray(inicios_aulas, dtype=np.float64)
+    fins_aulas = np.asarray(fins_aulas, dtype=np.float64)
+    n_alunos = len(intervalos_por_aluno)
+    if n_alunos == 0:
+        return np.zeros((len(inicios_aulas), 0), dtype=bool)
+
+    tamanhos = np.array([len(inicios) for inicios, _ in intervalos_por_aluno])
+    presenca = np.zeros((len(inicios_aulas), n_alunos), dtype=bool)
+    # Alunos sem nenhum intervalo ficam ausentes em todas as aulas
+    com_intervalos = np.flatnonzero(tamanhos > 0)
+    if len(com_intervalos) == 0 or len(inicios_aulas) == 0:
+        return presenca
+    inicios = np.concatenate([intervalos_por_aluno[aluno][0] for aluno in com_intervalos])
+    fins = np.concatenate([intervalos_por_aluno[aluno][1] for aluno in com_intervalos])
+
+    # Matriz de sobreposição aula x intervalo, calculada de uma só vez.
+    sobreposicao = (inicios[None, :] <= fins_aulas[:, None]) & (fins[None, :] >= inicios_aulas[:, None])
+
+    # Os intervalos de cada aluno são contíguos: um OR por faixa de colunas.
+    offsets = np.r_[0, np.cumsum(tamanhos[com_intervalos])[:-1]]
+    presenca[:, com_intervalos] = np.logical_or.reduceat(sobreposicao, offsets, axis=1)
+    return presenca
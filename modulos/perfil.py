@@ -0,0 +1,257 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+# Adiciona o diretório raiz ao path para encontrar o 'config'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+# Medição do tempo e da memória de cada etapa do processamento (extração dos
+# PDFs, busca dos alunos, apuração, relatórios). Cada etapa é envolvida por
+# 'etapa(nome)' (bloco with) ou 'medir(nome)' (decorador); as medições de
+# uma etapa que roda várias vezes são somadas sob o mesmo nome. Etapas
+# internas usam o nome da externa como prefixo ('apurar_dia/frequencia'),
+# e o tempo de uma etapa inclui o das etapas internas.
+#
+# Com config.PERFIL_ATIVO desligado, cada etapa custa só uma chamada de
+# função e um teste. Com config.PERFIL_MEMORIA, o pico de memória de cada
+# etapa vem do tracemalloc, que deixa o processamento bem mais lento: para
+# comparar tempos, desligue a memória.
+
+_registros = {}
+_lock = threading.Lock()
+_local = threading.local()
+_tracemalloc_da_sessao = False
+
+
+class _EtapaInativa:
+    """
+    Bloco vazio usado quando a medição está desligada.
+    """
+    linhas = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        return False
+
+    def __setattr__(self, nome, valor):
+        pass  # 'etapa.linhas = n' não tem efeito
+
+
+_INATIVA = _EtapaInativa()
+
+
+def _pilha():
+    pilha = getattr(_local, 'pilha', None)
+    if pilha is None:
+        pilha = _local.pilha = []
+    return pilha
+
+
+def _registrar(nome, tempo, cpu, linhas, pico):
+    with _lock:
+        registro = _registros.setdefault(nome, {'etapa': nome, 'chamadas': 0, 'tempo_s': 0.0,
+                                                'cpu_s': 0.0, 'linhas': None, 'pico_memoria_mb': None})
+        registro['chamadas'] += 1
+        registro['tempo_s'] += tempo
+        registro['cpu_s'] += cpu
+        if linhas is not None:
+            registro['linhas'] = (registro['linhas'] or 0) + int(linhas)
+        if pico is not None:
+            registro['pico_memoria_mb'] = max(registro['pico_memoria_mb'] or 0.0, pico / (1024 * 1024))
+
+
+class _Medicao:
+    """
+    Mede uma execução da etapa: tempo decorrido, tempo de CPU, linhas
+    (atribuídas pelo código medido em 'linhas') e pico de memória.
+    """
+
+    def __init__(self, nome):
+        self.nome = nome
+        self.linhas = None
+
+    def __enter__(self):
+        self._memoria_inicial = None
+        self._iniciou_tracemalloc = False
+        self._pico_anterior = 0
+        if config.PERFIL_MEMORIA:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._iniciou_tracemalloc = True
+            atual, pico = tracemalloc.get_traced_memory()
+            pilha = _pilha()
+            if pilha:
+                # O pico da etapa externa até aqui seria perdido no reset_peak
+                pilha[-1]._pico_anterior = max(pilha[-1]._pico_anterior, pico)
+            tracemalloc.reset_peak()
+            self._memoria_inicial = atual
+        _pilha().append(self)
+        self._inicio = time.perf_counter()
+        self._inicio_cpu = time.process_time()
+        return self
+
+    def __exit__(self, *excecao):
+        tempo = time.perf_counter() - self._inicio
+        cpu = time.process_time() - self._inicio_cpu
+        _pilha().pop()
+        pico = None
+        if self._memoria_inicial is not None and tracemalloc.is_tracing():
+            pico_absoluto = max(tracemalloc.get_traced_memory()[1], self._pico_anterior)
+            pico = max(pico_absoluto - self._memoria_inicial, 0)
+            if self._iniciou_tracemalloc:
+                tracemalloc.stop()
+        _registrar(self.nome, tempo, cpu, self.linhas, pico)
+        return False
+
+
+def etapa(nome):
+    """
+    Bloco 'with' que mede a etapa. Atribua 'linhas' ao objeto retornado para
+    registrar quantas linhas/registros a etapa produziu.
+    """
+    if not config.PERFIL_ATIVO:
+        return _INATIVA
+    return _Medicao(nome)
+
+
+def medir(nome, linhas=None):
+    """
+    Decorador que mede cada chamada da função como a etapa 'nome'.
+    'linhas', se informado, recebe o resultado e retorna a contagem de linhas.
+    """
+    def decorador(funcao):
+        @functools.wraps(funcao)
+        def funcao_medida(*args, **kwargs):
+            if not config.PERFIL_ATIVO:
+                return funcao(*args, **kwargs)
+            with _Medicao(nome) as medicao:
+                resultado = funcao(*args, **kwargs)
+                if linhas is not None:
+                    medicao.linhas = linhas(resultado)
+            return resultado
+        return funcao_medida
+    return decorador
+
+
+def linhas_do_dataframe(resultado):
+    """
+    Contagem de linhas para extratores que retornam (DataFrame ou None, data).
+    """
+    df = resultado[0] if resultado else None
+    return len(df) if df is not None else 0
+
+
+def iniciar_sessao():
+    """
+    Descarta as medições anteriores e, com a memória ligada, inicia o
+    tracemalloc para toda a sessão.
+    """
+    global _tracemalloc_da_sessao
+    with _lock:
+        _registros.clear()
+    if config.PERFIL_ATIVO and config.PERFIL_MEMORIA and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _tracemalloc_da_sessao = True
+
+
+def encerrar_sessao():
+    """
+    Para o tracemalloc iniciado pela sessão e retorna as medições, na ordem
+    em que cada etapa apareceu pela primeira vez.
+    """
+    global _tracemalloc_da_sessao
+    if _tracemalloc_da_sessao:
+        tracemalloc.stop()
+        _tracemalloc_da_sessao = False
+    with _lock:
+        return [dict(registro) for registro in _registros.values()]
+
+
+def incorporar(registros):
+    """
+    Soma às medições atuais as medições feitas em outro processo.
+    """
+    with _lock:
+        for registro in registros:
+            atual = _registros.setdefault(registro['etapa'], dict(registro, chamadas=0, tempo_s=0.0, cpu_s=0.0,
+                                                                   linhas=None, pico_memoria_mb=None))
+            atual['chamadas'] += registro['chamadas']
+            atual['tempo_s'] += registro['tempo_s']
+            atual['cpu_s'] += registro['cpu_s']
+            if registro['linhas'] is not None:
+                atual['linhas'] = (atual['linhas'] or 0) + registro['linhas']
+            if registro['pico_memoria_mb'] is not None:
+                atual['pico_memoria_mb'] = max(atual['pico_memoria_mb'] or 0.0, registro['pico_memoria_mb'])
+
+
+def executar_medindo(funcao, memoria, *args):
+    """
+    Executada em um processo do pool: roda funcao(*args) com a medição ligada
+    e retorna (resultado, medições) para o processo principal incorporar.
+    """
+    config.PERFIL_ATIVO, config.PERFIL_MEMORIA = True, memoria
+    iniciar_sessao()
+    try:
+        resultado = funcao(*args)
+    finally:
+        registros = encerrar_sessao()
+        config.PERFIL_ATIVO = False
+    return resultado, registros
+
+
+def linhas_resumo(registros):
+    """
+    Tabela de texto com uma linha por etapa, para o console.
+    """
+    largura = max([len(registro['etapa']) for registro in registros] + [5])
+    linhas = [f"{'Etapa':<{largura}}  {'Vezes':>5}  {'Tempo (s)':>9}  {'CPU (s)':>8}  {'Linhas':>8}  {'Pico (MB)':>9}"]
+    for registro in registros:
+        qtd = f"{registro['linhas']:>8d}" if registro['linhas'] is not None else f"{'-':>8}"
+        pico = f"{registro['pico_memoria_mb']:>9.2f}" if registro['pico_memoria_mb'] is not None else f"{'-':>9}"
+        linhas.append(f"{registro['etapa']:<{largura}}  {registro['chamadas']:>5d}  {registro['tempo_s']:>9.3f}"
+                      f"  {registro['cpu_s']:>8.3f}  {qtd}  {pico}")
+    return linhas
+
+
+def gravar_json(registros, pasta=None):
+    """
+    Grava as medições em perfil_AAAAMMDD_HHMMSS.json na pasta dos relatórios.
+    """
+    pasta = pasta or config.REPORTS_DIR
+    os.makedirs(pasta, exist_ok=True)
+    agora = datetime.now()
+    caminho = os.path.join(pasta, f"perfil_{agora.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump({'data': agora.isoformat(timespec='seconds'), 'memoria': config.PERFIL_MEMORIA,
+                   'etapas': registros}, arquivo, ensure_ascii=False, indent=2)
+    return caminho
+
+
+def relatar(logger, pasta=None):
+    """
+    Encerra a sessão de medição, mostra a tabela no logger e grava o JSON.
+    Não faz nada com a medição desligada ou sem etapas medidas.
+    """
+    if not config.PERFIL_ATIVO:
+        return None
+    registros = encerrar_sessao()
+    if not registros:
+        return None
+    logger("\n--- Desempenho por etapa ---")
+    for linha in linhas_resumo(registros):
+        logger(linha)
+    try:
+        caminho = gravar_json(registros, pasta)
+        logger(f"Medições salvas em: {caminho}")
+        return caminho
+    except OSError as e:
+        logger(f"AVISO: Não foi possível salvar as medições: {e}")
+        return None
@@ -1,11 +1,13 @@
+import numpy as np
 import pandas as pd
 import os
-import re
 from datetime import datetime
 import locale
-import sqlite3
-import fitz
 import sys
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 # Adiciona o diretório raiz ao path para encontrar o 'config'
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -13,49 +15,94 @@ import config
 
 from .extrator_ausentes import extrair_dados_ausentes
 from .extrator_frequencias import extrair_dados_frequencia
+from . import repositorio
+from . import perfil
+from . import cache_apuracao
+from .indice_alunos import StudentIndex
+from .motor_presenca import parear_intervalos, calcular_presenca_turma, hora_do_dia
+from .grade_horarios import obter_grade, minutos_do_dia
 
-try:
-    locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
-except locale.Error:
-    print("Aviso: Locale pt_BR.UTF-8 não encontrado.")
-
-def buscar_aluno(df_alunos, matricula_pdf=None, nome_pdf=None, logger=print):
-    # ... (código inalterado) ...
-    if matricula_pdf:
-        resultado = df_alunos[df_alunos['matricula'] == str(matricula_pdf)]
-        if not resultado.empty: return resultado.iloc[0]
-    if nome_pdf:
-        nome_pdf_normalizado = ' '.join(nome_pdf.strip().upper().split())
-        resultado = df_alunos[df_alunos['nome'].str.strip().str.upper() == nome_pdf_normalizado]
-        if not resultado.empty: return resultado.iloc[0]
-        palavras_pdf = nome_pdf_normalizado.split()
-        if len(palavras_pdf) < 2: return None
-        correspondencias_parciais = []
-        for index, row in df_alunos.iterrows():
-            nome_db_normalizado = ' '.join(row['nome'].strip().upper().split())
-            palavras_db = nome_db_normalizado.split()
-            if len(palavras_pdf) > len(palavras_db): continue
-            match = True
-            for i in range(len(palavras_pdf)):
-                palavra_pdf, palavra_db = palavras_pdf[i], palavras_db[i]
-                if i == len(palavras_pdf) - 1:
-                    if not palavra_db.startswith(palavra_pdf): match = False; break
-                else:
-                    if palavra_pdf != palavra_db: match = False; break
-            if match: correspondencias_parciais.append(row)
-        if len(correspondencias_parciais) == 1:
-            return correspondencias_parciais[0]
-        elif len(correspondencias_parciais) > 1:
-            logger(f"  AVISO: Múltiplos alunos para '{nome_pdf}'.")
-    return None
+# Tabelas base já carregadas e índice de alunos, compartilhados (somente
+# leitura) entre os dias de um período; ver carregar_contexto_base.
+ContextoBase = namedtuple('ContextoBase', ['df_alunos', 'df_horarios', 'indice_alunos'])
 
+_locale_configurado = False
+
+# Pool de processos das extrações de PDF, criado no primeiro uso e reaproveitado
+# entre os dias. Processos, e não threads: o PyMuPDF não pode ser usado por
+# várias threads ao mesmo tempo.
+_executor_extracao = None
+_lock_executor = threading.Lock()
+
+
+def _obter_executor_extracao():
+    global _executor_extracao
+    with _lock_executor:
+        if _executor_extracao is None:
+            _executor_extracao = ProcessPoolExecutor(max_workers=2)
+        return _executor_extracao
+
+
+def _descartar_executor_extracao():
+    global _executor_extracao
+    with _lock_executor:
+        if _executor_extracao is not None:
+            _executor_extracao.shutdown(wait=False, cancel_futures=True)
+            _executor_extracao = None
+
+
+def _submeter_extracao(executor, extrair, caminho_pdf):
+    """
+    Envia a extração ao pool. Com a medição ligada, as etapas medidas no
+    outro processo voltam junto com o resultado (ver _resultado_extracao).
+    """
+    if config.PERFIL_ATIVO:
+        futuro = executor.submit(perfil.executar_medindo, extrair, config.PERFIL_MEMORIA, caminho_pdf)
+    else:
+        futuro = executor.submit(extrair, caminho_pdf)
+    futuro.medido = config.PERFIL_ATIVO
+    return futuro
+
+
+def _resultado_extracao(futuro):
+    resultado = futuro.result()
+    if futuro.medido:
+        resultado, registros = resultado
+        perfil.incorporar(registros)
+    return resultado
+
+
+def configurar_locale():
+    """
+    Configura o locale pt_BR uma única vez, no primeiro processamento
+    (e não na importação do módulo, para não atrasar a abertura da janela).
+    """
+    global _locale_configurado
+    if _locale_configurado:
+        return
+    _locale_configurado = True
+    try:
+        locale.setlocale(locale.LC_TIME, 'pt_BR.UTF-8')
+    except locale.Error:
+        print("Aviso: Locale pt_BR.UTF-8 não encontrado.")
+
+@perfil.medir('buscar_aluno')
+def buscar_aluno(alunos, matricula_pdf=None, nome_pdf=None, logger=print):
+    """
+    Busca um aluno pela matrícula, pelo nome exato, por prefixo do nome ou,
+    por último, pelo nome mais parecido (sem acentos, por trigramas).
+    Aceita um StudentIndex já construído (recomendado) ou o DataFrame de alunos.
+    """
+    if not isinstance(alunos, StudentIndex):
+        alunos = StudentIndex(alunos)
+    return alunos.buscar(matricula_pdf=matricula_pdf, nome_pdf=nome_pdf, logger=logger)
+
+@perfil.medir('carregar_dados_base', linhas=perfil.linhas_do_dataframe)
 def carregar_dados_base(logger):
     logger("Conectando ao banco de dados unificado...")
     try:
-        conn = sqlite3.connect(config.DB_PATH)
-        df_alunos = pd.read_sql_query("SELECT * FROM alunos", conn)
-        df_horarios = pd.read_sql_query("SELECT * FROM horarios", conn)
-        conn.close()
+        df_alunos = repositorio.ler_dataframe("SELECT * FROM alunos")
+        df_horarios = repositorio.ler_dataframe("SELECT * FROM horarios")
         df_alunos['matricula'] = df_alunos['matricula'].astype(str)
         df_horarios['hora_inicio'] = pd.to_datetime(df_horarios['hora_inicio'], format='%H:%M').dt.time
         df_horarios['hora_fim'] = pd.to_datetime(df_horarios['hora_fim'], format='%H:%M').dt.time
@@ -65,184 +112,432 @@ def carregar_dados_base(logger):
         logger(f"ERRO ao carregar banco de dados: {e}")
         return None, None
 
-def processar_dados_diarios(ausentes_path, frequencia_path, logger, 
-                            filtro_ativo=False, hora_inicio="00:00", hora_fim="23:59"):
-    from modulos.extrator_ausentes import extrair_dados_ausentes
-    from modulos.extrator_frequencias import extrair_dados_frequencia
-    from datetime import time
+def carregar_contexto_base(logger):
+    """
+    Carrega as tabelas base e monta o índice de alunos uma única vez, para
+    vários dias (ver processar_periodo). O contexto é só de leitura.
+    Retorna None se o banco não puder ser lido.
+    """
+    df_alunos, df_horarios = carregar_dados_base(logger)
+    if df_alunos is None or df_horarios is None:
+        return None
+    return ContextoBase(df_alunos, df_horarios, StudentIndex(df_alunos))
 
-    # Validação dos horários de entrada
+
+def _filtro_em_minutos(filtro_ativo, hora_inicio, hora_fim, logger):
+    """
+    Valida o filtro de horário. Retorna (válido, filtro), com o filtro como o
+    par (início, fim) em minutos desde a meia-noite, ou None se desativado.
+    """
+    if not filtro_ativo:
+        return True, None
     try:
-        if filtro_ativo:
-            hora_inicio_obj = datetime.strptime(hora_inicio, '%H:%M').time()
-            hora_fim_obj = datetime.strptime(hora_fim, '%H:%M').time()
-            logger(f"Filtro de horário ativado: das {hora_inicio} às {hora_fim}.")
+        hora_inicio_obj = datetime.strptime(hora_inicio, '%H:%M').time()
+        hora_fim_obj = datetime.strptime(hora_fim, '%H:%M').time()
     except ValueError:
         logger("ERRO: Formato de hora inválido no filtro. Use HH:MM. Processamento abortado.")
+        return False, None
+    logger(f"Filtro de horário ativado: das {hora_inicio} às {hora_fim}.")
+    return True, (minutos_do_dia(hora_inicio_obj), minutos_do_dia(hora_fim_obj))
+
+
+def _iniciar_extracao(ausentes_path, frequencia_path, concorrente, logger):
+    """
+    Envia as duas extrações do dia ao pool de processos. Retorna os futuros,
+    ou None se a extração for em sequência (ver _concluir_extracao).
+    """
+    if not concorrente:
+        return None
+    try:
+        executor = _obter_executor_extracao()
+        return (_submeter_extracao(executor, extrair_dados_ausentes, ausentes_path),
+                _submeter_extracao(executor, extrair_dados_frequencia, frequencia_path))
+    except (BrokenProcessPool, RuntimeError, OSError) as e:
+        logger(f"AVISO: Extração concorrente indisponível ({e}); extraindo em sequência.")
+        _descartar_executor_extracao()
+        return None
+
+
+def _concluir_extracao(futuros, ausentes_path, frequencia_path, logger):
+    """
+    Retorna (resultado_ausentes, resultado_frequencia), esperando os futuros de
+    _iniciar_extracao ou extraindo em sequência se não houver pool.
+    """
+    if futuros is not None:
+        try:
+            with perfil.etapa('processar_dados_diarios/aguardar_extracao'):
+                return _resultado_extracao(futuros[0]), _resultado_extracao(futuros[1])
+        except BrokenProcessPool as e:
+            logger(f"AVISO: Falha no processo de extração ({e}); extraindo em sequência.")
+            _descartar_executor_extracao()
+    return extrair_dados_ausentes(ausentes_path), extrair_dados_frequencia(frequencia_path)
+
+
+@perfil.medir('processar_dados_diarios')
+def processar_dados_diarios(ausentes_path, frequencia_path, logger, 
+                            filtro_ativo=False, hora_inicio="00:00", hora_fim="23:59",
+                            dados_base=None, concorrente=None):
+    """
+    Processa o par de PDFs de um dia. 'dados_base' permite reaproveitar um par
+    (df_alunos, df_horarios) já carregado por 'carregar_dados_base'.
+    Com 'concorrente' (padrão: config.PROCESSAMENTO_CONCORRENTE_ATIVO), os dois
+    PDFs são extraídos em processos separados enquanto o banco é carregado.
+
+    A parte da apuração que não depende do filtro de horário fica guardada
+    (ver modulos/cache_apuracao.py): processar de novo o mesmo par de PDFs,
+    mudando só o filtro, refaz apenas a seleção das aulas e a contagem das faltas.
+    """
+    configurar_locale()
+
+    # Validação dos horários de entrada
+    valido, filtro = _filtro_em_minutos(filtro_ativo, hora_inicio, hora_fim, logger)
+    if not valido:
         return None, None, None
 
-    df_alunos, df_horarios = carregar_dados_base(logger)
+    # Com tabelas base do chamador, o resultado não depende só do banco: sem cache
+    chave = cache_apuracao.chave_do_dia(ausentes_path, frequencia_path) if dados_base is None else None
+    apuracao = cache_apuracao.obter_apuracao(chave)
+    if apuracao is not None:
+        logger("PDFs já apurados nesta sessão: reaplicando apenas o filtro de horário.")
+        return reaplicar_filtro(apuracao, filtro, logger)
+
+    if concorrente is None:
+        concorrente = config.PROCESSAMENTO_CONCORRENTE_ATIVO
+
+    # As duas extrações são independentes até a verificação das datas. As
+    # mensagens do logger continuam na mesma ordem: os extratores não usam o
+    # logger e o banco é carregado aqui, na thread que chamou a função.
+    futuros = _iniciar_extracao(ausentes_path, frequencia_path, concorrente, logger)
+
+    df_alunos, df_horarios = dados_base if dados_base is not None else carregar_dados_base(logger)
+
+    resultado_ausentes, resultado_frequencia = _concluir_extracao(futuros, ausentes_path, frequencia_path, logger)
+
     if df_alunos is None or df_horarios is None:
         return None, None, None
+    with perfil.etapa('apurar_dia'):
+        apuracao = preparar_apuracao(resultado_ausentes, resultado_frequencia, df_alunos, df_horarios)
+        if apuracao.report_date is not None:
+            cache_apuracao.guardar_apuracao(chave, apuracao)
+        return reaplicar_filtro(apuracao, filtro, logger)
 
-    faltas_registradas = {}
-    problemas_alunos = []
+
+@perfil.medir('processar_periodo')
+def processar_periodo(pares, logger, filtro_ativo=False, hora_inicio="00:00", hora_fim="23:59",
+                      contexto=None, concorrente=None):
+    """
+    Processa vários dias contra um mesmo contexto base (tabelas de alunos e
+    horários e índice de alunos), carregado uma única vez em vez de uma vez
+    por dia. 'pares' é uma lista de (caminho_ausentes, caminho_frequencia), ou
+    as triplas (sufixo, ausentes, frequência) de lote.encontrar_pares.
+    'contexto' permite reaproveitar um ContextoBase de carregar_contexto_base.
+
+    Com 'concorrente', os PDFs do dia seguinte são extraídos no pool de
+    processos enquanto o dia atual é apurado.
+    Retorna o dicionário da sessão (nome da aba -> (report_date,
+    faltas_registradas, df_problemas)), na ordem dos pares; dias com falha
+    ficam de fora.
+    """
+    dados_da_sessao = {}
+    if not pares:
+        return dados_da_sessao
+    configurar_locale()
+    valido, filtro = _filtro_em_minutos(filtro_ativo, hora_inicio, hora_fim, logger)
+    if not valido:
+        return dados_da_sessao
+    if concorrente is None:
+        concorrente = config.PROCESSAMENTO_CONCORRENTE_ATIVO
+
+    caminhos = [tuple(par[-2:]) for par in pares]
+    futuros = _iniciar_extracao(*caminhos[0], concorrente, logger)
+    if contexto is None:
+        contexto = carregar_contexto_base(logger)
+        if contexto is None:
+            return dados_da_sessao
+
+    for posicao, (ausentes_path, frequencia_path) in enumerate(caminhos):
+        logger(f"\n=== Dia {posicao + 1} de {len(caminhos)}: {os.path.basename(ausentes_path)} ===")
+        resultado_ausentes, resultado_frequencia = _concluir_extracao(futuros, ausentes_path, frequencia_path, logger)
+        futuros = None
+        if posicao + 1 < len(caminhos):
+            futuros = _iniciar_extracao(*caminhos[posicao + 1], concorrente, logger)
+
+        dados_do_dia = apurar_dia(resultado_ausentes, resultado_frequencia, contexto.df_alunos,
+                                  contexto.df_horarios, filtro, logger, contexto.indice_alunos)
+        if dados_do_dia[0] is not None:
+            dados_da_sessao[dados_do_dia[0].strftime('%d-%m-%Y')] = dados_do_dia
+        else:
+            logger(f"--- FALHA NO PROCESSAMENTO DE {os.path.basename(ausentes_path)} ---")
+    return dados_da_sessao
+
+
+# Resultado da apuração que não depende do filtro de horário: os alunos
+# encontrados, seus acessos e a presença em todas as aulas do dia. 'eventos'
+# guarda, na ordem original, as mensagens do logger e os alunos ausentes
+# ('ausente', ...) e com acessos ('frequencia', ...); 'presenca_por_turma'
+# tem, por turma, todas as aulas do dia e a matriz aula x aluno.
+# 'report_date' é None quando a apuração falhou (as mensagens dizem o motivo).
+ApuracaoDia = namedtuple('ApuracaoDia', ['report_date', 'eventos', 'presenca_por_turma'])
+
+
+@perfil.medir('apurar_dia')
+def apurar_dia(resultado_ausentes, resultado_frequencia, df_alunos, df_horarios, filtro, logger,
+               indice_alunos=None):
+    """
+    Apura as faltas e as ocorrências do dia a partir dos resultados já extraídos
+    dos dois PDFs ((df, data) de cada extrator) e das tabelas base. 'filtro' é
+    o par (início, fim) em minutos desde a meia-noite, ou None. 'indice_alunos'
+    permite reaproveitar um StudentIndex de df_alunos entre vários dias.
+    Retorna (report_date, faltas_registradas, df_problemas).
+    """
+    apuracao = preparar_apuracao(resultado_ausentes, resultado_frequencia, df_alunos, df_horarios, indice_alunos)
+    return reaplicar_filtro(apuracao, filtro, logger)
+
+
+def preparar_apuracao(resultado_ausentes, resultado_frequencia, df_alunos, df_horarios, indice_alunos=None):
+    """
+    Parte da apuração que não depende do filtro de horário: busca dos alunos,
+    pareamento dos acessos e presença em todas as aulas do dia (sem filtro).
+    As mensagens não vão para o logger: ficam em 'eventos' e são repetidas,
+    na mesma ordem, por 'reaplicar_filtro'. Retorna um ApuracaoDia.
+    """
+    eventos = []
+    registrar = lambda mensagem: eventos.append(('log', mensagem))
+
+    if indice_alunos is None:
+        with perfil.etapa('apurar_dia/indice_alunos') as etapa:
+            indice_alunos = StudentIndex(df_alunos)
+            etapa.linhas = len(df_alunos)
+    with perfil.etapa('apurar_dia/grade') as etapa:
+        grade = obter_grade(df_horarios)
+        etapa.linhas = len(df_horarios)
 
     # --- Processa Ausentes ---
-    logger("\n--- Processando Relatório de Ausentes ---")
-    df_ausentes, report_date = extrair_dados_ausentes(ausentes_path)
+    registrar("\n--- Processando Relatório de Ausentes ---")
+    df_ausentes, report_date = resultado_ausentes
     
     if report_date is None:
-        logger("ERRO: A data não foi encontrada no PDF de ausentes.")
-        return None, None, None
+        registrar("ERRO: A data não foi encontrada no PDF de ausentes.")
+        return ApuracaoDia(None, eventos, {})
         
     dia_numero = report_date.weekday()
     dias_semana_map = {0: 'SEGUNDA-FEIRA', 1: 'TERÇA-FEIRA', 2: 'QUARTA-FEIRA', 
                        3: 'QUINTA-FEIRA', 4: 'SEXTA-FEIRA', 5: 'SÁBADO', 6: 'DOMINGO'}
     dia_semana = dias_semana_map.get(dia_numero)
     
-    logger(f"Data do relatório: {report_date.strftime('%d/%m/%Y')} ({dia_semana})")
+    registrar(f"Data do relatório: {report_date.strftime('%d/%m/%Y')} ({dia_semana})")
+
+    # Todas as aulas do dia de cada turma citada; o filtro escolhe um subconjunto delas
+    aulas_por_turma = {}
     
-    if df_ausentes is not None and not df_ausentes.empty:
-        logger(f"Total de alunos ausentes encontrados: {len(df_ausentes)}")
-        for _, row in df_ausentes.iterrows():
-            info_aluno = buscar_aluno(df_alunos, matricula_pdf=row['Matrícula'], nome_pdf=row['Nome'], logger=logger)
-            if info_aluno is not None:
-                turma, nome_db, matricula_db = info_aluno['turma'], info_aluno['nome'], info_aluno['matricula']
-                problemas_alunos.append({
-                    'Matricula': matricula_db, 
-                    'Nome do Aluno': nome_db, 
-                    'Turma': turma, 
-                    'Problema': 'FALTOU', 
-                    'Acesso': 'Sem registro'
-                })
-                
-                aulas_do_dia_bruto = df_horarios[(df_horarios['turma'] == turma) & (df_horarios['dia_semana'] == dia_semana)]
-                
-                # Aplicação do filtro
-                aulas_do_dia = aulas_do_dia_bruto
-                if filtro_ativo:
-                    aulas_do_dia = aulas_do_dia_bruto[
-                        (aulas_do_dia_bruto['hora_inicio'] >= hora_inicio_obj) & 
-                        (aulas_do_dia_bruto['hora_inicio'] < hora_fim_obj)
-                    ]
-                
-                for _, aula in aulas_do_dia.iterrows():
-                    chave_falta = (matricula_db, nome_db, turma, aula['disciplina'])
-                    faltas_registradas[chave_falta] = faltas_registradas.get(chave_falta, 0) + 1
+    with perfil.etapa('apurar_dia/ausentes') as etapa:
+        if df_ausentes is not None and not df_ausentes.empty:
+            registrar(f"Total de alunos ausentes encontrados: {len(df_ausentes)}")
+            etapa.linhas = len(df_ausentes)
+            for _, row in df_ausentes.iterrows():
+                info_aluno = buscar_aluno(indice_alunos, matricula_pdf=row['Matrícula'], nome_pdf=row['Nome'], logger=registrar)
+                if info_aluno is not None:
+                    turma = info_aluno['turma']
+                    aulas_por_turma.setdefault(turma, grade.aulas(turma, dia_semana))
+                    eventos.append(('ausente', info_aluno['matricula'], info_aluno['nome'], turma))
 
     # --- Processa Frequência ---
-    logger("\n--- Processando Relatório de Frequência ---")
-    df_frequencia, date_frequencia = extrair_dados_frequencia(frequencia_path)
+    registrar("\n--- Processando Relatório de Frequência ---")
+    df_frequencia, date_frequencia = resultado_frequencia
     
     if date_frequencia is None:
-        logger("ERRO: A data não foi encontrada no PDF de frequência.")
-        return None, None, None
+        registrar("ERRO: A data não foi encontrada no PDF de frequência.")
+        return ApuracaoDia(None, eventos, {})
         
     if report_date.date() != date_frequencia.date():
-        logger(f"ERRO: As datas dos PDFs não coincidem. Ausentes: {report_date.date()}, Frequência: {date_frequencia.date()}")
-        return None, None, None
+        registrar(f"ERRO: As datas dos PDFs não coincidem. Ausentes: {report_date.date()}, Frequência: {date_frequencia.date()}")
+        return ApuracaoDia(None, eventos, {})
 
+    presenca_por_turma = {}
     if df_frequencia is not None and not df_frequencia.empty:
-        logger(f"Total de registros de frequência encontrados: {len(df_frequencia)}")
-        df_frequencia['Hora'] = pd.to_datetime(df_frequencia['Hora'], format='%H:%M:%S').dt.time
-        
-        for grupo_keys, acesso_aluno_df in df_frequencia.groupby(['Crachá', 'Nome']):
-            info_aluno = buscar_aluno(df_alunos, matricula_pdf=grupo_keys[0], nome_pdf=grupo_keys[1], logger=logger)
-            if info_aluno is not None:
-                turma, nome_db, matricula_db = info_aluno['turma'], info_aluno['nome'], info_aluno['matricula']
-                
-                aulas_do_dia_bruto = df_horarios[(df_horarios['turma'] == turma) & (df_horarios['dia_semana'] == dia_semana)]
-                
-                # Aplicação do filtro
-                aulas_do_dia = aulas_do_dia_bruto
-                if filtro_ativo:
-                    aulas_do_dia = aulas_do_dia_bruto[
-                        (aulas_do_dia_bruto['hora_inicio'] >= hora_inicio_obj) & 
-                        (aulas_do_dia_bruto['hora_inicio'] < hora_fim_obj)
-                    ]
-
-                if aulas_do_dia.empty:
-                    continue
-                
-                # Ordena os acessos por hora
-                acesso_aluno_df = acesso_aluno_df.sort_values('Hora')
-                
-                # Pega primeira aula do dia
-                primeira_aula = aulas_do_dia.iloc[0]
-                hora_inicio_aulas = primeira_aula['hora_inicio']
-                
-                # Pega última aula do dia
-                ultima_aula = aulas_do_dia.iloc[-1]
-                hora_fim_aulas = ultima_aula['hora_fim']
-                
-                # Encontra primeira entrada e última saída
-                entradas = acesso_aluno_df[acesso_aluno_df['Sentido'] == 'Entrada']
-                saidas = acesso_aluno_df[acesso_aluno_df['Sentido'] == 'Saída']
-                
-                primeira_entrada = entradas.iloc[0] if not entradas.empty else None
-                ultima_saida = saidas.iloc[-1] if not saidas.empty else None
-                
-                # Verifica atraso (tolerância de 15 minutos)
-                if primeira_entrada is not None:
-                    hora_entrada = primeira_entrada['Hora']
-                    # Converte time para minutos para facilitar comparação
-                    minutos_entrada = hora_entrada.hour * 60 + hora_entrada.minute
-                    minutos_inicio = hora_inicio_aulas.hour * 60 + hora_inicio_aulas.minute
-                    tolerancia_minutos = 15
+        registrar(f"Total de registros de frequência encontrados: {len(df_frequencia)}")
+
+        with perfil.etapa('apurar_dia/frequencia') as etapa:
+            # A presença por aula é calculada depois, uma matriz por turma
+            # (ver modulos/motor_presenca.py); cada aluno guarda a sua coluna.
+            intervalos_por_turma = {}
+
+            # Agrupa por (Crachá, Nome) com códigos inteiros: os acessos de cada aluno
+            # viram uma fatia contígua dos arrays de segundos/sentido (na ordem do PDF),
+            # sem criar um DataFrame por grupo.
+            codigos = df_frequencia.groupby(['Crachá', 'Nome'], observed=True, sort=True).ngroup().to_numpy()
+            ordem = np.argsort(codigos, kind='stable')
+            segundos_ordenados = df_frequencia['Segundos'].to_numpy()[ordem]
+            entradas_ordenadas = df_frequencia['Entrada'].to_numpy()[ordem]
+            inicios_grupos = np.flatnonzero(np.r_[True, np.diff(codigos[ordem]) != 0])
+            fins_grupos = np.r_[inicios_grupos[1:], len(ordem)]
+            primeiras_linhas = ordem[inicios_grupos]
+            crachas_grupos = df_frequencia['Crachá'].to_numpy()[primeiras_linhas]
+            nomes_grupos = df_frequencia['Nome'].to_numpy()[primeiras_linhas]
+            etapa.linhas = len(inicios_grupos)
+
+            for cracha, nome, inicio_grupo, fim_grupo in zip(crachas_grupos, nomes_grupos, inicios_grupos, fins_grupos):
+                info_aluno = buscar_aluno(indice_alunos, matricula_pdf=cracha, nome_pdf=nome, logger=registrar)
+                if info_aluno is not None:
+                    turma = info_aluno['turma']
                     
-                    if minutos_entrada > (minutos_inicio + tolerancia_minutos):
-                        problemas_alunos.append({
-                            'Matricula': matricula_db,
-                            'Nome do Aluno': nome_db,
-                            'Turma': turma,
-                            'Problema': 'CHEGOU ATRASADO',
-                            'Acesso': f"Entrada: {hora_entrada.strftime('%H:%M:%S')}"
-                        })
-                        logger(f"  - {nome_db} chegou atrasado às {hora_entrada}")
-                
-                # Verifica saída antecipada (tolerância de 15 minutos antes do fim)
-                if ultima_saida is not None:
-                    hora_saida = ultima_saida['Hora']
-                    minutos_saida = hora_saida.hour * 60 + hora_saida.minute
-                    minutos_fim = hora_fim_aulas.hour * 60 + hora_fim_aulas.minute
-                    tolerancia_minutos = 15
+                    # Todas as aulas da turma no dia (o filtro é aplicado depois)
+                    aulas_do_dia = aulas_por_turma.setdefault(turma, grade.aulas(turma, dia_semana))
+
+                    if aulas_do_dia is None:
+                        continue
                     
-                    if minutos_saida < (minutos_fim - tolerancia_minutos):
-                        problemas_alunos.append({
-                            'Matricula': matricula_db,
-                            'Nome do Aluno': nome_db,
-                            'Turma': turma,
-                            'Problema': 'SAIU CEDO',
-                            'Acesso': f"Saída: {hora_saida.strftime('%H:%M:%S')}"
-                        })
-                        logger(f"  - {nome_db} saiu cedo às {hora_saida}")
+                    # Pareia cada Entrada com a próxima Saída
+                    segundos = segundos_ordenados[inicio_grupo:fim_grupo]
+                    eh_entrada = entradas_ordenadas[inicio_grupo:fim_grupo]
+                    inicios_intervalos, fins_intervalos = parear_intervalos(segundos, eh_entrada)
+
+                    # Primeira entrada (para o atraso) e última saída (para a saída antecipada)
+                    segundos_entrada = int(inicios_intervalos.min()) if len(inicios_intervalos) > 0 else None
+                    segundos_saida = int(segundos[~eh_entrada].max()) if not eh_entrada.all() else None
+
+                    alunos_da_turma = intervalos_por_turma.setdefault(turma, [])
+                    eventos.append(('frequencia', info_aluno['matricula'], info_aluno['nome'], turma,
+                                    segundos_entrada, segundos_saida, len(alunos_da_turma)))
+                    alunos_da_turma.append((inicios_intervalos, fins_intervalos))
+
+        with perfil.etapa('apurar_dia/presenca') as etapa:
+            # Presença em todas as aulas do dia: uma matriz aula x aluno por turma
+            etapa.linhas = sum(len(intervalos) for intervalos in intervalos_por_turma.values())
+            for turma, intervalos in intervalos_por_turma.items():
+                aulas_do_dia = aulas_por_turma[turma]
+                presenca_por_turma[turma] = (aulas_do_dia, calcular_presenca_turma(
+                    aulas_do_dia.inicios_seg, aulas_do_dia.fins_seg, intervalos))
+        eventos.append(('presenca',))
+
+    # Turmas só de alunos ausentes entram sem matriz
+    for turma, aulas_do_dia in aulas_por_turma.items():
+        presenca_por_turma.setdefault(turma, (aulas_do_dia, None))
+    return ApuracaoDia(report_date, eventos, presenca_por_turma)
+
+
+def _aulas_no_filtro(aulas_do_dia, filtro):
+    """
+    Subconjunto das aulas do dia que começam dentro do filtro, como em
+    GradeHorarios: (posições das aulas, disciplinas, início da primeira em
+    minutos, fim da última em minutos), ou None se não sobrar nenhuma.
+    """
+    if aulas_do_dia is None:
+        return None
+    posicoes = [posicao for posicao, (inicio_min, _, _) in enumerate(aulas_do_dia.aulas)
+                if filtro is None or filtro[0] <= inicio_min < filtro[1]]
+    if not posicoes:
+        return None
+    disciplinas = [aulas_do_dia.disciplinas[posicao] for posicao in posicoes]
+    return posicoes, disciplinas, aulas_do_dia.aulas[posicoes[0]][0], aulas_do_dia.aulas[posicoes[-1]][1]
+
+
+@perfil.medir('reaplicar_filtro')
+def reaplicar_filtro(apuracao, filtro, logger):
+    """
+    Conclui a apuração para um filtro de horário ((início, fim) em minutos, ou
+    None): seleciona as aulas do filtro, verifica atrasos e saídas antecipadas
+    e conta as faltas a partir da matriz de presença já calculada. Repete no
+    logger as mensagens guardadas na apuração.
+    Retorna (report_date, faltas_registradas, df_problemas).
+    """
+    faltas_registradas = {}
+    problemas_alunos = []
+    aulas_filtradas = {}
+    # Alunos com aulas no filtro, na ordem de processamento
+    alunos_com_aulas = []
+
+    def aulas_da_turma(turma):
+        if turma not in aulas_filtradas:
+            aulas_filtradas[turma] = _aulas_no_filtro(apuracao.presenca_por_turma[turma][0], filtro)
+        return aulas_filtradas[turma]
+
+    for evento in apuracao.eventos:
+        tipo = evento[0]
+        if tipo == 'log':
+            logger(evento[1])
+
+        elif tipo == 'ausente':
+            _, matricula_db, nome_db, turma = evento
+            problemas_alunos.append({
+                'Matricula': matricula_db, 
+                'Nome do Aluno': nome_db, 
+                'Turma': turma, 
+                'Problema': 'FALTOU', 
+                'Acesso': 'Sem registro',
+                'hora_acesso': None
+            })
+            
+            # Aulas da turma no dia, já filtradas pelo horário
+            aulas_do_dia = aulas_da_turma(turma)
+            
+            for disciplina in (aulas_do_dia[1] if aulas_do_dia else []):
+                chave_falta = (matricula_db, nome_db, turma, disciplina)
+                faltas_registradas[chave_falta] = faltas_registradas.get(chave_falta, 0) + 1
+
+        elif tipo == 'frequencia':
+            _, matricula_db, nome_db, turma, segundos_entrada, segundos_saida, coluna = evento
+            aulas_do_dia = aulas_da_turma(turma)
+            if aulas_do_dia is None:
+                continue
+            _, _, minutos_inicio, minutos_fim = aulas_do_dia
+            
+            # Verifica atraso (tolerância de 15 minutos)
+            if segundos_entrada is not None:
+                hora_entrada = hora_do_dia(segundos_entrada)
+                # Comparação em minutos inteiros desde a meia-noite
+                minutos_entrada = segundos_entrada // 60
+                tolerancia_minutos = 15
                 
-                # Calcula faltas em aulas específicas (lógica existente de presença)
-                for _, aula in aulas_do_dia.iterrows():
-                    hora_ini_aula = aula['hora_inicio']
-                    hora_fim_aula = aula['hora_fim']
-                    
-                    # Verifica se há registro de presença durante a aula
-                    presenca_na_aula = False
-                    for _, acesso in acesso_aluno_df.iterrows():
-                        hora_acesso = acesso['Hora']
-                        if acesso['Sentido'] == 'Entrada' and hora_acesso <= hora_fim_aula:
-                            # Verifica se há saída após o fim da aula ou se é a última entrada do dia
-                            saidas_posteriores = acesso_aluno_df[
-                                (acesso_aluno_df['Sentido'] == 'Saída') & 
-                                (acesso_aluno_df['Hora'] > hora_acesso)
-                            ]
-                            if saidas_posteriores.empty or saidas_posteriores.iloc[0]['Hora'] >= hora_ini_aula:
-                                presenca_na_aula = True
-                                break
-                    
+                if minutos_entrada > (minutos_inicio + tolerancia_minutos):
+                    problemas_alunos.append({
+                        'Matricula': matricula_db,
+                        'Nome do Aluno': nome_db,
+                        'Turma': turma,
+                        'Problema': 'CHEGOU ATRASADO',
+                        'Acesso': f"Entrada: {hora_entrada.strftime('%H:%M:%S')}",
+                        'hora_acesso': segundos_entrada
+                    })
+                    logger(f"  - {nome_db} chegou atrasado às {hora_entrada}")
+            
+            # Verifica saída antecipada (tolerância de 15 minutos antes do fim)
+            if segundos_saida is not None:
+                hora_saida = hora_do_dia(segundos_saida)
+                minutos_saida = segundos_saida // 60
+                tolerancia_minutos = 15
+                
+                if minutos_saida < (minutos_fim - tolerancia_minutos):
+                    problemas_alunos.append({
+                        'Matricula': matricula_db,
+                        'Nome do Aluno': nome_db,
+                        'Turma': turma,
+                        'Problema': 'SAIU CEDO',
+                        'Acesso': f"Saída: {hora_saida.strftime('%H:%M:%S')}",
+                        'hora_acesso': segundos_saida
+                    })
+                    logger(f"  - {nome_db} saiu cedo às {hora_saida}")
+            
+            alunos_com_aulas.append((matricula_db, nome_db, turma, coluna))
+
+        elif tipo == 'presenca':
+            # Faltas em aulas específicas: as linhas do filtro na matriz da turma
+            for matricula_db, nome_db, turma, coluna in alunos_com_aulas:
+                posicoes, disciplinas, _, _ = aulas_da_turma(turma)
+                presenca = apuracao.presenca_por_turma[turma][1]
+                for disciplina, presenca_na_aula in zip(disciplinas, presenca[posicoes, coluna]):
                     if not presenca_na_aula:
-                        chave_falta = (matricula_db, nome_db, turma, aula['disciplina'])
+                        chave_falta = (matricula_db, nome_db, turma, disciplina)
                         faltas_registradas[chave_falta] = faltas_registradas.get(chave_falta, 0) + 1
-    
+
+    if apuracao.report_date is None:
+        return None, None, None
+
     df_problemas = pd.DataFrame(problemas_alunos)
+    if not df_problemas.empty:
+        # Horário do acesso em segundos desde a meia-noite (nulo para FALTOU),
+        # ao lado do texto exibido em 'Acesso'
+        df_problemas['hora_acesso'] = df_problemas['hora_acesso'].astype('Int64')
     logger(f"\n--- Processamento Concluído ---")
     logger(f"Total de problemas detectados: {len(problemas_alunos)}")
     
-    return report_date, faltas_registradas, df_problemas
\ No newline at end of file
+    return apuracao.report_date, faltas_registradas, df_problemas
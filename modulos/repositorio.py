@@ -0,0 +1,151 @@
+import os
+import queue
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from urllib.request import pathname2url
+
+# Adiciona o diretório raiz ao path para encontrar o 'config'
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import config
+
+# Quantidade de comandos preparados mantidos em cache por conexão
+STATEMENTS_EM_CACHE = 256
+
+
+class PoolConexoes:
+    """
+    Pool de conexões SQLite seguro para threads, compartilhado por todo o processo.
+
+    - Leituras usam conexões somente leitura (URI 'mode=ro'), reaproveitadas
+      entre chamadas; até 'max_leitores' ficam abertas à espera de uso.
+    - Escritas usam uma única conexão, protegida por um lock (o SQLite só
+      admite um escritor por vez), com o banco em modo WAL para que as
+      leituras não sejam bloqueadas durante uma escrita.
+    Como as conexões vivem enquanto o pool existir, o cache de comandos
+    preparados do módulo sqlite3 é aproveitado entre as chamadas.
+    """
+
+    def __init__(self, caminho_db, max_leitores=4):
+        self.caminho_db = caminho_db
+        self._leitores = queue.LifoQueue(maxsize=max_leitores)
+        self._lock_escrita = threading.Lock()
+        self._conexao_escrita = None
+
+    def _conectar(self, somente_leitura):
+        if somente_leitura:
+            uri = f"file:{pathname2url(os.path.abspath(self.caminho_db))}?mode=ro"
+            return sqlite3.connect(uri, uri=True, check_same_thread=False,
+                                   cached_statements=STATEMENTS_EM_CACHE)
+        conn = sqlite3.connect(self.caminho_db, check_same_thread=False,
+                               cached_statements=STATEMENTS_EM_CACHE)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @contextmanager
+    def leitura(self):
+        """
+        Empresta uma conexão somente leitura, devolvida ao pool ao final.
+        """
+        try:
+            conn = self._leitores.get_nowait()
+        except queue.Empty:
+            conn = self._conectar(somente_leitura=True)
+        try:
+            yield conn
+        finally:
+            try:
+                self._leitores.put_nowait(conn)
+            except queue.Full:
+                conn.close()
+
+    @contextmanager
+    def escrita(self):
+        """
+        Executa um bloco como uma única transação: commit ao final, rollback em caso de erro.
+        """
+        with self._lock_escrita:
+            if self._conexao_escrita is None:
+                self._conexao_escrita = self._conectar(somente_leitura=False)
+            conn = self._conexao_escrita
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def fechar(self):
+        """
+        Fecha todas as conexões abertas pelo pool.
+        """
+        with self._lock_escrita:
+            if self._conexao_escrita is not None:
+                self._conexao_escrita.close()
+                self._conexao_escrita = None
+        while True:
+            try:
+                self._leitores.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# Um pool por (processo, caminho do banco): processos filhos (ex.: lote.py) não
+# reaproveitam conexões herdadas do processo pai.
+_pools = {}
+_lock_pools = threading.Lock()
+
+
+def obter_pool():
+    """
+    Retorna o pool de conexões do banco configurado em config.DB_PATH.
+    """
+    chave = (os.getpid(), config.DB_PATH)
+    with _lock_pools:
+        pool = _pools.get(chave)
+        if pool is None:
+            pool = _pools[chave] = PoolConexoes(config.DB_PATH)
+        return pool
+
+
+def consultar(query, parametros=()):
+    """
+    Executa uma consulta em uma conexão somente leitura e retorna todas as linhas.
+    """
+    with obter_pool().leitura() as conn:
+        return conn.execute(query, parametros).fetchall()
+
+
+def consultar_um(query, parametros=()):
+    """
+    Executa uma consulta em uma conexão somente leitura e retorna a primeira linha.
+    """
+    with obter_pool().leitura() as conn:
+        return conn.execute(query, parametros).fetchone()
+
+
+def ler_dataframe(query, parametros=()):
+    """
+    Executa uma consulta somente leitura e retorna o resultado como DataFrame.
+    """
+    import pandas as pd
+    with obter_pool().leitura() as conn:
+        return pd.read_sql_query(query, conn, params=parametros)
+
+
+def executar(query, parametros=()):
+    """
+    Executa um comando de escrita em sua própria transação e retorna o rowcount.
+    """
+    with obter_pool().escrita() as conn:
+        return conn.execute(query, parametros).rowcount
+
+
+def executar_muitos(query, lista_parametros):
+    """
+    Executa o comando para cada item da lista com executemany, em uma única
+    transação (tudo ou nada). Retorna o rowcount total.
+    """
+    with obter_pool().escrita() as conn:
+        return conn.executemany(query, lista_parametros).rowcount